@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 from dotenv import load_dotenv
 
@@ -22,6 +23,10 @@ class Config:
 
     # 旭川市公式ホームページの設定
     DATABASE_URL = os.environ.get("DATABASE_URL")
+    # この時間（ミリ秒）以上かかったSQLを遅いクエリとしてログに出力する
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get("SLOW_QUERY_THRESHOLD_MS", 200))
+    # ログの出力形式（textまたはjson）
+    LOG_FORMAT = os.environ.get("LOG_FORMAT", "text")
     BASE_URL = "https://www.city.asahikawa.hokkaido.jp/"
     OVERVIEW_URL = BASE_URL + "kurashi/135/136/150/d076150.html"
     LATEST_DATA_URL = BASE_URL + "kurashi/135/136/150/d077425.html"
@@ -57,6 +62,37 @@ class Config:
     NOV2020_OR_EARLIER_URL = BASE_URL + "kurashi/135/136/150/d072303.html"
     RESERVATION_STATUSES_URL = "https://asahikawa-vaccine.jp/reservation/about/#section-c"
 
+    # 過去データ一括取得時の並行ダウンロードの設定
+    FETCH_MAX_WORKERS = int(os.environ.get("FETCH_MAX_WORKERS", 8))
+    FETCH_MAX_PER_HOST = int(os.environ.get("FETCH_MAX_PER_HOST", 4))
+
+    # 大きなCSVファイルをデータベースへ登録する際の1回あたりの登録件数
+    UPSERT_CHUNK_SIZE = 1000
+
+    # グラフ画像を並列に作成する際のプロセス数
+    GRAPH_MAX_WORKERS = int(os.environ.get("GRAPH_MAX_WORKERS", 4))
+
+    # グラフ画像のWebPエンコードの設定（qualityは0から100、methodは0から6で大きいほど圧縮に時間をかける）
+    GRAPH_WEBP_QUALITY = 80
+    GRAPH_WEBP_METHOD = 4
+
+    # 再利用するグラフの図のテンプレートの最大数
+    GRAPH_TEMPLATE_CACHE_SIZE = 32
+
+    # リクエストに応じて作成したグラフ画像のキャッシュの設定
+    GRAPH_CACHE_DIR = os.environ.get(
+        "GRAPH_CACHE_DIR", os.path.join(tempfile.gettempdir(), "ash_unofficial_covid19_graph")
+    )
+    GRAPH_CACHE_MAX_FILES = 256
+    # データの取り込み時にあらかじめ作成しておくグラフ画像の幅、高さ、解像度
+    # 任意のサイズの画像の作成でCPUを使い切られないよう、リクエストで指定できるのもこの組み合わせだけとする
+    GRAPH_PREWARM_SIZES = [(960, 480, 100), (600, 315, 100)]
+    # グラフのデータのバージョン（データの最終更新日時）をプロセス内で再利用する秒数
+    GRAPH_DATA_VERSION_TTL = 60
+
+    # データ取り込み処理の計測結果（Prometheusのtextfile形式とJSON形式）の出力先
+    METRICS_DIR = os.environ.get("METRICS_DIR", os.path.join(tempfile.gettempdir(), "ash_unofficial_covid19_metrics"))
+
     # 北海道公式ホームページの設定
     OUTPATIENTS_BASE_URL = "https://www.pref.hokkaido.lg.jp"
     OUTPATIENTS_URL = OUTPATIENTS_BASE_URL + "/hf/kst/youkou.html"
@@ -87,6 +123,142 @@ class Config:
     # Yahoo! Open Local Platformの設定
     YOLP_BASE_URL = "https://map.yahooapis.jp/search/local/V1/localSearch"
     YOLP_APP_ID = os.environ.get("YOLP_APP_ID")
+    YOLP_REQUESTS_PER_SECOND = 1.0
+    YOLP_MAX_WORKERS = 2
+
+    # 緯度経度の検索結果のキャッシュの設定
+    # 見つからなかったという結果を再検索せずに使う日数
+    GEOCODE_NEGATIVE_CACHE_DAYS = 30
+    # オープンデータの医療機関名との類似度がこの値以上ならYOLPで検索しない
+    GEOCODE_LOCAL_MATCH_THRESHOLD = 0.8
+    # YOLPで緯度経度を取得できない医療機関の手動で登録する緯度経度
+    PINNED_LOCATIONS = [
+        {
+            "medical_institution_name": "医療法人社団旭豊会 旭川三愛病院",
+            "longitude": 142.408792,
+            "latitude": 43.792291,
+        },
+        {
+            "medical_institution_name": "あさひかわ駅前内科",
+            "longitude": 142.3600949,
+            "latitude": 43.7628769,
+        },
+        {
+            "medical_institution_name": "やまきた内科",
+            "longitude": 142.3820653407415,
+            "latitude": 43.726742625984095,
+        },
+        {
+            "medical_institution_name": "グリート永山循環器・むくみクリニック",
+            "longitude": 142.4062653980119,
+            "latitude": 43.78568808811868,
+        },
+        {
+            "medical_institution_name": "フクダクリニック",
+            "longitude": 142.38243298115825,
+            "latitude": 43.81521459576975,
+        },
+        {
+            "medical_institution_name": "佐藤内科医院",
+            "longitude": 142.39588151965012,
+            "latitude": 43.76034860571178,
+        },
+        {
+            "medical_institution_name": "唐沢病院",
+            "longitude": 142.36361116952028,
+            "latitude": 43.76824898808485,
+        },
+        {
+            "medical_institution_name": "岩田医院",
+            "longitude": 142.36924956957841,
+            "latitude": 43.76624333505984,
+        },
+        {
+            "medical_institution_name": "旭川キュアメディクス",
+            "longitude": 142.37285062533863,
+            "latitude": 43.76773531393752,
+        },
+        {
+            "medical_institution_name": "東旭川病院",
+            "longitude": 142.4377094983569,
+            "latitude": 43.777870139580855,
+        },
+        {
+            "medical_institution_name": "永山腎泌尿器科クリニック",
+            "longitude": 142.40852307102085,
+            "latitude": 43.79484919172041,
+        },
+        {
+            "medical_institution_name": "独立行政法人国立病院機構旭川医療センター",
+            "longitude": 142.3815237271935,
+            "latitude": 43.798826491523464,
+        },
+        {
+            "medical_institution_name": "旭川医科大学病院",
+            "longitude": 142.38382199835564,
+            "latitude": 43.73007572101459,
+        },
+        {
+            "medical_institution_name": "旭川リハビリテーション病院",
+            "longitude": 142.3871075983558,
+            "latitude": 43.73051097382853,
+        },
+        {
+            "medical_institution_name": "かむいクリニック",
+            "longitude": 142.34020758985673,
+            "latitude": 43.75035378612844,
+        },
+        {
+            "medical_institution_name": "小児科くさのこどもクリニック",
+            "longitude": 142.390319166667,
+            "latitude": 43.805724166667,
+        },
+        {
+            "medical_institution_name": "ながのクリニック",
+            "longitude": 142.396569444444,
+            "latitude": 43.744830833333,
+        },
+        {
+            "medical_institution_name": "旭川消化器肛門クリニック",
+            "longitude": 142.387003055556,
+            "latitude": 43.803429722222,
+        },
+        {
+            "medical_institution_name": "のむらひふ科耳鼻咽喉科甲状腺クリニック",
+            "longitude": 142.381543888889,
+            "latitude": 43.727218333333,
+        },
+        {
+            "medical_institution_name": "いいだメンタルペインクリニック",
+            "longitude": 142.36001636896643,
+            "latitude": 43.76306331601826,
+        },
+        {
+            "medical_institution_name": "みやざき内科小児科クリニック",
+            "longitude": 142.38439872663736,
+            "latitude": 43.801697594258115,
+        },
+        {
+            "medical_institution_name": "みうら小児科クリニック",
+            "longitude": 142.33471821314035,
+            "latitude": 43.75955680467453,
+        },
+        {
+            "medical_institution_name": "にしうら循環器内科クリニック",
+            "longitude": 142.41012536995134,
+            "latitude": 43.786499953349406,
+        },
+        {
+            "medical_institution_name": "内科循環器科はやしクリニック",
+            "longitude": 142.3315437699506,
+            "latitude": 43.76518076741971,
+        },
+        {
+            "medical_institution_name": "中根耳鼻咽喉科医院",
+            "longitude": 142.38597486810855,
+            "latitude": 43.80290137109948,
+        },
+    ]
 
     # Google Analyticsの設定
     GTAG_ID = os.environ.get("GTAG_ID")
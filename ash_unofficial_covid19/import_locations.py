@@ -0,0 +1,119 @@
+from typing import Optional
+
+from .config import Config
+from .errors import DatabaseConnectionError, DataModelError, HTTPDownloadError, ScrapeError, ServiceError
+from .metrics import PipelineMetrics
+from .models.geocode import GeocodeFactory
+from .models.location import LocationFactory
+from .scrapers.geocoder import FacilityIndex, Geocoder
+from .scrapers.location import ScrapeOpendataLocation
+from .services.database import ConnectionPool
+from .services.geocode import GeocodeService
+from .services.location import LocationService
+
+
+def _get_pinned_geocodes() -> GeocodeFactory:
+    """手動で登録する緯度経度をキャッシュへ固定値として登録するためのオブジェクトを返す
+
+    Returns:
+        pinned_geocodes (:obj:`GeocodeFactory`): 固定値の検索結果のキャッシュデータ
+
+    """
+    pinned_geocodes = GeocodeFactory()
+    for pinned_location in Config.PINNED_LOCATIONS:
+        pinned_geocodes.create(
+            query=pinned_location["medical_institution_name"],
+            longitude=pinned_location["longitude"],
+            latitude=pinned_location["latitude"],
+            is_pinned=True,
+        )
+    return pinned_geocodes
+
+
+def _get_facility_index() -> Optional[FacilityIndex]:
+    """北海道オープンデータポータルの病院と診療所のデータから医療機関の索引を作成する
+
+    Returns:
+        facility_index (:obj:`FacilityIndex`): オープンデータの医療機関の索引
+            データを取得できなかった場合はNoneを返す。
+
+    """
+    facilities = list()
+    try:
+        for csv_url in (Config.HOSPITAL_OPENDATA_URL, Config.CLINIC_OPENDATA_URL):
+            facilities.extend(ScrapeOpendataLocation(csv_url).facilities)
+    except (HTTPDownloadError, ScrapeError) as e:
+        print(e.message)
+        return None
+
+    return FacilityIndex(facilities)
+
+
+def import_locations(
+    medical_institution_name_list: list, pool: ConnectionPool, addresses: Optional[dict] = None
+) -> None:
+    """
+    医療機関の名称一覧から緯度経度を取得し、データベースへ格納する。
+
+    検索結果はgeocodesテーブルにキャッシュし、キャッシュにない医療機関名は
+    まず北海道オープンデータポータルの医療機関データと名称と所在地の類似度で照合する。
+    類似度が低く照合できなかった医療機関名だけをYOLP Web APIで検索する。
+    YOLPで見つからなかった医療機関の緯度経度は(0, 0)とする。
+
+    Args:
+        medical_institution_name_list (list): 医療機関名リスト
+        pool (:obj:`ConnectionPool`): SimpleConnectionPoolを要素に持つオブジェクト
+        addresses (dict): 医療機関名をキー、所在地を値とする辞書
+
+    """
+    geocode_service = GeocodeService(pool)
+    try:
+        geocode_service.create(_get_pinned_geocodes())
+        cached_geocodes = geocode_service.find_all()
+    except (DatabaseConnectionError, ServiceError) as e:
+        print(e.message)
+        return
+
+    cache = dict()
+    for geocode in cached_geocodes.items:
+        cache[geocode.query] = (geocode.longitude, geocode.latitude) if geocode.is_found else None
+
+    with PipelineMetrics.stage("geocode"):
+        facility_index = None
+        if any(name not in cache for name in medical_institution_name_list):
+            facility_index = _get_facility_index()
+
+        geocoder = Geocoder(cache, facility_index=facility_index)
+        results = geocoder.geocode(medical_institution_name_list, addresses)
+
+    new_geocodes = GeocodeFactory()
+    locations_factory = LocationFactory()
+    try:
+        for row in geocoder.lists:
+            new_geocodes.create(**row)
+
+        for medical_institution_name, coordinates in results.items():
+            if coordinates is None:
+                coordinates = (0.0, 0.0)
+            locations_factory.create(
+                medical_institution_name=medical_institution_name,
+                longitude=coordinates[0],
+                latitude=coordinates[1],
+            )
+
+        # 固定値の緯度経度は常に医療機関の緯度経度データへ反映する
+        for pinned_location in Config.PINNED_LOCATIONS:
+            if pinned_location["medical_institution_name"] not in results:
+                locations_factory.create(**pinned_location)
+    except DataModelError as e:
+        print(e.message)
+        return
+
+    location_service = LocationService(pool)
+    try:
+        geocode_service.create(new_geocodes)
+        location_service.create(locations_factory)
+    except (DatabaseConnectionError, ServiceError) as e:
+        print(e.message)
+
+    return
@@ -1,10 +1,10 @@
-import time
-
 from .config import Config
 from .errors import DatabaseConnectionError, HTTPDownloadError, ScrapeError, ServiceError
+from .import_locations import import_locations
+from .metrics import PipelineMetrics
 from .models.location import LocationFactory
 from .models.outpatient import OutpatientFactory
-from .scrapers.location import ScrapeOpendataLocation, ScrapeYOLPLocation
+from .scrapers.location import ScrapeOpendataLocation
 from .scrapers.outpatient import ScrapeOutpatient
 from .scrapers.outpatient_link import ScrapeOutpatientLink
 from .services.database import ConnectionPool
@@ -24,17 +24,21 @@ def import_outpatients(html_url: str) -> None:
 
     """
     factory = OutpatientFactory()
-    source = ScrapeOutpatientLink(html_url)
+    with PipelineMetrics.stage("parse"):
+        source = ScrapeOutpatientLink(html_url)
 
     try:
-        scraped_data = ScrapeOutpatient(source.lists[0]["url"])
+        with PipelineMetrics.stage("parse"):
+            scraped_data = ScrapeOutpatient(source.lists[0]["url"])
         new_name_list = scraped_data.get_medical_institution_list()
     except HTTPDownloadError as e:
         print(e.message)
         return
 
-    for row in scraped_data.lists:
-        factory.create(**row)
+    with PipelineMetrics.stage("parse"):
+        for row in scraped_data.lists:
+            factory.create(**row)
+        PipelineMetrics.count("rows_parsed", len(factory.items))
 
     service = OutpatientService(conn)
     current_name_list = service.get_medical_institution_list()
@@ -52,7 +56,8 @@ def import_outpatients(html_url: str) -> None:
 
     try:
         service.create(factory)
-        import_locations(added_names)
+        addresses = {row["medical_institution_name"]: row["address"] for row in scraped_data.lists}
+        import_locations(added_names, conn, addresses)
         for deleted_name in deleted_names:
             service.delete(deleted_name)
     except (DatabaseConnectionError, ServiceError) as e:
@@ -62,57 +67,6 @@ def import_outpatients(html_url: str) -> None:
     return
 
 
-def import_locations(medical_institution_name_list: list) -> None:
-    """
-    医療機関の名称一覧から緯度経度を取得し、データベースへ格納する。
-
-    Args:
-        medical_institution_name_list (list): 医療機関名リスト
-
-    """
-    locations_factory = LocationFactory()
-    for medical_institution_name in medical_institution_name_list:
-        try:
-            scraped_data = ScrapeYOLPLocation(medical_institution_name)
-        except (HTTPDownloadError, ScrapeError):
-            continue
-
-        # 1番目の検索結果を採用する
-        row = scraped_data.lists[0]
-        locations_factory.create(**row)
-        time.sleep(1)
-
-    service = LocationService(conn)
-    try:
-        service.create(locations_factory)
-    except (DatabaseConnectionError, ServiceError) as e:
-        print(e.message)
-
-    # YOLPで緯度経度を取得できなかった医療機関に手動で情報を追加
-    add_locations_factory = LocationFactory()
-    add_data_list = [
-        {
-            "medical_institution_name": "医療法人社団旭豊会 旭川三愛病院",
-            "longitude": 142.408792,
-            "latitude": 43.792291,
-        },
-        {
-            "medical_institution_name": "あさひかわ駅前内科",
-            "longitude": 142.3600949,
-            "latitude": 43.7628769,
-        },
-    ]
-    for add_data in add_data_list:
-        add_locations_factory.create(**add_data)
-
-    try:
-        service.create(add_locations_factory)
-    except (DatabaseConnectionError, ServiceError) as e:
-        print(e.message)
-
-    return
-
-
 def import_locations_from_opendata(csv_url: str) -> None:
     """
     北海道オープンデータポータルのCSVデータから医療機関の緯度経度を取得し、データベースへ格納する。
@@ -123,13 +77,16 @@ def import_locations_from_opendata(csv_url: str) -> None:
     """
     locations_factory = LocationFactory()
     try:
-        scraped_data = ScrapeOpendataLocation(csv_url)
+        with PipelineMetrics.stage("parse"):
+            scraped_data = ScrapeOpendataLocation(csv_url)
     except (HTTPDownloadError, ScrapeError) as e:
         print(e.message)
         return
 
-    for row in scraped_data.lists:
-        locations_factory.create(**row)
+    with PipelineMetrics.stage("parse"):
+        for row in scraped_data.lists:
+            locations_factory.create(**row)
+        PipelineMetrics.count("rows_parsed", len(locations_factory.items))
 
     service = LocationService(conn)
     try:
@@ -141,9 +98,10 @@ def import_locations_from_opendata(csv_url: str) -> None:
 
 
 if __name__ == "__main__":
-    try:
-        import_outpatients(Config.OUTPATIENTS_URL)
-        import_locations_from_opendata(Config.HOSPITAL_OPENDATA_URL)
-        import_locations_from_opendata(Config.CLINIC_OPENDATA_URL)
-    finally:
-        conn.close_connection()
+    with PipelineMetrics("import_outpatients").run():
+        try:
+            import_outpatients(Config.OUTPATIENTS_URL)
+            import_locations_from_opendata(Config.HOSPITAL_OPENDATA_URL)
+            import_locations_from_opendata(Config.CLINIC_OPENDATA_URL)
+        finally:
+            conn.close_connection()
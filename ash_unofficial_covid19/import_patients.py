@@ -1,12 +1,20 @@
 from datetime import date
-from typing import Optional
+from itertools import islice
+from typing import Iterator, Optional
 
 from .config import Config
 from .errors import DatabaseConnectionError, DataModelError, HTTPDownloadError, ScrapeError, ServiceError
+from .metrics import PipelineMetrics
 from .models.patient import AsahikawaPatientFactory, HokkaidoPatientFactory
 from .models.press_release_link import PressReleaseLinkFactory
 from .models.sapporo_patients_number import SapporoPatientsNumberFactory
-from .scrapers.patient import ScrapeAsahikawaPatients, ScrapeAsahikawaPatientsPDF, ScrapeHokkaidoPatients
+from .scrapers.fetcher import ConcurrentFetcher
+from .scrapers.patient import (
+    ScrapeAsahikawaPatients,
+    ScrapeAsahikawaPatientsPDF,
+    ScrapeAsahikawaPatientsPDFs,
+    ScrapeHokkaidoPatientsStream,
+)
 from .scrapers.press_release_link import ScrapePressReleaseLink
 from .scrapers.sapporo_patients_number import ScrapeSapporoPatientsNumber
 from .services.database import ConnectionPool
@@ -44,29 +52,45 @@ def _get_download_lists() -> list:
     ]
 
 
-def _import_hokkaido_patients(url: str) -> None:
+def _iter_hokkaido_patients(url: str) -> Iterator[HokkaidoPatientFactory]:
     """
-    旭川市公式ホームページから新型コロナウイルス感染症の感染者情報一覧を取得し、
-    データベースへ格納する。
+    北海道オープンデータポータルから新型コロナウイルス感染症の感染者情報を
+    ダウンロードしながら解析し、一定件数ごとに区切って返す。
 
     Args:
-        url (str): 旭川市公式ホームページのURL
+        url (str): 北海道オープンデータポータルのCSVファイルのURL
+
+    Yields:
+        patients_factory (:obj:`HokkaidoPatientFactory`): 一定件数ごとの北海道の陽性患者データ
 
     """
-    try:
-        scraped_data = ScrapeHokkaidoPatients(url)
-    except (HTTPDownloadError, ScrapeError) as e:
-        print(e.message)
-        return
+    with PipelineMetrics.stage("parse"):
+        scraped_data = ScrapeHokkaidoPatientsStream(url)
 
-    patients_factory = HokkaidoPatientFactory()
-    try:
-        for row in scraped_data.lists:
-            patients_factory.create(**row)
-    except DataModelError as e:
-        print(e.message)
-        return
+    rows = iter(scraped_data.lists)
+    while True:
+        patients_factory = HokkaidoPatientFactory()
+        # ストリーミングで取得するため、ダウンロードしながら解析する
+        with PipelineMetrics.stage("parse"):
+            for row in islice(rows, Config.UPSERT_CHUNK_SIZE):
+                patients_factory.create(**row)
+            PipelineMetrics.count("rows_parsed", len(patients_factory.items))
+
+        if not patients_factory.items:
+            return
+
+        yield patients_factory
+
+
+def _save_hokkaido_patients(patients_factory: HokkaidoPatientFactory) -> None:
+    """
+    北海道オープンデータポータルから抽出した新型コロナウイルス感染症の感染者情報を、
+    データベースへ格納する。
+
+    Args:
+        patients_factory (:obj:`HokkaidoPatientFactory`): 一定件数ごとの北海道の陽性患者データ
 
+    """
     service = HokkaidoPatientService(conn)
     try:
         service.create(patients_factory)
@@ -86,15 +110,30 @@ def _import_asahikawa_patients(url: str, target_year: int) -> None:
 
     """
     try:
-        scraped_data = ScrapeAsahikawaPatients(html_url=url, target_year=target_year)
+        with PipelineMetrics.stage("parse"):
+            scraped_data = ScrapeAsahikawaPatients(html_url=url, target_year=target_year)
     except (HTTPDownloadError, ScrapeError) as e:
         print(e.message)
         return
 
+    _save_asahikawa_patients(scraped_data)
+
+
+def _save_asahikawa_patients(scraped_data: ScrapeAsahikawaPatients) -> None:
+    """
+    旭川市公式ホームページから抽出した新型コロナウイルス感染症の感染者情報を、
+    データベースへ格納する。
+
+    Args:
+        scraped_data (:obj:`ScrapeAsahikawaPatients`): 旭川市の陽性患者データ
+
+    """
     patients_factory = AsahikawaPatientFactory()
     try:
-        for row in scraped_data.lists:
-            patients_factory.create(**row)
+        with PipelineMetrics.stage("parse"):
+            for row in scraped_data.lists:
+                patients_factory.create(**row)
+            PipelineMetrics.count("rows_parsed", len(patients_factory.items))
     except DataModelError as e:
         print(e.message)
         return
@@ -152,25 +191,46 @@ def _import_press_release_link(url: str, target_year: int) -> None:
 
     """
     try:
-        scraped_data = ScrapePressReleaseLink(html_url=url, target_year=target_year)
+        with PipelineMetrics.stage("parse"):
+            scraped_data = ScrapePressReleaseLink(html_url=url, target_year=target_year)
     except (HTTPDownloadError, ScrapeError, DatabaseConnectionError, ServiceError) as e:
         print(e.message)
         return
 
+    _save_press_release_link(scraped_data)
+
+
+def _save_press_release_link(scraped_data: ScrapePressReleaseLink) -> Optional[PressReleaseLinkFactory]:
+    """
+    旭川市公式ホームページから抽出した報道発表資料PDFファイル自体のURL等の情報を、
+    データベースへ格納する。
+
+    Args:
+        scraped_data (:obj:`ScrapePressReleaseLink`): 報道発表資料PDFファイルのURLと報道発表日のデータ
+
+    Returns:
+        press_release_links (:obj:`PressReleaseLinkFactory`): 報道発表資料リスト
+            データベースへ格納できなかった場合はNoneを返す
+
+    """
     try:
         press_release_link_factory = PressReleaseLinkFactory()
-        for row in scraped_data.lists:
-            press_release_link_factory.create(**row)
+        with PipelineMetrics.stage("parse"):
+            for row in scraped_data.lists:
+                press_release_link_factory.create(**row)
+            PipelineMetrics.count("rows_parsed", len(press_release_link_factory.items))
     except DataModelError as e:
         print(e.message)
-        return
+        return None
 
     service = PressReleaseLinkService(conn)
     try:
         service.create(press_release_link_factory)
     except (DatabaseConnectionError, ServiceError) as e:
         print(e.message)
-        return
+        return None
+
+    return press_release_link_factory
 
 
 def _get_press_release_links() -> Optional[PressReleaseLinkFactory]:
@@ -202,7 +262,8 @@ def _import_asahikawa_data_from_press_release(pdf_url: str, publication_date: da
 
     """
     try:
-        scraped_data = ScrapeAsahikawaPatientsPDF(pdf_url=pdf_url, publication_date=publication_date)
+        with PipelineMetrics.stage("parse"):
+            scraped_data = ScrapeAsahikawaPatientsPDF(pdf_url=pdf_url, publication_date=publication_date)
     except (HTTPDownloadError, ScrapeError) as e:
         print(e.message)
         return
@@ -211,13 +272,56 @@ def _import_asahikawa_data_from_press_release(pdf_url: str, publication_date: da
     try:
         for row in scraped_data.lists:
             patients_factory = AsahikawaPatientFactory()
-            patients_factory.create(**row)
+            with PipelineMetrics.stage("parse"):
+                patients_factory.create(**row)
+                PipelineMetrics.count("rows_parsed", 1)
             service.create(patients_factory)
     except (DatabaseConnectionError, ServiceError, DataModelError) as e:
         print(e.message)
         return
 
 
+def _import_asahikawa_data_from_press_releases(press_release_pdfs: list) -> None:
+    """
+    旭川市公式ホームページから新型コロナウイルス感染症の感染者情報を、
+    ダウンロード済みの複数の報道発表資料のPDFからまとめて抽出し、データベースへ格納する。
+
+    Args:
+        press_release_pdfs (list of tuple): 報道発表資料PDFファイルのURL、報道発表日、
+            ダウンロードしたPDFデータのタプルのリスト
+
+    """
+    try:
+        with PipelineMetrics.stage("parse"):
+            scraped_data = ScrapeAsahikawaPatientsPDFs(
+                [(pdf_url, publication_date) for pdf_url, publication_date, _ in press_release_pdfs],
+                downloaded_pdfs=[downloaded_pdf for _, _, downloaded_pdf in press_release_pdfs],
+            )
+    except (HTTPDownloadError, ScrapeError) as e:
+        print(e.message)
+        return
+
+    # 表データを抽出できなかったPDFファイルはスキップして、残りのPDFファイルを取り込む
+    for error in scraped_data.errors:
+        print(error.message)
+
+    service = AsahikawaPatientService(conn)
+    for pdf_url, pdf_list in scraped_data.pdf_lists:
+        if not pdf_list:
+            continue
+
+        patients_factory = AsahikawaPatientFactory()
+        try:
+            with PipelineMetrics.stage("parse"):
+                for row in pdf_list:
+                    patients_factory.create(**row)
+                PipelineMetrics.count("rows_parsed", len(patients_factory.items))
+            service.create(patients_factory)
+        except (DatabaseConnectionError, ServiceError, DataModelError) as e:
+            print(pdf_url + ": " + e.message)
+            continue
+
+
 def _import_sapporo_patients_number(url: str) -> None:
     """DATA-SMART CITY SAPPOROから札幌市の1日の新規陽性患者数をインポートする
 
@@ -226,15 +330,18 @@ def _import_sapporo_patients_number(url: str) -> None:
 
     """
     try:
-        scraped_data = ScrapeSapporoPatientsNumber(url)
+        with PipelineMetrics.stage("parse"):
+            scraped_data = ScrapeSapporoPatientsNumber(url)
     except (HTTPDownloadError, ScrapeError) as e:
         print(e.message)
         return
 
     service = SapporoPatientsNumberService(conn)
     sapporo_patients_number_factory = SapporoPatientsNumberFactory()
-    for row in scraped_data.lists:
-        sapporo_patients_number_factory.create(**row)
+    with PipelineMetrics.stage("parse"):
+        for row in scraped_data.lists:
+            sapporo_patients_number_factory.create(**row)
+        PipelineMetrics.count("rows_parsed", len(sapporo_patients_number_factory.items))
 
     try:
         service.create(sapporo_patients_number_factory)
@@ -243,6 +350,71 @@ def _import_sapporo_patients_number(url: str) -> None:
         return
 
 
+def _import_archive_pages(fetcher: ConcurrentFetcher) -> list:
+    """
+    北海道オープンデータポータルと旭川市公式ホームページの前月分以前の感染者情報一覧のページを
+    並行でダウンロードして解析し、完了した順にデータベースへ格納する。
+
+    データベースへの格納は全て呼び出し元のスレッドで1件ずつ行う。
+    報道発表資料PDFファイルは、リンクを抽出したページを格納した時点でダウンロードを開始し、
+    残りのページのダウンロードと並行して取得する。
+    北海道オープンデータポータルのCSVファイルはワーカースレッドでダウンロードしながら解析し、
+    一定件数ごとに呼び出し元のスレッドへ渡して格納する。
+
+    Args:
+        fetcher (:obj:`ConcurrentFetcher`): ページを並行でダウンロードするオブジェクト
+
+    Returns:
+        press_release_pdfs (list of tuple): 報道発表資料PDFファイルのURL、報道発表日、
+            ダウンロードしたPDFデータのタプルを報道発表日の新しい順に並べたリスト
+
+    """
+    tasks = [(Config.HOKKAIDO_URL, _iter_hokkaido_patients, {"url": Config.HOKKAIDO_URL}, "hokkaido_patients")]
+    for url, target_year in _get_download_lists():
+        kwargs = {"html_url": url, "target_year": target_year}
+        tasks.append((url, ScrapeAsahikawaPatients, kwargs, "asahikawa_patients"))
+        tasks.append((url, ScrapePressReleaseLink, kwargs, "press_release_link"))
+
+    pdf_urls = set()
+    press_release_pdfs = list()
+    for task, future in fetcher.fetch(tasks):
+        try:
+            scraped_data = future.result()
+        except (HTTPDownloadError, ScrapeError, DataModelError) as e:
+            print(e.message)
+            continue
+
+        task_type = task[3]
+        if task_type == "hokkaido_patients":
+            _save_hokkaido_patients(scraped_data)
+        elif task_type == "asahikawa_patients":
+            _save_asahikawa_patients(scraped_data)
+        elif task_type == "press_release_link":
+            press_release_links = _save_press_release_link(scraped_data)
+            if press_release_links is None:
+                continue
+
+            # 残りのページのダウンロードを待たずに報道発表資料PDFファイルのダウンロードを始める
+            for press_release_link in press_release_links.items:
+                if press_release_link.url in pdf_urls:
+                    continue
+
+                pdf_urls.add(press_release_link.url)
+                tasks.append(
+                    (
+                        press_release_link.url,
+                        ScrapeAsahikawaPatientsPDFs.get_pdf,
+                        {"pdf_url": press_release_link.url},
+                        "press_release_pdf",
+                        press_release_link.publication_date,
+                    )
+                )
+        elif task_type == "press_release_pdf":
+            press_release_pdfs.append((task[0], task[4], scraped_data))
+
+    return sorted(press_release_pdfs, key=lambda press_release_pdf: press_release_pdf[1], reverse=True)
+
+
 def import_latest():
     """今月の旭川市の新規陽性患者データを取得"""
     # 先にHTMLページから新規陽性患者データをデータベースへ登録
@@ -278,26 +450,14 @@ def import_latest():
 
 def import_past():
     """先月以前の全ての新規陽性患者データを取得"""
-    # 北海道の新規陽性患者データをデータベースへ登録
-    _import_hokkaido_patients(Config.HOKKAIDO_URL)
-
-    for download_list in _get_download_lists():
-        url = download_list[0]
-        target_year = download_list[1]
-        # 先にHTMLページから新規陽性患者データをデータベースへ登録
-        _import_asahikawa_patients(url=url, target_year=target_year)
-        # 過去の報道発表資料PDFファイルのURLと報道発表日を取得
-        _import_press_release_link(url=url, target_year=target_year)
-
-    # 報道発表資料PDFファイルのURLと報道発表日を取得
-    past_press_release_links = _get_press_release_links()
-    if past_press_release_links:
-        # 報道発表資料PDFファイルから新規陽性患者データをデータベースへ更新登録
-        for press_release_link in past_press_release_links.items:
-            _import_asahikawa_data_from_press_release(
-                pdf_url=press_release_link.url,
-                publication_date=press_release_link.publication_date,
-            )
+    fetcher = ConcurrentFetcher()
+    # 北海道の新規陽性患者データ、HTMLページからの新規陽性患者データ、
+    # 過去の報道発表資料PDFファイルのURLと報道発表日を並行で取得してデータベースへ登録し、
+    # あわせて報道発表資料PDFファイルをダウンロード
+    past_press_release_pdfs = _import_archive_pages(fetcher)
+    if past_press_release_pdfs:
+        # 報道発表資料PDFファイルから新規陽性患者データをまとめて抽出してデータベースへ更新登録
+        _import_asahikawa_data_from_press_releases(past_press_release_pdfs)
 
     _import_additional_asahikawa_patients()
     # 重複事例5例を削除する
@@ -326,7 +486,8 @@ def delete_patients(patient_number: int):
 
 
 if __name__ == "__main__":
-    try:
-        import_latest()
-    finally:
-        conn.close_connection()
+    with PipelineMetrics("import_patients").run():
+        try:
+            import_latest()
+        finally:
+            conn.close_connection()
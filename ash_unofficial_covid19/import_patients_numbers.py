@@ -1,9 +1,11 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import date
 from pathlib import Path
 
 from .config import Config
-from .errors import DatabaseConnectionError, HTTPDownloadError, ScrapeError, ServiceError
-from .models.patients_number import PatientsNumberFactory
+from .errors import DatabaseConnectionError, DataModelError, HTTPDownloadError, ScrapeError, ServiceError
+from .metrics import PipelineMetrics
+from .models.patients_number import PatientsNumberArrayFactory, PatientsNumberFactory
 from .models.press_release_link import PressReleaseLinkFactory
 from .models.sapporo_patients_number import SapporoPatientsNumberFactory
 from .models.tokyo_patients_number import TokyoPatientsNumberFactory
@@ -17,15 +19,7 @@ from .services.patients_number import PatientsNumberService
 from .services.press_release_link import PressReleaseLinkService
 from .services.sapporo_patients_number import SapporoPatientsNumberService
 from .services.tokyo_patients_number import TokyoPatientsNumberService
-from .views.graph import (
-    ByAgeGraphView,
-    DailyTotalGraphView,
-    GraphView,
-    MonthlyPerAgeGraphView,
-    MonthTotalGraphView,
-    PerHundredThousandPopulationGraphView,
-    WeeklyPerAgeGraphView,
-)
+from .views.graph_cache import GraphImageCache
 from .views.press_release import PressReleaseView
 
 conn = ConnectionPool()
@@ -43,15 +37,18 @@ def _import_press_release_link(url: str, target_year: int) -> None:
 
     """
     try:
-        scraped_data = ScrapePressReleaseLink(html_url=url, target_year=target_year)
+        with PipelineMetrics.stage("parse"):
+            scraped_data = ScrapePressReleaseLink(html_url=url, target_year=target_year)
     except (HTTPDownloadError, ScrapeError, DatabaseConnectionError, ServiceError) as e:
         print(e.message)
         return
 
     try:
         factory = PressReleaseLinkFactory()
-        for row in scraped_data.lists:
-            factory.create(**row)
+        with PipelineMetrics.stage("parse"):
+            for row in scraped_data.lists:
+                factory.create(**row)
+            PipelineMetrics.count("rows_parsed", len(factory.items))
     except TypeError as e:
         print(e.args[0])
         return
@@ -88,19 +85,28 @@ def _import_asahikawa_data_from_press_release(pdf_url: str, publication_date: da
 
     """
     try:
-        scraped_data = ScrapePatientsNumber(pdf_url=pdf_url, publication_date=publication_date)
+        with PipelineMetrics.stage("parse"):
+            scraped_data = ScrapePatientsNumber(pdf_url=pdf_url, publication_date=publication_date)
     except (HTTPDownloadError, ScrapeError) as e:
         print(e.message)
         return
 
-    factory = PatientsNumberFactory()
+    factory = PatientsNumberArrayFactory()
     try:
-        for row in scraped_data.lists:
-            factory.create(**row)
+        with PipelineMetrics.stage("parse"):
+            for row in scraped_data.lists:
+                factory.create(**row)
+            PipelineMetrics.count("rows_parsed", len(factory.items))
     except TypeError as e:
         print(e.args[0])
         return
 
+    try:
+        factory.validate()
+    except DataModelError as e:
+        print(e.message)
+        return
+
     try:
         service = PatientsNumberService(conn)
         service.create(factory)
@@ -117,15 +123,18 @@ def _import_sapporo_patients_number(url: str) -> None:
 
     """
     try:
-        scraped_data = ScrapeSapporoPatientsNumber(url)
+        with PipelineMetrics.stage("parse"):
+            scraped_data = ScrapeSapporoPatientsNumber(url)
     except (HTTPDownloadError, ScrapeError) as e:
         print(e.message)
         return
 
     service = SapporoPatientsNumberService(conn)
     factory = SapporoPatientsNumberFactory()
-    for row in scraped_data.lists:
-        factory.create(**row)
+    with PipelineMetrics.stage("parse"):
+        for row in scraped_data.lists:
+            factory.create(**row)
+        PipelineMetrics.count("rows_parsed", len(factory.items))
 
     try:
         service.create(factory)
@@ -142,15 +151,18 @@ def _import_tokyo_patients_number(url: str) -> None:
 
     """
     try:
-        scraped_data = ScrapeTokyoPatientsNumber(url)
+        with PipelineMetrics.stage("parse"):
+            scraped_data = ScrapeTokyoPatientsNumber(url)
     except (HTTPDownloadError, ScrapeError) as e:
         print(e.message)
         return
 
     service = TokyoPatientsNumberService(conn)
     factory = TokyoPatientsNumberFactory()
-    for row in scraped_data.lists:
-        factory.create(**row)
+    with PipelineMetrics.stage("parse"):
+        for row in scraped_data.lists:
+            factory.create(**row)
+        PipelineMetrics.count("rows_parsed", len(factory.items))
 
     try:
         service.create(factory)
@@ -266,13 +278,17 @@ def import_latest():
 def import_past_from_patients():
     # 過去の陽性患者属性データベースから日別年代別陽性患者数データをデータベースへ登録
     service = AsahikawaPatientService(conn)
-    factory = PatientsNumberFactory()
+    factory = PatientsNumberArrayFactory()
     try:
         for row in service.get_aggregate_by_days_per_age(date(2020, 2, 23), date(2022, 1, 27)):
             factory.create(**row)
+        factory.validate()
     except TypeError as e:
         print(e.args[0])
         return
+    except DataModelError as e:
+        print(e.message)
+        return
 
     try:
         service = PatientsNumberService(conn)
@@ -282,44 +298,89 @@ def import_past_from_patients():
         return
 
 
-def _save_graph_images(graph_view: GraphView, file_name: str, twitter_card: bool = False) -> None:
-    """
-    グラフ画像データを公開ディレクトリに保存する。
-    """
-    if twitter_card:
-        graph_image = graph_view.get_graph_image(figsize=(6.0, 3.15))
-    else:
-        graph_image = graph_view.get_graph_image(figsize=(9.6, 4.8))
-    save_path = Path(__file__).resolve().parent.joinpath("static", "images", "graph", file_name)
-    with open(save_path, mode="wb") as f:
-        f.write(graph_image.getvalue())
-    return
+def _get_graph_image_path(file_name: str) -> Path:
+    """グラフ画像データを保存する公開ディレクトリのファイルパスを返す"""
+    return Path(__file__).resolve().parent.joinpath("static", "images", "graph", file_name)
 
 
-def create_graph_data() -> None:
+def create_graph_data(force: bool = False) -> None:
     """
     トップページに表示するグラフ画像データを公開ディレクトリに保存する。
+
+    グラフのデータはデータベースから取得してから各プロセスへ渡し、
+    グラフの描画と保存はプロセスプールで並列に行う。
+    入力データと画像サイズのハッシュ値をマニフェストに記録し、前回から変わっていない
+    グラフ画像は作り直さない。
+
+    Args:
+        force (bool): Trueの場合は全てのグラフ画像を作り直す
+
+    """
+    from .views.graph import (
+        ByAgeGraphView,
+        DailyTotalGraphView,
+        GraphManifest,
+        MonthlyPerAgeGraphView,
+        MonthTotalGraphView,
+        PerHundredThousandPopulationGraphView,
+        WeeklyPerAgeGraphView,
+    )
+
+    with PipelineMetrics.stage("graph_data"):
+        press_release = PressReleaseView(conn)
+        today = press_release.latest_date
+        month_total = MonthTotalGraphView(today, conn)
+        graph_images = [
+            (DailyTotalGraphView(today, conn), "daily_total.webp", False),
+            (ByAgeGraphView(today, conn), "by_age.webp", False),
+            (month_total, "month_total.webp", False),
+            (month_total, "month_total_for_card.webp", True),
+            (PerHundredThousandPopulationGraphView(today, conn), "per_hundred_thousand_population.webp", False),
+            (WeeklyPerAgeGraphView(today, conn), "weekly_per_age.webp", False),
+            (MonthlyPerAgeGraphView(today, conn), "monthly_per_age.webp", False),
+        ]
+
+    manifest = GraphManifest(_get_graph_image_path("manifest.json"))
+    # 描画するプロセスのCPU時間も計測できるよう、プロセスプールの終了を待ってから段階の計測を終える
+    with PipelineMetrics.stage("graph_render"), ProcessPoolExecutor(max_workers=Config.GRAPH_MAX_WORKERS) as executor:
+        futures = dict()
+        for graph_view, file_name, twitter_card in graph_images:
+            figsize = (6.0, 3.15) if twitter_card else (9.6, 4.8)
+            fingerprint = graph_view.get_fingerprint(figsize)
+            if not force and manifest.is_fresh(file_name, fingerprint):
+                continue
+
+            future = executor.submit(graph_view.save_graph_image, _get_graph_image_path(file_name), figsize)
+            futures[future] = (file_name, fingerprint)
+
+        try:
+            for future in as_completed(futures):
+                future.result()
+                manifest.update(*futures[future])
+        finally:
+            # 一部のグラフの作成に失敗しても、作成できたグラフの分は記録する
+            if futures:
+                manifest.save()
+
+
+def prewarm_graph_cache() -> None:
+    """
+    Webアプリでリクエストに応じて配信するグラフ画像のうち、よく使われる画像サイズのものを
+    あらかじめキャッシュに保存する。
     """
     press_release = PressReleaseView(conn)
-    today = press_release.latest_date
-    daily_total = DailyTotalGraphView(today, conn)
-    _save_graph_images(daily_total, "daily_total.webp")
-    by_age = ByAgeGraphView(today, conn)
-    _save_graph_images(by_age, "by_age.webp")
-    month_total = MonthTotalGraphView(today, conn)
-    _save_graph_images(month_total, "month_total.webp")
-    _save_graph_images(month_total, "month_total_for_card.webp", True)
-    per_hundred_thousand_population = PerHundredThousandPopulationGraphView(today, conn)
-    _save_graph_images(per_hundred_thousand_population, "per_hundred_thousand_population.webp")
-    weekly_per_age = WeeklyPerAgeGraphView(today, conn)
-    _save_graph_images(weekly_per_age, "weekly_per_age.webp")
-    monthly_per_age = MonthlyPerAgeGraphView(today, conn)
-    _save_graph_images(monthly_per_age, "monthly_per_age.webp")
+    try:
+        GraphImageCache().prewarm(press_release.latest_date, conn)
+    except (DatabaseConnectionError, ServiceError) as e:
+        print(e.message)
+        return
 
 
 if __name__ == "__main__":
-    try:
-        import_latest()
-        create_graph_data()
-    finally:
-        conn.close_connection()
+    with PipelineMetrics("import_patients_numbers").run():
+        try:
+            import_latest()
+            create_graph_data()
+            prewarm_graph_cache()
+        finally:
+            conn.close_connection()
@@ -1,13 +1,10 @@
-import time
-
 from .config import Config
-from .errors import DatabaseConnectionError, HTTPDownloadError, ScrapeError, ServiceError
-from .models.location import LocationFactory
+from .errors import DatabaseConnectionError, HTTPDownloadError, ServiceError
+from .import_locations import import_locations
+from .metrics import PipelineMetrics
 from .models.reservation_status import ReservationStatusFactory
-from .scrapers.location import ScrapeYOLPLocation
 from .scrapers.reservation_status import ScrapeReservationStatus
 from .services.database import ConnectionPool
-from .services.location import LocationService
 from .services.reservation_status import ReservationStatusService
 
 conn = ConnectionPool()
@@ -25,14 +22,17 @@ def import_reservation_statuses(html_url: str) -> None:
     factory = ReservationStatusFactory()
 
     try:
-        scraped_data = ScrapeReservationStatus(html_url)
+        with PipelineMetrics.stage("parse"):
+            scraped_data = ScrapeReservationStatus(html_url)
         new_name_list = scraped_data.get_medical_institution_list()
     except HTTPDownloadError as e:
         print(e.message)
         return
 
-    for row in scraped_data.lists:
-        factory.create(**row)
+    with PipelineMetrics.stage("parse"):
+        for row in scraped_data.lists:
+            factory.create(**row)
+        PipelineMetrics.count("rows_parsed", len(factory.items))
 
     service = ReservationStatusService(conn)
     current_name_list = service.get_medical_institution_list()
@@ -50,7 +50,8 @@ def import_reservation_statuses(html_url: str) -> None:
 
     try:
         service.create(factory)
-        import_locations(added_names)
+        addresses = {row["medical_institution_name"]: row["address"] for row in scraped_data.lists}
+        import_locations(added_names, conn, addresses)
         for deleted_name in deleted_names:
             service.delete(deleted_name)
     except (DatabaseConnectionError, ServiceError) as e:
@@ -60,164 +61,9 @@ def import_reservation_statuses(html_url: str) -> None:
     return
 
 
-def import_locations(medical_institution_name_list: list) -> None:
-    """
-    医療機関の名称一覧から緯度経度を取得し、データベースへ格納する。
-
-    Args:
-        medical_institution_name_list (list): 医療機関名リスト
-
-    """
-    locations_factory = LocationFactory()
-    for medical_institution_name in medical_institution_name_list:
-        try:
-            scraped_data = ScrapeYOLPLocation(medical_institution_name)
-        except (HTTPDownloadError, ScrapeError):
-            continue
-
-        # 1番目の検索結果を採用する
-        row = scraped_data.lists[0]
-        locations_factory.create(**row)
-        time.sleep(1)
-
-    service = LocationService(conn)
-    try:
-        service.create(locations_factory)
-    except (DatabaseConnectionError, ServiceError) as e:
-        print(e.message)
-
-    # YOLPで緯度経度を取得できなかった医療機関に手動で情報を追加
-    add_locations_factory = LocationFactory()
-    add_data_list = [
-        {
-            "medical_institution_name": "やまきた内科",
-            "longitude": 142.3820653407415,
-            "latitude": 43.726742625984095,
-        },
-        {
-            "medical_institution_name": "グリート永山循環器・むくみクリニック",
-            "longitude": 142.4062653980119,
-            "latitude": 43.78568808811868,
-        },
-        {
-            "medical_institution_name": "フクダクリニック",
-            "longitude": 142.38243298115825,
-            "latitude": 43.81521459576975,
-        },
-        {
-            "medical_institution_name": "佐藤内科医院",
-            "longitude": 142.39588151965012,
-            "latitude": 43.76034860571178,
-        },
-        {
-            "medical_institution_name": "唐沢病院",
-            "longitude": 142.36361116952028,
-            "latitude": 43.76824898808485,
-        },
-        {
-            "medical_institution_name": "岩田医院",
-            "longitude": 142.36924956957841,
-            "latitude": 43.76624333505984,
-        },
-        {
-            "medical_institution_name": "旭川キュアメディクス",
-            "longitude": 142.37285062533863,
-            "latitude": 43.76773531393752,
-        },
-        {
-            "medical_institution_name": "東旭川病院",
-            "longitude": 142.4377094983569,
-            "latitude": 43.777870139580855,
-        },
-        {
-            "medical_institution_name": "永山腎泌尿器科クリニック",
-            "longitude": 142.40852307102085,
-            "latitude": 43.79484919172041,
-        },
-        {
-            "medical_institution_name": "独立行政法人国立病院機構旭川医療センター",
-            "longitude": 142.3815237271935,
-            "latitude": 43.798826491523464,
-        },
-        {
-            "medical_institution_name": "旭川医科大学病院",
-            "longitude": 142.38382199835564,
-            "latitude": 43.73007572101459,
-        },
-        {
-            "medical_institution_name": "旭川リハビリテーション病院",
-            "longitude": 142.3871075983558,
-            "latitude": 43.73051097382853,
-        },
-        {
-            "medical_institution_name": "かむいクリニック",
-            "longitude": 142.34020758985673,
-            "latitude": 43.75035378612844,
-        },
-        {
-            "medical_institution_name": "小児科くさのこどもクリニック",
-            "longitude": 142.390319166667,
-            "latitude": 43.805724166667,
-        },
-        {
-            "medical_institution_name": "ながのクリニック",
-            "longitude": 142.396569444444,
-            "latitude": 43.744830833333,
-        },
-        {
-            "medical_institution_name": "旭川消化器肛門クリニック",
-            "longitude": 142.387003055556,
-            "latitude": 43.803429722222,
-        },
-        {
-            "medical_institution_name": "のむらひふ科耳鼻咽喉科甲状腺クリニック",
-            "longitude": 142.381543888889,
-            "latitude": 43.727218333333,
-        },
-        {
-            "medical_institution_name": "いいだメンタルペインクリニック",
-            "longitude": 142.36001636896643,
-            "latitude": 43.76306331601826,
-        },
-        {
-            "medical_institution_name": "みやざき内科小児科クリニック",
-            "longitude": 142.38439872663736,
-            "latitude": 43.801697594258115,
-        },
-        {
-            "medical_institution_name": "みうら小児科クリニック",
-            "longitude": 142.33471821314035,
-            "latitude": 43.75955680467453,
-        },
-        {
-            "medical_institution_name": "にしうら循環器内科クリニック",
-            "longitude": 142.41012536995134,
-            "latitude": 43.786499953349406,
-        },
-        {
-            "medical_institution_name": "内科循環器科はやしクリニック",
-            "longitude": 142.3315437699506,
-            "latitude": 43.76518076741971,
-        },
-        {
-            "medical_institution_name": "中根耳鼻咽喉科医院",
-            "longitude": 142.38597486810855,
-            "latitude": 43.80290137109948,
-        },
-    ]
-    for add_data in add_data_list:
-        add_locations_factory.create(**add_data)
-
-    try:
-        service.create(add_locations_factory)
-    except (DatabaseConnectionError, ServiceError) as e:
-        print(e.message)
-
-    return
-
-
 if __name__ == "__main__":
-    try:
-        import_reservation_statuses(Config.RESERVATION_STATUSES_URL)
-    finally:
-        conn.close_connection()
+    with PipelineMetrics("import_reservation_statuses").run():
+        try:
+            import_reservation_statuses(Config.RESERVATION_STATUSES_URL)
+        finally:
+            conn.close_connection()
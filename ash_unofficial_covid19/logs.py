@@ -1,20 +1,156 @@
+import atexit
+import json
 import logging
+import os
+import queue
+import threading
+from contextvars import ContextVar, Token
+from datetime import datetime, timedelta, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from .config import Config
+
+LOGGER_NAME = "ash_unofficial_covid19_log"
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_configure_lock = threading.Lock()
+_listener: Optional[QueueListener] = None
+
+
+class RequestIdFilter(logging.Filter):
+    """ログを出力したスレッドのリクエストIDをログレコードに追加する
+
+    QueueHandlerに設定し、ContextVarのリクエストIDを出力処理のスレッドへ渡す前に取得する。
+
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """ログを1行のJSONに変換する"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        log = {
+            "time": datetime.fromtimestamp(record.created, timezone(timedelta(hours=+9))).isoformat(),
+            "name": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id is not None:
+            log["request_id"] = request_id
+        return json.dumps(log, ensure_ascii=False)
+
+
+def get_formatter(log_format: str) -> logging.Formatter:
+    """ログの出力形式の設定に対応するFormatterを返す
+
+    Args:
+        log_format (str): textまたはjson
+
+    Returns:
+        formatter (:obj:`logging.Formatter`): ログのFormatter
+
+    """
+    if log_format == "json":
+        return JsonFormatter()
+    return logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+
+def _configure(use_queue: bool = True) -> None:
+    """パッケージ共通のロガーにコンソールへ出力するハンドラを設定する
+
+    Args:
+        use_queue (bool): QueueHandlerを設定し、出力処理のスレッドでコンソールへ書き込むか
+
+    """
+    global _listener
+    logger = logging.getLogger(LOGGER_NAME)
+    for exist_handler in list(logger.handlers):
+        logger.removeHandler(exist_handler)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(get_formatter(Config.LOG_FORMAT))
+    logger.setLevel(logging.DEBUG)
+    if not use_queue:
+        console_handler.addFilter(RequestIdFilter())
+        logger.addHandler(console_handler)
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+    logger.addHandler(queue_handler)
+    listener = QueueListener(log_queue, console_handler)
+    listener.start()
+    # 終了時にキューに残ったログを書き出す
+    atexit.register(listener.stop)
+    _listener = listener
+
+
+def _configure_after_fork() -> None:
+    """フォークした子プロセスのロガーを設定し直す
+
+    子プロセスには出力処理のスレッドがなく、multiprocessingの子プロセスはatexitを実行せずに
+    終了するため、子プロセスではコンソールへ直接書き込む。
+
+    """
+    if _listener is not None:
+        _configure(use_queue=False)
+
+
+os.register_at_fork(after_in_child=_configure_after_fork)
+
+
+def get_logger() -> logging.Logger:
+    """初回の呼び出し時にだけ設定したパッケージ共通のロガーを返す
+
+    ロガーにはキューへ追加するだけのQueueHandlerを設定し、コンソールへの書き込みは
+    QueueListenerのスレッドで行うため、ログを出力するリクエストのスレッドを待たせない。
+
+    Returns:
+        logger (:obj:`logging.Logger`): パッケージ共通のロガー
+
+    """
+    if _listener is None:
+        with _configure_lock:
+            if _listener is None:
+                _configure()
+    return logging.getLogger(LOGGER_NAME)
+
+
+def set_request_id(request_id: str) -> Token:
+    """現在のコンテキストのログに付けるリクエストIDを設定する
+
+    Args:
+        request_id (str): リクエストID
+
+    Returns:
+        token (:obj:`Token`): reset_request_idで設定を戻すためのトークン
+
+    """
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token: Token) -> None:
+    """set_request_idで設定したリクエストIDを戻す
+
+    Args:
+        token (:obj:`Token`): set_request_idが返したトークン
+
+    """
+    _request_id.reset(token)
 
 
 class AppLog:
     """ログをコンソールへ出力する"""
 
     def __init__(self):
-        logger = logging.getLogger("ash_unofficial_covid19_log")
-        logger.setLevel(logging.DEBUG)
-        if not logger.handlers == []:
-            for exist_handler in logger.handlers:
-                logger.removeHandler(exist_handler)
-        console_handler = logging.StreamHandler()
-        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-        console_handler.setFormatter(formatter)
-        self.__logger = logger
-        self.__logger.addHandler(console_handler)
+        self.__logger = get_logger()
 
     def debug(self, message) -> None:
         """logging.debugのラッパー
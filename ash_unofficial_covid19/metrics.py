@@ -0,0 +1,298 @@
+import json
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Iterator, Optional
+
+from .config import Config
+from .logs import AppLog
+
+COUNTER_NAMES = ("bytes_downloaded", "rows_parsed", "rows_written")
+
+
+@dataclass
+class StageStats:
+    """データ取り込み処理の段階ごとの計測結果
+
+    入れ子になった段階の分は含まない、その段階自体の時間とする。
+
+    Attributes:
+        name (str): 段階名
+        calls (int): 実行回数
+        wall_seconds (float): 経過時間（秒）
+        cpu_seconds (float): 子プロセスを含むプロセス全体のCPU時間（秒）
+        bytes_downloaded (int): ダウンロードしたバイト数
+        rows_parsed (int): 解析した行数
+        rows_written (int): データベースへ登録した行数
+        peak_rss_bytes (int): 段階の終了時点までの最大常駐メモリ（バイト）
+
+    """
+
+    name: str
+    calls: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    bytes_downloaded: int = 0
+    rows_parsed: int = 0
+    rows_written: int = 0
+    peak_rss_bytes: int = 0
+
+
+def _get_cpu_seconds() -> float:
+    """子プロセスを含むプロセス全体のCPU時間（秒）を返す"""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def _get_peak_rss_bytes() -> int:
+    """自プロセスと子プロセスのうち大きい方の最大常駐メモリ（バイト）を返す"""
+    # Linuxのru_maxrssはキロバイト単位
+    return 1024 * max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    )
+
+
+class PipelineMetrics:
+    """データ取り込み処理の段階ごとの時間と処理件数の計測
+
+    runで実行中のオブジェクトに対し、スクレイパー、サービス、グラフの処理から
+    PipelineMetrics.stageとPipelineMetrics.countで段階ごとの計測結果を記録する。
+    実行中のオブジェクトがない場合は何もしない。
+    終了時にPrometheusのtextfile形式とJSON形式の計測結果をファイルに出力する。
+
+    Attributes:
+        job (str): データ取り込み処理の名前
+        stages (list of :obj:`StageStats`): 段階ごとの計測結果のリスト
+        totals (:obj:`StageStats`): 処理全体の計測結果
+
+    """
+
+    _current: Optional["PipelineMetrics"] = None
+
+    def __init__(self, job: str, metrics_dir: str = Config.METRICS_DIR):
+        """
+        Args:
+            job (str): データ取り込み処理の名前
+            metrics_dir (str): 計測結果のファイルを出力するディレクトリのパス
+
+        """
+        self.__job = job
+        self.__metrics_dir = Path(metrics_dir)
+        self.__stages: dict = dict()
+        self.__totals = StageStats(name="total")
+        self.__started_at: Optional[datetime] = None
+        self.__success: Optional[bool] = None
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+
+    @property
+    def job(self) -> str:
+        return self.__job
+
+    @property
+    def stages(self) -> list:
+        return list(self.__stages.values())
+
+    @property
+    def totals(self) -> StageStats:
+        return self.__totals
+
+    @classmethod
+    def get_current(cls) -> Optional["PipelineMetrics"]:
+        return cls._current
+
+    @classmethod
+    def stage(cls, stage_name: str):
+        """実行中のオブジェクトで段階の計測を行うコンテキストマネージャを返す
+
+        Args:
+            stage_name (str): 段階名
+
+        """
+        current = cls._current
+        return current.measure(stage_name) if current else nullcontext()
+
+    @classmethod
+    def count(cls, counter_name: str, value: int) -> None:
+        """実行中のオブジェクトの処理件数を加算する
+
+        Args:
+            counter_name (str): bytes_downloaded、rows_parsed、rows_writtenのいずれか
+            value (int): 加算する件数
+
+        """
+        current = cls._current
+        if current:
+            current.add(counter_name, value)
+
+    def _get_stack(self) -> list:
+        """スレッドごとの計測中の段階のスタックを返す"""
+        if not hasattr(self.__local, "stack"):
+            self.__local.stack = list()
+        return self.__local.stack
+
+    @contextmanager
+    def measure(self, stage_name: str) -> Iterator[StageStats]:
+        """段階の時間を計測する
+
+        段階は入れ子にでき、入れ子の段階の時間は外側の段階の時間から除く。
+
+        Args:
+            stage_name (str): 段階名
+
+        Yields:
+            stats (:obj:`StageStats`): 段階の計測結果
+
+        """
+        with self.__lock:
+            stats = self.__stages.setdefault(stage_name, StageStats(name=stage_name))
+
+        frame = {"stats": stats, "child_wall": 0.0, "child_cpu": 0.0}
+        stack = self._get_stack()
+        stack.append(frame)
+        started_at = time.perf_counter()
+        cpu_started_at = _get_cpu_seconds()
+        try:
+            yield stats
+        finally:
+            wall_seconds = time.perf_counter() - started_at
+            cpu_seconds = _get_cpu_seconds() - cpu_started_at
+            stack.pop()
+            if stack:
+                stack[-1]["child_wall"] += wall_seconds
+                stack[-1]["child_cpu"] += cpu_seconds
+
+            with self.__lock:
+                stats.calls += 1
+                stats.wall_seconds += wall_seconds - frame["child_wall"]
+                stats.cpu_seconds += max(0.0, cpu_seconds - frame["child_cpu"])
+                stats.peak_rss_bytes = max(stats.peak_rss_bytes, _get_peak_rss_bytes())
+
+    def add(self, counter_name: str, value: int) -> None:
+        """処理件数を処理全体と現在のスレッドで計測中の段階に加算する
+
+        Args:
+            counter_name (str): bytes_downloaded、rows_parsed、rows_writtenのいずれか
+            value (int): 加算する件数
+
+        """
+        if counter_name not in COUNTER_NAMES:
+            raise ValueError(counter_name + "は計測できる件数ではありません。")
+
+        stack = self._get_stack()
+        with self.__lock:
+            setattr(self.__totals, counter_name, getattr(self.__totals, counter_name) + value)
+            if stack:
+                stats = stack[-1]["stats"]
+                setattr(stats, counter_name, getattr(stats, counter_name) + value)
+
+    @contextmanager
+    def run(self) -> Iterator["PipelineMetrics"]:
+        """データ取り込み処理全体を計測し、終了時に計測結果をファイルに出力する
+
+        Yields:
+            metrics (:obj:`PipelineMetrics`): 実行中のオブジェクト
+
+        """
+        PipelineMetrics._current = self
+        self.__started_at = datetime.now(timezone(timedelta(hours=+9)))
+        started_at = time.perf_counter()
+        cpu_started_at = _get_cpu_seconds()
+        self.__success = False
+        try:
+            yield self
+            self.__success = True
+        finally:
+            PipelineMetrics._current = None
+            self.__totals.calls = 1
+            self.__totals.wall_seconds = time.perf_counter() - started_at
+            self.__totals.cpu_seconds = _get_cpu_seconds() - cpu_started_at
+            self.__totals.peak_rss_bytes = _get_peak_rss_bytes()
+            try:
+                self.save()
+            except OSError:
+                AppLog().warning(self.__job + "の計測結果を出力できませんでした。")
+
+    def to_report(self) -> dict:
+        """計測結果をJSONに変換できる辞書で返す
+
+        Returns:
+            report (dict): 計測結果の辞書
+
+        """
+        return {
+            "job": self.__job,
+            "started_at": self.__started_at.isoformat() if self.__started_at else None,
+            "success": self.__success,
+            "totals": asdict(self.__totals),
+            "stages": [asdict(stats) for stats in self.stages],
+        }
+
+    def to_prometheus(self) -> str:
+        """計測結果をPrometheusのtextfile形式の文字列で返す
+
+        Returns:
+            textfile (str): Prometheusのtextfile形式の計測結果
+
+        """
+        fields = (
+            ("calls", "回数"),
+            ("wall_seconds", "経過時間（秒）"),
+            ("cpu_seconds", "CPU時間（秒）"),
+            ("bytes_downloaded", "ダウンロードしたバイト数"),
+            ("rows_parsed", "解析した行数"),
+            ("rows_written", "データベースへ登録した行数"),
+            ("peak_rss_bytes", "最大常駐メモリ（バイト）"),
+        )
+        job_label = 'job="' + self.__job + '"'
+        lines = list()
+        for field, description in fields:
+            metric_name = "ash_import_stage_" + field
+            lines.append("# HELP " + metric_name + " 段階ごとの" + description)
+            lines.append("# TYPE " + metric_name + " gauge")
+            for stats in self.stages:
+                labels = "{" + job_label + ',stage="' + stats.name + '"}'
+                lines.append(metric_name + labels + " " + str(getattr(stats, field)))
+
+            metric_name = "ash_import_run_" + field
+            lines.append("# HELP " + metric_name + " 処理全体の" + description)
+            lines.append("# TYPE " + metric_name + " gauge")
+            lines.append(metric_name + "{" + job_label + "} " + str(getattr(self.__totals, field)))
+
+        run_gauges = (
+            ("ash_import_run_success", "処理が例外で終了しなかった場合は1", 1 if self.__success else 0),
+            (
+                "ash_import_run_timestamp_seconds",
+                "処理の開始日時（UNIX時間）",
+                self.__started_at.timestamp() if self.__started_at else 0,
+            ),
+        )
+        for metric_name, description, value in run_gauges:
+            lines.append("# HELP " + metric_name + " " + description)
+            lines.append("# TYPE " + metric_name + " gauge")
+            lines.append(metric_name + "{" + job_label + "} " + str(value))
+
+        return "\n".join(lines) + "\n"
+
+    def save(self) -> None:
+        """計測結果をジョブ名.promとジョブ名.jsonのファイルに出力する
+
+        node_exporterが書き込み途中のファイルを読まないよう、一時ファイルに書き込んでから置き換える。
+
+        """
+        self.__metrics_dir.mkdir(parents=True, exist_ok=True)
+        contents = (
+            (self.__job + ".prom", self.to_prometheus()),
+            (self.__job + ".json", json.dumps(self.to_report(), ensure_ascii=False, indent=2)),
+        )
+        for file_name, content in contents:
+            with NamedTemporaryFile("w", encoding="utf-8", dir=self.__metrics_dir, suffix=".tmp", delete=False) as f:
+                f.write(content)
+            os.chmod(f.name, 0o644)
+            os.replace(f.name, self.__metrics_dir.joinpath(file_name))
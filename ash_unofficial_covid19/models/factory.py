@@ -1,4 +1,8 @@
+import inspect
 from abc import ABCMeta, abstractmethod
+from typing import Iterable, Optional, Sequence
+
+from ..errors import DataModelError
 
 
 class Factory(metaclass=ABCMeta):
@@ -7,10 +11,58 @@ class Factory(metaclass=ABCMeta):
         self._register_item(item)
         return item
 
+    def create_many(self, rows: Iterable[Sequence], columns: Optional[Sequence[str]] = None) -> list:
+        """モデルオブジェクトのまとめての生成
+
+        行ごとにキーワード引数の辞書を作らず、位置引数でモデルオブジェクトを生成する。
+
+        Args:
+            rows (Iterable of tuple): モデルクラスの引数の順に値を並べた行データのイテラブル
+                DictCursorの行データもそのまま渡せる
+            columns (list of str): 行データの列名のリスト
+                指定した場合は列名の並びがモデルクラスの引数の並びと一致するか確認する
+
+        Returns:
+            items (list): 生成したモデルオブジェクトのリスト
+
+        """
+        create_item = self._create_item_from_values
+        register_item = self._register_item
+        items = [create_item(*row) for row in rows]
+        if columns is not None and items:
+            self._validate_columns(type(items[0]), columns)
+        for item in items:
+            register_item(item)
+        return items
+
+    @staticmethod
+    def _validate_columns(item_class: type, columns: Sequence[str]) -> None:
+        """行データの列名の並びがモデルクラスの引数の並びと一致するか確認
+
+        Args:
+            item_class (type): 生成したモデルオブジェクトのクラス
+            columns (list of str): 行データの列名のリスト
+
+        """
+        parameters = list(inspect.signature(item_class).parameters)
+        if list(columns) != parameters:
+            raise DataModelError(
+                item_class.__name__
+                + "の引数の並び（"
+                + ",".join(parameters)
+                + "）と行データの列名の並び（"
+                + ",".join(columns)
+                + "）が一致しません。"
+            )
+
     @abstractmethod
     def _create_item(self, **row):
         pass
 
+    @abstractmethod
+    def _create_item_from_values(self, *values):
+        pass
+
     @abstractmethod
     def _register_item(self, item):
         pass
@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from ..errors import DataModelError
+from ..models.factory import Factory
+
+
+@dataclass(slots=True)
+class Geocode:
+    """施設名から緯度経度を検索した結果のキャッシュを表すモデルオブジェクト
+
+    Attributes:
+        query (str): 検索に使用した施設名
+        longitude (float): 経度（見つからなかった場合はNone）
+        latitude (float): 緯度（見つからなかった場合はNone）
+        is_pinned (bool): 手動で登録した値として固定するか
+
+    """
+
+    query: str
+    longitude: Optional[float] = None
+    latitude: Optional[float] = None
+    is_pinned: bool = False
+
+    def __post_init__(self):
+        if not isinstance(self.query, str) or self.query == "":
+            raise DataModelError("施設名の指定が正しくありません。")
+
+        if (self.longitude is None) != (self.latitude is None):
+            raise DataModelError("緯度と経度はどちらも指定するかどちらも指定しないでください。")
+
+        if self.longitude is not None and (
+            not isinstance(self.longitude, float) or not isinstance(self.latitude, float)
+        ):
+            raise DataModelError("緯度経度は数値で指定してください。")
+
+    @property
+    def is_found(self) -> bool:
+        return self.longitude is not None
+
+
+class GeocodeFactory(Factory):
+    """施設名から緯度経度を検索した結果のキャッシュを表すモデルオブジェクトを生成
+
+    Attributes:
+        items (list of :obj:`Geocode`): 検索結果のキャッシュ一覧リスト
+            Geocodeクラスのオブジェクトのリスト
+
+    """
+
+    def __init__(self):
+        self.__items = list()
+
+    @property
+    def items(self):
+        return self.__items
+
+    def _create_item(self, **row) -> Geocode:
+        """Geocodeオブジェクトの生成
+
+        Args:
+            row (dict): 検索結果のキャッシュデータの辞書
+                検索結果のキャッシュデータオブジェクトを作成するための引数
+
+        Returns:
+            geocode (:obj:`Geocode`): 検索結果のキャッシュデータ
+                Geocodeクラスのオブジェクト
+
+        """
+        return Geocode(**row)
+
+    def _create_item_from_values(self, *values) -> Geocode:
+        """Geocodeオブジェクトを引数の順に並べた値から生成
+
+        Args:
+            values (tuple): Geocodeクラスの引数の順に並べた値
+
+        Returns:
+            item (:obj:`Geocode`): Geocodeクラスのオブジェクト
+
+        """
+        return Geocode(*values)
+
+    def _register_item(self, item: Geocode):
+        """Geocodeオブジェクトをリストへ追加
+
+        Args:
+            item (:obj:`Geocode`): Geocodeクラスのオブジェクト
+
+        """
+        self.__items.append(item)
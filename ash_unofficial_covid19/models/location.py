@@ -4,7 +4,7 @@ from ..models.factory import Factory
 from ..models.point import Point
 
 
-@dataclass
+@dataclass(slots=True)
 class Location(Point):
     """医療機関の緯度経度を表すモデルオブジェクト
 
@@ -48,6 +48,18 @@ class LocationFactory(Factory):
         """
         return Location(**row)
 
+    def _create_item_from_values(self, *values) -> Location:
+        """Locationオブジェクトを引数の順に並べた値から生成
+
+        Args:
+            values (tuple): Locationクラスの引数の順に並べた値
+
+        Returns:
+            item (:obj:`Location`): Locationクラスのオブジェクト
+
+        """
+        return Location(*values)
+
     def _register_item(self, item: Location):
         """Locationオブジェクトをリストへ追加
 
@@ -5,7 +5,7 @@ from typing import Optional
 from ..models.factory import Factory
 
 
-@dataclass()
+@dataclass(slots=True)
 class Outpatient:
     """新型コロナ発熱外来を表すモデルオブジェクト
 
@@ -86,6 +86,18 @@ class OutpatientFactory(Factory):
         """
         return Outpatient(**row)
 
+    def _create_item_from_values(self, *values) -> Outpatient:
+        """Outpatientオブジェクトを引数の順に並べた値から生成
+
+        Args:
+            values (tuple): Outpatientクラスの引数の順に並べた値
+
+        Returns:
+            item (:obj:`Outpatient`): Outpatientクラスのオブジェクト
+
+        """
+        return Outpatient(*values)
+
     def _register_item(self, item: Outpatient):
         """Outpatientオブジェクトをリストへ追加
 
@@ -96,7 +108,7 @@ class OutpatientFactory(Factory):
         self.__items.append(item)
 
 
-@dataclass()
+@dataclass(slots=True)
 class OutpatientLocation(Outpatient):
     """新型コロナ発熱外来詳細データモデル
 
@@ -166,6 +178,18 @@ class OutpatientLocationFactory(Factory):
         """
         return OutpatientLocation(**row)
 
+    def _create_item_from_values(self, *values) -> OutpatientLocation:
+        """OutpatientLocationオブジェクトを引数の順に並べた値から生成
+
+        Args:
+            values (tuple): OutpatientLocationクラスの引数の順に並べた値
+
+        Returns:
+            item (:obj:`OutpatientLocation`): OutpatientLocationクラスのオブジェクト
+
+        """
+        return OutpatientLocation(*values)
+
     def _register_item(self, item: OutpatientLocation):
         """OutpatientLocationオブジェクトをリストへ追加
 
@@ -26,6 +26,24 @@ class Patient:
 
     """
 
+    __slots__ = (
+        "__patient_number",
+        "__city_code",
+        "__prefecture",
+        "__city_name",
+        "__publication_date",
+        "__onset_date",
+        "__residence",
+        "__age",
+        "__sex",
+        "__occupation",
+        "__status",
+        "__symptom",
+        "__overseas_travel_history",
+        "__be_discharged",
+        "__note",
+    )
+
     def __init__(
         self,
         patient_number: int,
@@ -187,6 +205,8 @@ class AsahikawaPatient(Patient):
 
     """
 
+    __slots__ = ("__hokkaido_patient_number", "__surrounding_status", "__close_contact")
+
     def __init__(
         self,
         patient_number: int,
@@ -298,6 +318,18 @@ class AsahikawaPatientFactory(Factory):
         """
         return AsahikawaPatient(**row)
 
+    def _create_item_from_values(self, *values) -> AsahikawaPatient:
+        """AsahikawaPatientオブジェクトを引数の順に並べた値から生成
+
+        Args:
+            values (tuple): AsahikawaPatientクラスの引数の順に並べた値
+
+        Returns:
+            item (:obj:`AsahikawaPatient`): AsahikawaPatientクラスのオブジェクト
+
+        """
+        return AsahikawaPatient(*values)
+
     def _register_item(self, item: AsahikawaPatient):
         """AsahikawaPatientオブジェクトをリストへ追加
 
@@ -330,6 +362,8 @@ class HokkaidoPatient(Patient):
 
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         patient_number: int,
@@ -416,6 +450,18 @@ class HokkaidoPatientFactory(Factory):
         """
         return HokkaidoPatient(**row)
 
+    def _create_item_from_values(self, *values) -> HokkaidoPatient:
+        """HokkaidoPatientオブジェクトを引数の順に並べた値から生成
+
+        Args:
+            values (tuple): HokkaidoPatientクラスの引数の順に並べた値
+
+        Returns:
+            item (:obj:`HokkaidoPatient`): HokkaidoPatientクラスのオブジェクト
+
+        """
+        return HokkaidoPatient(*values)
+
     def _register_item(self, item: Patient):
         """Patientオブジェクトをリストへ追加
 
@@ -1,10 +1,33 @@
 import dataclasses
-from datetime import date
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta
+from operator import attrgetter
+from typing import TYPE_CHECKING, Iterable, Optional
 
+from ..errors import DataModelError
 from ..models.factory import Factory
 
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
 
-@dataclasses.dataclass(frozen=True)
+AGE_COLUMNS = (
+    "age_under_10",
+    "age_10s",
+    "age_20s",
+    "age_30s",
+    "age_40s",
+    "age_50s",
+    "age_60s",
+    "age_70s",
+    "age_80s",
+    "age_over_90",
+    "investigating",
+)
+AGE_LABELS = ("10歳未満", "10代", "20代", "30代", "40代", "50代", "60代", "70代", "80代", "90歳以上", "調査中等")
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
 class PatientsNumber:
     """新型コロナウイルス感染症日別年代別陽性患者数を表すデータモデル
 
@@ -68,6 +91,18 @@ class PatientsNumberFactory(Factory):
         """
         return PatientsNumber(**row)
 
+    def _create_item_from_values(self, *values) -> PatientsNumber:
+        """PatientsNumberオブジェクトを引数の順に並べた値から生成
+
+        Args:
+            values (tuple): PatientsNumberクラスの引数の順に並べた値
+
+        Returns:
+            item (:obj:`PatientsNumber`): PatientsNumberクラスのオブジェクト
+
+        """
+        return PatientsNumber(*values)
+
     def _register_item(self, item: PatientsNumber):
         """PatientsNumberオブジェクトをリストへ追加
 
@@ -76,3 +111,318 @@ class PatientsNumberFactory(Factory):
 
         """
         self.__items.append(item)
+
+
+def get_patients_number_dtype() -> "np.dtype":
+    """報道発表日と年代別の患者数の列を持つ構造化配列のdtypeを返す
+
+    Returns:
+        dtype (:obj:`np.dtype`): 報道発表日のdatetime64[D]と年代別の患者数のint32の列
+
+    """
+    import numpy as np
+
+    return np.dtype([("publication_date", "datetime64[D]")] + [(column, "int32") for column in AGE_COLUMNS])
+
+
+class PatientsNumberArrayItems(Sequence):
+    """構造化配列の行を参照時にPatientsNumberオブジェクトに変換するシーケンス
+
+    Attributes:
+        array (:obj:`np.ndarray`): 日別年代別陽性患者数の構造化配列
+
+    """
+
+    def __init__(self, array: "np.ndarray"):
+        self.__array = array
+
+    @property
+    def array(self):
+        return self.__array
+
+    def __len__(self) -> int:
+        return len(self.__array)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PatientsNumberArrayItems(self.__array[index])
+        return PatientsNumber(*self.__array[index].tolist())
+
+
+class PatientsNumberArrayFactory(Factory):
+    """日別年代別陽性患者数データをNumPyの構造化配列で保持する
+
+    1日ごとにオブジェクトを保持せず、報道発表日と年代別の患者数の列を持つ構造化配列に
+    まとめて保持する。追加した行は参照時にまとめて配列へ変換する。
+
+    Attributes:
+        array (:obj:`np.ndarray`): 日別年代別陽性患者数の構造化配列
+        items (:obj:`PatientsNumberArrayItems`): 日別年代別陽性患者数データのシーケンス
+            参照時にPatientsNumberクラスのオブジェクトに変換する
+
+    """
+
+    def __init__(self):
+        self.__pending = list()
+        self.__array = None
+        self.__to_values = attrgetter("publication_date", *AGE_COLUMNS)
+
+    @property
+    def array(self) -> "np.ndarray":
+        import numpy as np
+
+        if self.__array is None or self.__pending:
+            added = np.array(self.__pending, dtype=get_patients_number_dtype())
+            self.__array = added if self.__array is None else np.concatenate((self.__array, added))
+            self.__pending = list()
+        return self.__array
+
+    @property
+    def items(self) -> PatientsNumberArrayItems:
+        return PatientsNumberArrayItems(self.array)
+
+    def create_many(self, rows: Iterable[Sequence]) -> PatientsNumberArrayItems:
+        """日別年代別陽性患者数データのまとめての追加
+
+        PatientsNumberオブジェクトを生成せず、値のタプルのまま追加する。
+
+        Args:
+            rows (Iterable of tuple): 報道発表日と年代別の患者数の順に値を並べた行データのイテラブル
+                DictCursorの行データもそのまま渡せ、Noneの患者数は0とする
+
+        Returns:
+            items (:obj:`PatientsNumberArrayItems`): 追加後の日別年代別陽性患者数データのシーケンス
+
+        """
+        create_item = self._create_item_from_values
+        self.__pending.extend(create_item(*row) for row in rows)
+        return self.items
+
+    def _create_item(self, **row) -> PatientsNumber:
+        """PatientsNumberオブジェクトの生成
+
+        Args:
+            row (dict): 日別年代別陽性患者数データを表す辞書
+                新型コロナウイルス感染症日別年代別患者数データオブジェクトを
+                作成するための引数。
+
+        Returns:
+            patients_number (:obj:`PatientsNumber`): PatientsNumberクラスのオブジェクト
+
+        """
+        return PatientsNumber(**row)
+
+    def _create_item_from_values(self, *values) -> tuple:
+        """構造化配列の1行に追加する値のタプルの生成
+
+        Args:
+            values (tuple): 報道発表日と年代別の患者数の順に並べた値
+
+        Returns:
+            item (tuple): 患者数のNoneを0にした値のタプル
+
+        """
+        if len(values) != len(AGE_COLUMNS) + 1:
+            raise DataModelError("日別年代別陽性患者数データの列数が正しくありません。")
+        if not isinstance(values[0], date):
+            raise DataModelError("報道発表日が正しくありません。")
+
+        publication_date = values[0].date() if isinstance(values[0], datetime) else values[0]
+        return (publication_date,) + tuple(0 if value is None else value for value in values[1:])
+
+    def _register_item(self, item: PatientsNumber):
+        """PatientsNumberオブジェクトの値を構造化配列に追加する行へ加える
+
+        Args:
+            item (:obj:`PatientsNumber`): PatientsNumberクラスのオブジェクト
+
+        """
+        self.__pending.append(self.__to_values(item))
+
+    def get_totals(self) -> "np.ndarray":
+        """日ごとの年代別の患者数の合計を返す
+
+        Returns:
+            totals (:obj:`np.ndarray`): 日ごとの患者数の合計の配列
+
+        """
+        return self._get_counts().sum(axis=1, dtype="int64")
+
+    def validate(self, totals: Optional[Iterable[int]] = None) -> None:
+        """患者数が負の値でないこと、報道発表日が重複していないことを検証する
+
+        Args:
+            totals (Iterable of int): 報道発表資料にある日ごとの患者数の合計
+                指定した場合は年代別の患者数の合計と一致することも検証する
+
+        """
+        import numpy as np
+
+        array = self.array
+        counts = self._get_counts()
+        invalid_rows = (counts < 0).any(axis=1)
+        if invalid_rows.any():
+            raise DataModelError("患者数に負の値があります。: " + self._format_dates(array["publication_date"][invalid_rows]))
+
+        publication_dates, date_counts = np.unique(array["publication_date"], return_counts=True)
+        if (1 < date_counts).any():
+            raise DataModelError("報道発表日が重複しています。: " + self._format_dates(publication_dates[1 < date_counts]))
+
+        if totals is not None:
+            expected_totals = np.fromiter(totals, dtype="int64")
+            if len(expected_totals) != len(array):
+                raise DataModelError("患者数の合計の件数がデータの件数と一致しません。")
+            invalid_rows = self.get_totals() != expected_totals
+            if invalid_rows.any():
+                raise DataModelError(
+                    "年代別の患者数が合計と一致しません。: " + self._format_dates(array["publication_date"][invalid_rows])
+                )
+
+    def to_dataframe(self) -> "pd.DataFrame":
+        """行を報道発表日、列を年代とするDataFrameを返す
+
+        年代別の患者数は構造化配列のint32から、pandasの既定の整数型と同じint64に変換して返す。
+
+        Returns:
+            df (:obj:`pd.DataFrame`): 報道発表日ごとの年代別の患者数
+                インデックスはdatetime.dateオブジェクトとする
+
+        """
+        import pandas as pd
+
+        index = pd.Index(self.array["publication_date"].astype(object))
+        return pd.DataFrame(self._get_counts().astype("int64"), index=index, columns=list(AGE_LABELS), copy=False)
+
+    def to_data_lists(self, updated_at: datetime) -> list:
+        """Service.upsertへ渡す登録データの二次元配列リストを返す
+
+        Args:
+            updated_at (:obj:`datetime`): 更新日時
+
+        Returns:
+            data_lists (list of list): 報道発表日、年代別の患者数、更新日時の順に並べたリスト
+
+        """
+        return [list(row) + [updated_at] for row in self.array.tolist()]
+
+    def _get_counts(self) -> "np.ndarray":
+        """年代別の患者数の列をコピーせずに参照する二次元配列を返す"""
+        from numpy.lib.recfunctions import structured_to_unstructured
+
+        return structured_to_unstructured(self.array[list(AGE_COLUMNS)], copy=False)
+
+    @staticmethod
+    def _format_dates(publication_dates: "np.ndarray") -> str:
+        """エラーメッセージに表示する報道発表日の文字列を返す"""
+        return ",".join(str(publication_date) for publication_date in publication_dates[:10])
+
+
+class PatientsNumberRangeIndex:
+    """年代別の患者数の累積和による期間集計の索引
+
+    報道発表日の最初の日から最後の日までの1日ごとに、年代別の患者数の累積和を持ち、
+    任意の期間の合計を累積和の差から定数時間で求める。
+
+    Attributes:
+        start_date (date): 索引の最初の日付
+        end_date (date): 索引の最後の日付
+
+    """
+
+    def __init__(self, patients_numbers: PatientsNumberArrayFactory):
+        """
+        Args:
+            patients_numbers (:obj:`PatientsNumberArrayFactory`): 日別年代別陽性患者数データ
+
+        """
+        import numpy as np
+
+        array = patients_numbers.array
+        self.__columns = dict((column, i) for i, column in enumerate(AGE_COLUMNS))
+        if len(array) == 0:
+            self.__start = None
+            self.__cumulative_sums = np.zeros((1, len(AGE_COLUMNS)), dtype="int64")
+            return
+
+        publication_dates = array["publication_date"]
+        self.__start = publication_dates.min()
+        offsets = (publication_dates - self.__start).astype("int64")
+        daily = np.zeros((int(offsets.max()) + 1, len(AGE_COLUMNS)), dtype="int64")
+        # 同じ日付の行があれば合計する
+        np.add.at(daily, offsets, np.stack([array[column] for column in AGE_COLUMNS], axis=1))
+        self.__cumulative_sums = np.zeros((len(daily) + 1, len(AGE_COLUMNS)), dtype="int64")
+        np.cumsum(daily, axis=0, out=self.__cumulative_sums[1:])
+
+    @property
+    def start_date(self) -> Optional[date]:
+        if self.__start is None:
+            return None
+        return self.__start.item()
+
+    @property
+    def end_date(self) -> Optional[date]:
+        if self.__start is None:
+            return None
+        return (self.__start + len(self.__cumulative_sums) - 2).item()
+
+    def get_totals_by_age(self, from_date: date, to_date: date, ages: Optional[Iterable[str]] = None) -> list:
+        """指定した期間の年代別の患者数の合計を返す
+
+        Args:
+            from_date (date): 集計の始期
+            to_date (date): 集計の終期
+            ages (list of str): 集計する年代の列名のリスト
+                省略した場合は調査中等を含むすべての年代とする
+
+        Returns:
+            totals_by_age (list of tuple): 年代の列名と患者数の合計を要素とするタプルのリスト
+
+        """
+        indexes = self._get_column_indexes(ages)
+        totals = self._get_range_sums(from_date, to_date)[indexes].tolist()
+        return [(AGE_COLUMNS[index], total) for index, total in zip(indexes, totals)]
+
+    def get_total(self, from_date: date, to_date: date, ages: Optional[Iterable[str]] = None) -> int:
+        """指定した期間の患者数の合計を返す
+
+        Args:
+            from_date (date): 集計の始期
+            to_date (date): 集計の終期
+            ages (list of str): 集計する年代の列名のリスト
+                省略した場合は調査中等を含むすべての年代とする
+
+        Returns:
+            total (int): 患者数の合計
+
+        """
+        return int(self._get_range_sums(from_date, to_date)[self._get_column_indexes(ages)].sum())
+
+    def _get_offset(self, target_date: date) -> int:
+        """日付を累積和の配列の行番号に変換する"""
+        if isinstance(target_date, datetime):
+            target_date = target_date.date()
+        if self.__start is None:
+            return 0
+        offset = (target_date - self.__start.item()).days
+        return min(max(offset, 0), len(self.__cumulative_sums) - 1)
+
+    def _get_range_sums(self, from_date: date, to_date: date) -> "np.ndarray":
+        """指定した期間の年代ごとの合計の配列を返す"""
+        if not isinstance(from_date, date) or not isinstance(to_date, date):
+            raise DataModelError("期間の範囲指定が日付になっていません。")
+
+        start = self._get_offset(from_date)
+        end = max(self._get_offset(to_date + timedelta(days=1)), start)
+        return self.__cumulative_sums[end] - self.__cumulative_sums[start]
+
+    def _get_column_indexes(self, ages: Optional[Iterable[str]]) -> list:
+        """年代の列名のリストを列番号のリストに変換する"""
+        if ages is None:
+            return list(range(len(AGE_COLUMNS)))
+
+        indexes = list()
+        for age in ages:
+            if age not in self.__columns:
+                raise DataModelError("年代の指定が正しくありません。: " + str(age))
+            indexes.append(self.__columns[age])
+        return indexes
@@ -4,7 +4,7 @@ from ..errors import DataModelError
 from ..models.factory import Factory
 
 
-@dataclass()
+@dataclass(slots=True)
 class Point:
     """
     緯度と経度を要素に持つ地点情報を表す
@@ -59,6 +59,18 @@ class PointFactory(Factory):
         """
         return Point(**row)
 
+    def _create_item_from_values(self, *values) -> Point:
+        """Pointオブジェクトを引数の順に並べた値から生成
+
+        Args:
+            values (tuple): Pointクラスの引数の順に並べた値
+
+        Returns:
+            item (:obj:`Point`): Pointクラスのオブジェクト
+
+        """
+        return Point(*values)
+
     def _register_item(self, item: Point):
         """Pointオブジェクトをリストへ追加
 
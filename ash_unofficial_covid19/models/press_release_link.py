@@ -15,6 +15,8 @@ class PressReleaseLink:
 
     """
 
+    __slots__ = ("__url", "__publication_date")
+
     def __init__(
         self,
         url: str,
@@ -68,6 +70,18 @@ class PressReleaseLinkFactory(Factory):
         """
         return PressReleaseLink(**row)
 
+    def _create_item_from_values(self, *values) -> PressReleaseLink:
+        """PressReleaseLinkオブジェクトを引数の順に並べた値から生成
+
+        Args:
+            values (tuple): PressReleaseLinkクラスの引数の順に並べた値
+
+        Returns:
+            item (:obj:`PressReleaseLink`): PressReleaseLinkクラスのオブジェクト
+
+        """
+        return PressReleaseLink(*values)
+
     def _register_item(self, item: PressReleaseLink):
         """PressReleaseLinkオブジェクトをリストへ追加
 
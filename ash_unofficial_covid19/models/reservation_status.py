@@ -5,7 +5,7 @@ from typing import Optional
 from ..models.factory import Factory
 
 
-@dataclass()
+@dataclass(slots=True)
 class ReservationStatus:
     """新型コロナワクチン接種医療機関予約受付状況を表すモデルオブジェクト
 
@@ -70,6 +70,18 @@ class ReservationStatusFactory(Factory):
         """
         return ReservationStatus(**row)
 
+    def _create_item_from_values(self, *values) -> ReservationStatus:
+        """ReservationStatusオブジェクトを引数の順に並べた値から生成
+
+        Args:
+            values (tuple): ReservationStatusクラスの引数の順に並べた値
+
+        Returns:
+            item (:obj:`ReservationStatus`): ReservationStatusクラスのオブジェクト
+
+        """
+        return ReservationStatus(*values)
+
     def _register_item(self, item: ReservationStatus):
         """ReservationStatusオブジェクトをリストへ追加
 
@@ -80,7 +92,7 @@ class ReservationStatusFactory(Factory):
         self.__items.append(item)
 
 
-@dataclass()
+@dataclass(slots=True)
 class ReservationStatusLocation(ReservationStatus):
     """新型コロナワクチン接種医療機関予約受付状況詳細データモデル
 
@@ -150,6 +162,18 @@ class ReservationStatusLocationFactory(Factory):
         """
         return ReservationStatusLocation(**row)
 
+    def _create_item_from_values(self, *values) -> ReservationStatusLocation:
+        """ReservationStatusLocationオブジェクトを引数の順に並べた値から生成
+
+        Args:
+            values (tuple): ReservationStatusLocationクラスの引数の順に並べた値
+
+        Returns:
+            item (:obj:`ReservationStatusLocation`): ReservationStatusLocationクラスのオブジェクト
+
+        """
+        return ReservationStatusLocation(*values)
+
     def _register_item(self, item: ReservationStatusLocation):
         """ReservationStatusLocationオブジェクトをリストへ追加
 
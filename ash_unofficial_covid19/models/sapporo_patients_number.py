@@ -12,6 +12,8 @@ class SapporoPatientsNumber:
 
     """
 
+    __slots__ = ("__publication_date", "__patients_number")
+
     def __init__(self, publication_date: date, patients_number: int):
         """
         Args:
@@ -62,6 +64,18 @@ class SapporoPatientsNumberFactory(Factory):
         """
         return SapporoPatientsNumber(**row)
 
+    def _create_item_from_values(self, *values) -> SapporoPatientsNumber:
+        """SapporoPatientsNumberオブジェクトを引数の順に並べた値から生成
+
+        Args:
+            values (tuple): SapporoPatientsNumberクラスの引数の順に並べた値
+
+        Returns:
+            item (:obj:`SapporoPatientsNumber`): SapporoPatientsNumberクラスのオブジェクト
+
+        """
+        return SapporoPatientsNumber(*values)
+
     def _register_item(self, item: SapporoPatientsNumber):
         """SapporoPatientsNumberオブジェクトをリストへ追加
 
@@ -12,6 +12,8 @@ class TokyoPatientsNumber:
 
     """
 
+    __slots__ = ("__publication_date", "__patients_number")
+
     def __init__(self, publication_date: date, patients_number: int):
         """
         Args:
@@ -62,6 +64,18 @@ class TokyoPatientsNumberFactory(Factory):
         """
         return TokyoPatientsNumber(**row)
 
+    def _create_item_from_values(self, *values) -> TokyoPatientsNumber:
+        """TokyoPatientsNumberオブジェクトを引数の順に並べた値から生成
+
+        Args:
+            values (tuple): TokyoPatientsNumberクラスの引数の順に並べた値
+
+        Returns:
+            item (:obj:`TokyoPatientsNumber`): TokyoPatientsNumberクラスのオブジェクト
+
+        """
+        return TokyoPatientsNumber(*values)
+
     def _register_item(self, item: TokyoPatientsNumber):
         """TokyoPatientsNumberオブジェクトをリストへ追加
 
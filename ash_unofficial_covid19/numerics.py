@@ -0,0 +1,174 @@
+from decimal import ROUND_HALF_UP, Decimal
+from typing import TYPE_CHECKING, Sequence, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# 境界値(n + 0.5) / 10 ** digitsの有効桁数が15桁以内であれば、浮動小数点数との比較で
+# Decimal(str(x))との比較と同じ結果になる
+MAX_SCALED_VALUE = 1e14
+
+
+def _round_half_up_decimal(value: float, digits: int) -> float:
+    """Decimalで1件ずつ四捨五入する
+
+    Args:
+        value (float): 四捨五入する値
+        digits (int): 小数点以下の桁数
+
+    Returns:
+        rounded_value (float): 四捨五入した値
+
+    """
+    return float(Decimal(str(value)).quantize(Decimal(1).scaleb(-digits), rounding=ROUND_HALF_UP))
+
+
+def round_half_up(values: Union[float, Sequence[float], "np.ndarray"], digits: int = 0):
+    """小数点以下の指定した桁数で四捨五入する
+
+    Decimal(str(x)).quantize(..., rounding=ROUND_HALF_UP)と同じ結果を、配列全体に対して
+    まとめて計算する。0.5ちょうどの場合は絶対値の大きい方へ丸める。
+
+    境界値に近い値はstr(x)の10進数表記で判定されるため、x * 10 ** digitsを単純に丸めずに、
+    (n ± 0.5) / 10 ** digitsの浮動小数点数と比較して補正する。範囲外の大きな値と
+    有限でない値はDecimalで計算する。
+
+    Args:
+        values (float or array_like): 四捨五入する値
+        digits (int): 小数点以下の桁数（0から15まで）
+
+    Returns:
+        rounded_values (float or :obj:`np.ndarray`): 四捨五入した値
+            スカラーを渡した場合はfloat、配列を渡した場合はfloat64の配列
+
+    """
+    import numpy as np
+
+    if not 0 <= digits <= 15:
+        raise ValueError("小数点以下の桁数は0から15までの範囲で指定してください。")
+
+    array = np.asarray(values, dtype="float64")
+    scale = float(10**digits)
+    magnitude = np.abs(array)
+    with np.errstate(invalid="ignore", over="ignore"):
+        scaled = magnitude * scale
+        in_range = scaled < MAX_SCALED_VALUE
+        rounded = np.rint(np.where(in_range, scaled, 0.0))
+    # 積の丸め誤差でnが1ずれている場合は境界値との比較で補正する
+    rounded = np.where(magnitude >= (rounded + 0.5) / scale, rounded + 1, rounded)
+    rounded = np.where(magnitude < (rounded - 0.5) / scale, rounded - 1, rounded)
+    result = np.copysign(rounded / scale, array)
+
+    if not in_range.all():
+        for index in zip(*np.nonzero(~in_range)):
+            result[index] = _round_half_up_decimal(float(array[index]), digits)
+
+    if result.ndim == 0:
+        return float(result)
+    return result
+
+
+def get_per_hundred_thousand_population(patients_numbers: Sequence[int], population: int) -> list:
+    """人口10万人あたりの患者数を小数点以下第2位で四捨五入して返す
+
+    Args:
+        patients_numbers (list of int): 患者数のリスト
+        population (int): 人口
+
+    Returns:
+        per_hundred_thousand_population (list of float): 人口10万人あたりの患者数のリスト
+
+    """
+    import numpy as np
+
+    array = np.asarray(patients_numbers, dtype="float64")
+    return round_half_up(array / population * 100000, 2).tolist()
+
+
+def get_rolling_sums(daily_numbers: Sequence[int], window: int) -> "np.ndarray":
+    """累積和の差から期間ごとの合計を求める
+
+    Args:
+        daily_numbers (list of int): 1日ごとの患者数のリスト
+        window (int): 合計する日数
+
+    Returns:
+        rolling_sums (:obj:`np.ndarray`): 各日を末日とするwindow日間の合計の配列
+            先頭のwindow - 1日分は含まないため、要素数はlen(daily_numbers) - window + 1
+
+    """
+    import numpy as np
+
+    if window < 1:
+        raise ValueError("合計する日数は1以上で指定してください。")
+
+    cumulative_sums = np.concatenate(([0], np.cumsum(np.asarray(daily_numbers, dtype="int64"))))
+    return cumulative_sums[window:] - cumulative_sums[:-window]
+
+
+def get_moving_averages(daily_numbers: Sequence[int], window: int = 7) -> list:
+    """移動平均を小数点以下第2位で四捨五入して返す
+
+    Args:
+        daily_numbers (list of int): 1日ごとの患者数のリスト
+        window (int): 平均する日数
+
+    Returns:
+        moving_averages (list of float): 各日を末日とするwindow日間の1日あたりの平均のリスト
+            先頭のwindow - 1日分は含まない
+
+    """
+    return round_half_up(get_rolling_sums(daily_numbers, window) / window, 2).tolist()
+
+
+def get_reproduction_numbers(daily_numbers: Sequence[int], generation_time: int = 5) -> list:
+    """実効再生産数の簡易推定値を小数点以下第2位で四捨五入して返す
+
+    直近7日間の合計を、世代時間前の日を末日とする7日間の合計で割る。
+    世代時間前の7日間の合計が0の場合は0とする。
+
+    Args:
+        daily_numbers (list of int): 1日ごとの患者数のリスト
+        generation_time (int): 世代時間（日数）
+
+    Returns:
+        reproduction_numbers (list of float): 各日の実効再生産数のリスト
+            先頭の6 + generation_time日分は含まない
+
+    """
+    import numpy as np
+
+    weekly_sums = get_rolling_sums(daily_numbers, 7)
+    latest_sums = weekly_sums[generation_time:]
+    generation_time_before_sums = weekly_sums[: len(weekly_sums) - generation_time]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        reproduction_numbers = np.where(
+            generation_time_before_sums == 0, 0.0, latest_sums / generation_time_before_sums
+        )
+    return round_half_up(reproduction_numbers, 2).tolist()
+
+
+def get_growth_rates(daily_numbers: Sequence[int], window: int = 7) -> list:
+    """直近の期間の合計の、その前の同じ日数の合計からの増加率を小数点以下第2位で四捨五入して返す
+
+    Args:
+        daily_numbers (list of int): 1日ごとの患者数のリスト
+        window (int): 比較する期間の日数
+
+    Returns:
+        growth_rates (list of float): 各日を末日とするwindow日間の合計の増加率のリスト
+            0.25は25%の増加を表し、前の期間の合計が0の場合はNoneとする
+            先頭の2 * window - 1日分は含まない
+
+    """
+    import numpy as np
+
+    rolling_sums = get_rolling_sums(daily_numbers, window)
+    latest_sums = rolling_sums[window:]
+    previous_sums = rolling_sums[: len(rolling_sums) - window]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth_rates = np.where(previous_sums == 0, 0.0, latest_sums / previous_sums - 1)
+    growth_rates = round_half_up(growth_rates, 2).tolist()
+    return [
+        None if previous_sum == 0 else growth_rate for previous_sum, growth_rate in zip(previous_sums, growth_rates)
+    ]
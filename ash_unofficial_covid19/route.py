@@ -1,10 +1,16 @@
 import mimetypes
+import re
+import time
+import uuid
+from datetime import date
 
 from flask import Flask, abort, escape, g, make_response, render_template, request
 
 from .config import Config
 from .errors import ViewError
-from .services.database import ConnectionPool
+from .logs import reset_request_id, set_request_id
+from .services.database import ConnectionPool, QueryCollector
+from .views.graph_cache import GraphImageCache
 from .views.outpatient import OutpatientView
 from .views.patient import AsahikawaPatientView
 from .views.patients_number import (
@@ -50,6 +56,62 @@ def add_security_headers(response):
     return response
 
 
+@app.before_request
+def start_request_id():
+    # nginxなどが付けたリクエストIDがあれば引き継ぐ
+    request_id = request.headers.get("X-Request-ID", "")
+    if not re.fullmatch(r"[0-9A-Za-z._-]{1,64}", request_id):
+        request_id = uuid.uuid4().hex
+    g.request_id = request_id
+    g.request_id_token = set_request_id(request_id)
+
+
+@app.after_request
+def add_request_id_header(response):
+    request_id = g.get("request_id")
+    if request_id is not None:
+        response.headers["X-Request-ID"] = request_id
+    return response
+
+
+@app.teardown_request
+def end_request_id(e):
+    request_id_token = g.pop("request_id_token", None)
+    if request_id_token is not None:
+        reset_request_id(request_id_token)
+
+
+@app.before_request
+def start_query_collection():
+    g.request_started_at = time.perf_counter()
+    g.query_collector = QueryCollector()
+    g.query_collector_token = g.query_collector.activate()
+
+
+@app.after_request
+def add_server_timing_header(response):
+    query_collector = g.get("query_collector")
+    if query_collector is None:
+        return response
+
+    total_duration = (time.perf_counter() - g.request_started_at) * 1000
+    db_duration = query_collector.total_duration
+    server_timing = (
+        'db;desc="{0} queries";dur={1:.1f}'.format(query_collector.count, db_duration)
+        + ", "
+        + "render;dur={0:.1f}".format(max(0.0, total_duration - db_duration))
+    )
+    response.headers.add("Server-Timing", server_timing)
+    return response
+
+
+@app.teardown_request
+def end_query_collection(e):
+    query_collector_token = g.pop("query_collector_token", None)
+    if query_collector_token is not None:
+        QueryCollector.deactivate(query_collector_token)
+
+
 def get_connection():
     if "db" not in g:
         g.db = ConnectionPool()
@@ -64,6 +126,13 @@ def close_connection(e):
         db.close_connection()
 
 
+def get_graph_image_cache():
+    if "graph_image_cache" not in g:
+        g.graph_image_cache = GraphImageCache()
+
+    return g.graph_image_cache
+
+
 def get_today():
     if "today" not in g:
         conn = get_connection()
@@ -136,6 +205,23 @@ def get_rss():
     return RssView(today, conn)
 
 
+GRAPH_DATA_VIEWS = {
+    "daily_total": get_daily_total,
+    "month_total": get_month_total,
+    "by_age": get_by_age,
+    "per_hundred_thousand_population": get_per_hundred_thousand_population,
+    "weekly_per_age": get_weekly_per_age,
+    "monthly_per_age": get_monthly_per_age,
+}
+
+
+def get_graph_size_arg(key, default):
+    value = request.args.get(key, str(default))
+    if not value.isdecimal():
+        abort(400)
+    return int(value)
+
+
 @app.route("/")
 def index():
     return render_template(
@@ -152,6 +238,112 @@ def index():
     )
 
 
+@app.route("/graph/<name>.webp")
+def graph_image(name):
+    if name not in GRAPH_DATA_VIEWS:
+        abort(404)
+
+    width = get_graph_size_arg("w", 960)
+    height = get_graph_size_arg("h", 480)
+    dpi = get_graph_size_arg("dpi", 100)
+    if (width, height, dpi) not in Config.GRAPH_PREWARM_SIZES:
+        abort(404)
+
+    conn = get_connection()
+    today = get_today()
+    graph_image_cache = get_graph_image_cache()
+    data_version = graph_image_cache.get_data_version(today, conn)
+    etag = graph_image_cache.get_etag(name, width, height, dpi, data_version)
+    res = make_response()
+    res.set_etag(etag)
+    res.headers["Cache-Control"] = "public, max-age=300"
+    if request.if_none_match.contains(etag):
+        res.status_code = 304
+        return res
+
+    graph_image = graph_image_cache.get(etag)
+    if graph_image is None:
+        graph_image = graph_image_cache.render(name, width, height, dpi, today, conn, data_version)
+    res.data = graph_image
+    res.headers["Content-Type"] = "image/webp"
+    return res
+
+
+@app.route("/api/graph/<name>.json")
+def graph_json(name):
+    if name not in GRAPH_DATA_VIEWS:
+        abort(404)
+
+    graph_data = GRAPH_DATA_VIEWS[name]()
+    res = make_response()
+    res.data = graph_data.get_graph_json()
+    res.headers["Content-Type"] = "application/json; charset=UTF-8"
+    res.headers["Cache-Control"] = "public, max-age=300"
+    res.add_etag()
+    return res.make_conditional(request)
+
+
+@app.route("/api/series/<name>.json")
+def series_json(name):
+    if name not in PatientsNumberView.SERIES_HEADERS:
+        abort(404)
+
+    patients_numbers = get_patients_numbers()
+    res = make_response()
+    res.data = patients_numbers.get_series_json(name)
+    res.headers["Content-Type"] = "application/json; charset=UTF-8"
+    res.headers["Cache-Control"] = "public, max-age=300"
+    res.add_etag()
+    return res.make_conditional(request)
+
+
+@app.route("/api/series/<name>.csv")
+def series_csv(name):
+    if name not in PatientsNumberView.SERIES_HEADERS:
+        abort(404)
+
+    patients_numbers = get_patients_numbers()
+    res = make_response()
+    res.data = patients_numbers.get_series_csv(name)
+    res.headers["Content-Type"] = "text/csv"
+    res.headers["Content-Disposition"] = "attachment; filename=" + "012041_asahikawa_covid19_" + name + ".csv"
+    res.headers["Cache-Control"] = "public, max-age=300"
+    res.add_etag()
+    return res.make_conditional(request)
+
+
+def get_date_arg(key):
+    value = request.args.get(key)
+    if value is None or value == "":
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        abort(400)
+
+
+@app.route("/api/range_total.json")
+def range_total_json():
+    from_date = get_date_arg("from")
+    to_date = get_date_arg("to")
+    ages = request.args.get("ages")
+    if ages is not None:
+        ages = [age for age in ages.split(",") if age]
+
+    patients_numbers = get_patients_numbers()
+    try:
+        json_data = patients_numbers.get_range_total_json(from_date=from_date, to_date=to_date, ages=ages)
+    except ViewError:
+        abort(400)
+
+    res = make_response()
+    res.data = json_data
+    res.headers["Content-Type"] = "application/json; charset=UTF-8"
+    res.headers["Cache-Control"] = "public, max-age=300"
+    res.add_etag()
+    return res.make_conditional(request)
+
+
 """
 @app.route("/past")
 def past():
@@ -1,7 +1,9 @@
+import codecs
 import json
 from abc import ABCMeta, abstractmethod
 from io import BytesIO, StringIO
 from json import JSONDecodeError
+from typing import Iterator
 
 import requests
 from requests import HTTPError, Timeout
@@ -9,6 +11,7 @@ from urllib3.exceptions import MaxRetryError
 
 from ..errors import HTTPDownloadError
 from ..logs import AppLog
+from ..metrics import PipelineMetrics
 
 
 class Downloader(metaclass=ABCMeta):
@@ -92,7 +95,10 @@ class DownloadedHTML(Downloader):
 
         """
         try:
-            response = requests.get(url)
+            with PipelineMetrics.stage("download"):
+                response = requests.get(url)
+                if response.status_code == 200:
+                    PipelineMetrics.count("bytes_downloaded", len(response.content))
         except (ConnectionError, MaxRetryError, Timeout, HTTPError):
             message = "cannot connect to web server."
             self.error_log(message)
@@ -148,7 +154,10 @@ class DownloadedCSV(Downloader):
 
         """
         try:
-            response = requests.get(url)
+            with PipelineMetrics.stage("download"):
+                response = requests.get(url)
+                if response.status_code == 200:
+                    PipelineMetrics.count("bytes_downloaded", len(response.content))
         except (ConnectionError, MaxRetryError, Timeout, HTTPError):
             message = "cannot connect to web server."
             self.error_log(message)
@@ -169,6 +178,116 @@ class DownloadedCSV(Downloader):
         return csv_io
 
 
+class StreamedCSV(Downloader):
+    """CSVファイルの逐次取得
+
+    WebサイトからCSVファイルを少しずつダウンロードしながら文字コードを変換し、
+    1行ずつ返すイテレータを提供する。ファイル全体をメモリ上に保持しない。
+
+    Attributes:
+        content (Iterator[str]): ダウンロードしたCSVファイルの行を順に返すイテレータ
+        url (str): ダウンロードしたCSVファイルのURL
+
+    """
+
+    def __init__(self, url: str, encoding: str = "utf-8", chunk_size: int = 65536):
+        """
+        Args:
+            url (str): WebサイトのCSVファイルのURL
+            encoding (str): CSVファイルの文字コード
+            chunk_size (int): 1回に読み込むバイト数
+
+        """
+        Downloader.__init__(self)
+        self.__url = url
+        self.__response = self._get_response(self.__url)
+        self.__content = self._iter_lines(encoding=encoding, chunk_size=chunk_size)
+
+    @property
+    def content(self) -> Iterator[str]:
+        return self.__content
+
+    @property
+    def url(self) -> str:
+        return self.__url
+
+    def _get_response(self, url: str) -> requests.Response:
+        """WebサイトのCSVファイルへのストリーミングでのレスポンスを取得
+
+        Args:
+            url (str): CSVファイルのURL
+
+        Returns:
+            response (:obj:`requests.Response`): 本文を未読み込みのレスポンス
+
+        """
+        try:
+            with PipelineMetrics.stage("download"):
+                response = requests.get(url, stream=True)
+        except (ConnectionError, MaxRetryError, Timeout, HTTPError):
+            message = "cannot connect to web server."
+            self.error_log(message)
+            raise HTTPDownloadError(message)
+        if response.status_code != 200:
+            message = "cannot get CSV contents."
+            self.error_log(message)
+            raise HTTPDownloadError(message)
+
+        return response
+
+    def _iter_lines(self, encoding: str, chunk_size: int) -> Iterator[str]:
+        """ダウンロードしながら文字コードを変換したCSVファイルの行を順に返す
+
+        csv.readerへ渡すため、改行文字は各行の末尾に残す。
+
+        Args:
+            encoding (str): CSVファイルの文字コード
+            chunk_size (int): 1回に読み込むバイト数
+
+        Yields:
+            line (str): CSVファイルの1行
+
+        """
+        buffer = ""
+        try:
+            for text in codecs.iterdecode(
+                self._count_chunks(self.__response.iter_content(chunk_size=chunk_size)), encoding
+            ):
+                buffer += text
+                lines = buffer.split("\n")
+                buffer = lines.pop()
+                for line in lines:
+                    yield line + "\n"
+        except UnicodeDecodeError:
+            message = "ダウンロードしたコンテンツの文字コードが正しくありません。"
+            self.error_log(message)
+            raise HTTPDownloadError(message)
+        finally:
+            self.__response.close()
+
+        if buffer:
+            yield buffer
+
+        self.info_log("CSVファイルのダウンロードに成功しました。")
+
+    @staticmethod
+    def _count_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """ダウンロードしたバイト数を計測しながらチャンクをそのまま返す
+
+        解析しながらダウンロードするため、チャンクの受信だけをdownloadの段階として計測する。
+
+        """
+        chunks = iter(chunks)
+        while True:
+            with PipelineMetrics.stage("download"):
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    PipelineMetrics.count("bytes_downloaded", len(chunk))
+            if chunk is None:
+                return
+            yield chunk
+
+
 class DownloadedPDF(Downloader):
     """PDFファイルのBytesIOデータの取得
 
@@ -209,7 +328,10 @@ class DownloadedPDF(Downloader):
 
         """
         try:
-            response = requests.get(url)
+            with PipelineMetrics.stage("download"):
+                response = requests.get(url)
+                if response.status_code == 200:
+                    PipelineMetrics.count("bytes_downloaded", len(response.content))
             self.info_log("PDFファイルのダウンロードに成功しました。")
         except (ConnectionError, MaxRetryError, Timeout, HTTPError):
             message = "cannot connect to web server."
@@ -264,7 +386,10 @@ class DownloadedJSON(Downloader):
 
         """
         try:
-            response = requests.get(url)
+            with PipelineMetrics.stage("download"):
+                response = requests.get(url)
+                if response.status_code == 200:
+                    PipelineMetrics.count("bytes_downloaded", len(response.content))
             self.info_log("JSONファイルのダウンロードに成功しました。")
         except (ConnectionError, MaxRetryError, Timeout, HTTPError):
             message = "cannot connect to web server."
@@ -325,7 +450,10 @@ class DownloadedExcel(Downloader):
 
         """
         try:
-            response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
+            with PipelineMetrics.stage("download"):
+                response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
+                if response.status_code == 200:
+                    PipelineMetrics.count("bytes_downloaded", len(response.content))
             self.info_log("Excelファイルのダウンロードに成功しました。")
         except (ConnectionError, MaxRetryError, Timeout, HTTPError):
             message = "cannot connect to web server."
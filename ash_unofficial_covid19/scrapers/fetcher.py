@@ -0,0 +1,154 @@
+import inspect
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from typing import Iterator
+from urllib.parse import urlparse
+
+from ..config import Config
+
+
+class ConcurrentFetcher:
+    """複数のURLのダウンロードと解析の並行実行
+
+    スレッドプールで複数のスクレイピング処理を並行で実行する。
+    同じホストへの同時接続数は上限を超えないよう制限する。
+    実行結果は上限のあるキューを通して呼び出し元のスレッドへ渡すため、
+    呼び出し元の処理が追いつかない間はワーカースレッドが待機する。
+
+    Attributes:
+        max_workers (int): 並行実行するスレッドの最大数
+        max_per_host (int): 同一ホストへの同時接続数の上限
+
+    """
+
+    def __init__(self, max_workers: int = Config.FETCH_MAX_WORKERS, max_per_host: int = Config.FETCH_MAX_PER_HOST):
+        """
+        Args:
+            max_workers (int): 並行実行するスレッドの最大数
+            max_per_host (int): 同一ホストへの同時接続数の上限
+
+        """
+        if max_workers < 1 or max_per_host < 1:
+            raise ValueError("並行実行数の指定が正しくありません。")
+
+        self.__max_workers = max_workers
+        self.__max_per_host = max_per_host
+        self.__host_semaphores: dict[str, threading.BoundedSemaphore] = dict()
+        self.__lock = threading.Lock()
+
+    @property
+    def max_workers(self) -> int:
+        return self.__max_workers
+
+    @property
+    def max_per_host(self) -> int:
+        return self.__max_per_host
+
+    def _get_host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        """URLのホストごとの同時接続数を制限するセマフォを返す
+
+        Args:
+            url (str): ダウンロードするURL
+
+        Returns:
+            semaphore (:obj:`threading.BoundedSemaphore`): ホストごとのセマフォ
+
+        """
+        host = urlparse(url).netloc
+        with self.__lock:
+            if host not in self.__host_semaphores:
+                self.__host_semaphores[host] = threading.BoundedSemaphore(self.__max_per_host)
+            return self.__host_semaphores[host]
+
+    @staticmethod
+    def _put(results: queue.Queue, stopped: threading.Event, item: tuple) -> bool:
+        """実行結果をキューへ入れる
+
+        Args:
+            results (:obj:`queue.Queue`): 実行結果を呼び出し元のスレッドへ渡すキュー
+            stopped (:obj:`threading.Event`): 呼び出し元が結果の取得をやめたことを表すイベント
+            item (tuple): タスク、結果を持つオブジェクト、タスクが終了したかどうかのタプル
+
+        Returns:
+            put (bool): キューへ入れた場合はTrue、呼び出し元が結果の取得をやめた場合はFalse
+
+        """
+        while not stopped.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self, task: tuple, results: queue.Queue, stopped: threading.Event) -> None:
+        """タスクを実行して結果をキューへ入れる
+
+        関数がジェネレータを返す場合は、ホストごとの同時接続数の枠を保持したまま
+        ジェネレータの要素を1件ずつキューへ入れる。
+
+        Args:
+            task (tuple): 実行するタスク
+            results (:obj:`queue.Queue`): 実行結果を呼び出し元のスレッドへ渡すキュー
+            stopped (:obj:`threading.Event`): 呼び出し元が結果の取得をやめたことを表すイベント
+
+        """
+        future = Future()
+        try:
+            with self._get_host_semaphore(task[0]):
+                result = task[1](**task[2])
+                if inspect.isgenerator(result):
+                    with closing(result):
+                        for item in result:
+                            item_future = Future()
+                            item_future.set_result(item)
+                            if not self._put(results, stopped, (task, item_future, False)):
+                                return
+                    future = None
+                else:
+                    future.set_result(result)
+        except Exception as e:
+            future = Future()
+            future.set_exception(e)
+
+        self._put(results, stopped, (task, future, True))
+
+    def fetch(self, tasks: list) -> Iterator[tuple[tuple, Future]]:
+        """スクレイピング処理を並行で実行し、完了した順に結果を返す
+
+        ダウンロード中の例外は結果の取得時に呼び出し元のスレッドで送出されるため、
+        呼び出し元でデータベースへの登録などの後続処理とあわせて例外処理を行う。
+        結果の処理中に呼び出し元がtasksへ追加したタスクも、他のタスクの完了を待たずに実行する。
+        関数がジェネレータを返すタスクは、ジェネレータの要素ごとに結果を返す。
+
+        Args:
+            tasks (list of tuple): ダウンロードするURL、実行する関数、関数のキーワード引数のタプルのリスト
+                関数はダウンロードするURLを含むキーワード引数で呼び出される。
+                4番目以降の要素は呼び出し元で結果を識別するために任意に使用できる。
+
+        Yields:
+            task (tuple): 完了したタスク
+            future (:obj:`Future`): 完了したタスクの結果を持つオブジェクト
+
+        """
+        results = queue.Queue(maxsize=self.__max_workers * 2)
+        stopped = threading.Event()
+        with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+            try:
+                running = 0
+                submitted = 0
+                while submitted < len(tasks) or running:
+                    for task in tasks[submitted:]:
+                        executor.submit(self._run, task, results, stopped)
+                        running += 1
+                    submitted = len(tasks)
+                    task, future, finished = results.get()
+                    if finished:
+                        running -= 1
+                    if future is not None:
+                        yield task, future
+            finally:
+                # 途中で結果の取得をやめた場合も、キューへの格納を待つワーカースレッドを終了させる
+                stopped.set()
@@ -0,0 +1,315 @@
+import threading
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from ..config import Config
+from ..errors import HTTPDownloadError, ScrapeError
+from ..scrapers.location import ScrapeYOLPLocation
+
+
+class TokenBucket:
+    """トークンバケット方式のレート制限
+
+    一定の速度でトークンを補充し、トークンを1つ消費するごとに1回の処理を許可する。
+    複数のスレッドから同時に呼び出すことができる。
+
+    Attributes:
+        rate (float): 1秒あたりに補充するトークン数
+        capacity (int): 貯められるトークンの最大数
+
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        """
+        Args:
+            rate (float): 1秒あたりに補充するトークン数
+            capacity (int): 貯められるトークンの最大数
+
+        """
+        if rate <= 0 or capacity < 1:
+            raise ValueError("レート制限の指定が正しくありません。")
+
+        self.__rate = rate
+        self.__capacity = capacity
+        self.__tokens = float(capacity)
+        self.__updated_at = time.monotonic()
+        self.__lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self.__rate
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    def acquire(self) -> None:
+        """トークンを1つ消費する。トークンがなければ補充されるまで待つ。"""
+        while True:
+            with self.__lock:
+                now = time.monotonic()
+                self.__tokens = min(self.__capacity, self.__tokens + (now - self.__updated_at) * self.__rate)
+                self.__updated_at = now
+                if 1 <= self.__tokens:
+                    self.__tokens -= 1
+                    return
+
+                wait_seconds = (1 - self.__tokens) / self.__rate
+
+            time.sleep(wait_seconds)
+
+
+class FacilityIndex:
+    """医療機関名と所在地の文字n-gramによる索引
+
+    北海道オープンデータポータルの医療機関データから、医療機関名の文字n-gramの転置索引を作り、
+    表記揺れのある医療機関名からでも緯度経度を検索できるようにする。
+
+    Attributes:
+        threshold (float): 一致とみなす類似度の下限
+
+    """
+
+    def __init__(self, facilities: list, threshold: float = Config.GEOCODE_LOCAL_MATCH_THRESHOLD, n: int = 2):
+        """
+        Args:
+            facilities (list of dict): 医療機関名、所在地、緯度経度の辞書のリスト
+            threshold (float): 一致とみなす類似度の下限
+            n (int): n-gramの文字数
+
+        """
+        self.__threshold = threshold
+        self.__n = n
+        self.__facilities: list = list()
+        self.__index: dict[str, list[int]] = defaultdict(list)
+        for facility in facilities:
+            name_grams = self._get_ngrams(facility["medical_institution_name"])
+            if not name_grams:
+                continue
+
+            facility_id = len(self.__facilities)
+            self.__facilities.append((facility, name_grams, self._get_ngrams(facility.get("address", ""))))
+            for gram in name_grams:
+                self.__index[gram].append(facility_id)
+
+    @property
+    def threshold(self) -> float:
+        return self.__threshold
+
+    def _get_ngrams(self, text: str) -> set:
+        """正規化した文字列の文字n-gramの集合を返す
+
+        Args:
+            text (str): 対象の文字列
+
+        Returns:
+            ngrams (set of str): 文字n-gramの集合
+
+        """
+        normalized_text = unicodedata.normalize("NFKC", text).replace(" ", "").replace("　", "")
+        if len(normalized_text) < self.__n:
+            return {normalized_text} if normalized_text else set()
+
+        return {normalized_text[i : i + self.__n] for i in range(len(normalized_text) - self.__n + 1)}
+
+    @staticmethod
+    def _get_similarity(grams: set, other_grams: set, overlap: Optional[int] = None) -> float:
+        """2つのn-gram集合のDice係数を返す"""
+        if not grams or not other_grams:
+            return 0.0
+
+        if overlap is None:
+            overlap = len(grams & other_grams)
+
+        return 2 * overlap / (len(grams) + len(other_grams))
+
+    def search(self, facility_name: str, address: Optional[str] = None) -> Optional[dict]:
+        """医療機関名（と所在地）から最も類似する医療機関を検索する
+
+        医療機関名の類似度を基本とし、所在地が指定された場合は所在地の類似度も加味する。
+
+        Args:
+            facility_name (str): 医療機関名
+            address (str): 医療機関の所在地
+
+        Returns:
+            facility (dict): 最も類似する医療機関の辞書に類似度scoreを加えたもの
+                類似度が下限に満たない場合はNoneを返す。
+
+        """
+        name_grams = self._get_ngrams(facility_name)
+        if not name_grams:
+            return None
+
+        overlaps = Counter(facility_id for gram in name_grams for facility_id in self.__index.get(gram, []))
+        address_grams = self._get_ngrams(address) if address else set()
+        best_score = 0.0
+        best_facility = None
+        for facility_id, overlap in overlaps.items():
+            facility, facility_name_grams, facility_address_grams = self.__facilities[facility_id]
+            score = self._get_similarity(name_grams, facility_name_grams, overlap)
+            if address_grams and facility_address_grams:
+                score = 0.8 * score + 0.2 * self._get_similarity(address_grams, facility_address_grams)
+
+            if best_score < score:
+                best_score = score
+                best_facility = facility
+
+        if best_facility is None or best_score < self.__threshold:
+            return None
+
+        return dict(best_facility, score=best_score)
+
+
+class Geocoder:
+    """キャッシュとレート制限付きの施設名からの緯度経度検索
+
+    キャッシュにない施設名は、まずオープンデータの医療機関の索引から検索し、
+    一致の確からしさが低いものだけを、トークンバケットでレート制限しながら
+    スレッドプールで並行してYOLP Web APIで検索する。
+
+    Attributes:
+        lists (list of dict): 今回新たに検索した結果の辞書のリスト
+            見つからなかった施設名は緯度経度をNoneとし、キャッシュへの登録に使用する。
+        call_count (int): 今回Web APIを呼び出した回数
+        local_match_count (int): 今回オープンデータの医療機関の索引で見つかった件数
+
+    """
+
+    def __init__(
+        self,
+        cache: dict,
+        rate: float = Config.YOLP_REQUESTS_PER_SECOND,
+        max_workers: int = Config.YOLP_MAX_WORKERS,
+        search: Optional[Callable[[str], Optional[tuple]]] = None,
+        facility_index: Optional[FacilityIndex] = None,
+    ):
+        """
+        Args:
+            cache (dict): 施設名をキー、経度と緯度のタプル（見つからなかった場合はNone）を値とする辞書
+            rate (float): 1秒あたりのWeb APIの呼び出し回数の上限
+            max_workers (int): 並行して検索するスレッドの最大数
+            search (Callable): 施設名から経度と緯度のタプルを返す関数
+                指定しない場合はYOLP Web APIで検索する
+            facility_index (:obj:`FacilityIndex`): オープンデータの医療機関の索引
+
+        """
+        self.__cache = dict(cache)
+        self.__bucket = TokenBucket(rate=rate, capacity=1)
+        self.__max_workers = max_workers
+        self.__search = search if search else self._search_yolp
+        self.__facility_index = facility_index
+        self.__lists: list = list()
+        self.__call_count = 0
+        self.__local_match_count = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def lists(self) -> list:
+        return self.__lists
+
+    @property
+    def call_count(self) -> int:
+        return self.__call_count
+
+    @property
+    def local_match_count(self) -> int:
+        return self.__local_match_count
+
+    def geocode(self, facility_names: list, addresses: Optional[dict] = None) -> dict:
+        """施設名のリストから緯度経度を検索する
+
+        Args:
+            facility_names (list of str): 施設名のリスト
+            addresses (dict): 施設名をキー、所在地を値とする辞書
+
+        Returns:
+            results (dict): 施設名をキー、経度と緯度のタプルを値とする辞書
+                見つからなかった施設名の値はNoneとし、通信エラーで検索できなかった施設名は含まない。
+
+        """
+        missing_names = list(dict.fromkeys(name for name in facility_names if name not in self.__cache))
+        if self.__facility_index:
+            missing_names = self._geocode_locally(missing_names, addresses if addresses else dict())
+
+        if missing_names:
+            with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+                for name, coordinates in zip(missing_names, executor.map(self._geocode_one, missing_names)):
+                    if coordinates is False:
+                        continue
+
+                    self.__cache[name] = coordinates
+                    self.__lists.append(
+                        {
+                            "query": name,
+                            "longitude": coordinates[0] if coordinates else None,
+                            "latitude": coordinates[1] if coordinates else None,
+                        }
+                    )
+
+        return {name: self.__cache[name] for name in facility_names if name in self.__cache}
+
+    def _geocode_locally(self, facility_names: list, addresses: dict) -> list:
+        """オープンデータの医療機関の索引から緯度経度を検索する
+
+        Args:
+            facility_names (list of str): 施設名のリスト
+            addresses (dict): 施設名をキー、所在地を値とする辞書
+
+        Returns:
+            remaining_names (list of str): 索引で見つからなかった施設名のリスト
+
+        """
+        remaining_names = list()
+        for name in facility_names:
+            facility = self.__facility_index.search(name, addresses.get(name))
+            if facility is None:
+                remaining_names.append(name)
+                continue
+
+            self.__local_match_count += 1
+            self.__cache[name] = (facility["longitude"], facility["latitude"])
+            self.__lists.append({"query": name, "longitude": facility["longitude"], "latitude": facility["latitude"]})
+
+        return remaining_names
+
+    def _geocode_one(self, facility_name: str):
+        """レート制限に従って1件の施設名を検索する
+
+        Args:
+            facility_name (str): 施設名
+
+        Returns:
+            coordinates (tuple or None or bool): 経度と緯度のタプル
+                見つからなかった場合はNone、通信エラーの場合はFalseを返す。
+
+        """
+        self.__bucket.acquire()
+        with self.__lock:
+            self.__call_count += 1
+
+        try:
+            return self.__search(facility_name)
+        except (HTTPDownloadError, ScrapeError):
+            return False
+
+    @staticmethod
+    def _search_yolp(facility_name: str) -> Optional[tuple]:
+        """YOLP Web APIで施設名を検索し、1番目の検索結果の経度と緯度を返す
+
+        Args:
+            facility_name (str): 施設名
+
+        Returns:
+            coordinates (tuple of float): 経度と緯度のタプル
+                検索結果が0件の場合はNoneを返す。
+
+        """
+        location_data = ScrapeYOLPLocation(facility_name).lists[0]
+        if location_data["longitude"] == 0 and location_data["latitude"] == 0:
+            return None
+
+        return (location_data["longitude"], location_data["latitude"])
@@ -109,6 +109,7 @@ class ScrapeOpendataLocation(Scraper):
 
     Attributes:
         lists (list of dict): 緯度経度データを表す辞書のリスト
+        facilities (list of dict): 所在地を含む医療機関データを表す辞書のリスト
 
     """
 
@@ -119,16 +120,28 @@ class ScrapeOpendataLocation(Scraper):
 
         """
         self.__lists = list()
+        self.__facilities = list()
         downloaded_csv = self.get_csv(csv_url=csv_url, encoding="cp932")
         for row in self._get_table_values(downloaded_csv):
             location_data = self._extract_location_data(row)
             if location_data:
-                self.__lists.append(location_data)
+                self.__facilities.append(location_data)
+                self.__lists.append(
+                    {
+                        "medical_institution_name": location_data["medical_institution_name"],
+                        "longitude": location_data["longitude"],
+                        "latitude": location_data["latitude"],
+                    }
+                )
 
     @property
     def lists(self) -> list:
         return self.__lists
 
+    @property
+    def facilities(self) -> list:
+        return self.__facilities
+
     def _get_table_values(self, downloaded_csv: DownloadedCSV) -> list:
         """CSVから内容を抽出してリストに格納
 
@@ -155,7 +168,7 @@ class ScrapeOpendataLocation(Scraper):
             row (list): 北海道オープンデータポータルのCSVから抽出した行データ
 
         Returns:
-            location_data (dict): 緯度経度の辞書データ
+            location_data (dict): 医療機関名、所在地、緯度経度の辞書データ
 
         """
         if len(row) != 37:
@@ -169,6 +182,7 @@ class ScrapeOpendataLocation(Scraper):
         try:
             location_data = {
                 "medical_institution_name": row[5].replace(" ", ""),
+                "address": row[9].replace(" ", ""),
                 "longitude": float(row[12]),
                 "latitude": float(row[11]),
             }
@@ -1,9 +1,6 @@
 import re
 import unicodedata
-from typing import Union
-
-import numpy as np
-import pandas as pd
+from typing import Iterator, Optional, Union
 
 from ..scrapers.scraper import Scraper
 
@@ -17,50 +14,109 @@ class ScrapeOutpatient(Scraper):
     Attributes:
         outpatient_data (list of dict): 旭川市の発熱外来データ
             旭川市の新型コロナウイルス発熱外来データを表す辞書のリスト
+        target_city (str): 抽出対象の市町村名
 
     """
 
-    def __init__(self, excel_url: str):
+    # 発熱外来一覧表Excelファイルの列数
+    COLUMN_COUNT = 58
+
+    def __init__(self, excel_url: str, target_city: str = "旭川市"):
         """
         Args:
             excel_url (str): ExcelファイルのURL
                 北海道のExcelファイルのURL
+            target_city (str): 抽出対象の市町村名
 
         """
         Scraper.__init__(self)
-        excel_lists = self._get_excel_lists(excel_url)
-        self.__lists = list()
-        for excel_row in excel_lists:
-            if excel_row:
-                self.__lists.append(self._get_outpatient(excel_row))
+        self.__target_city = target_city
+        self.__lists = list(self._iter_outpatients(excel_url))
 
     @property
     def lists(self) -> list:
         return self.__lists
 
-    def _get_excel_lists(self, excel_url: str) -> list:
+    @property
+    def target_city(self) -> str:
+        return self.__target_city
+
+    def _iter_outpatients(self, excel_url: str) -> Iterator[dict]:
+        """Excelファイルの行のうち抽出対象の市町村の行だけを発熱外来データの辞書に変換して返す
+
+        行全体の正規化は市町村名の列で絞り込んだ後に行うため、
+        処理量は北海道全体の行数ではなく抽出対象の行数に比例する。
+
+        Args:
+            excel_url (str): ExcelファイルのURL
+
+        Yields:
+            outpatient_data (dict): 発熱外来データの辞書
+
+        """
+        for excel_row in self._get_excel_lists(excel_url):
+            if excel_row and self._is_target_city(excel_row):
+                yield self._get_outpatient(excel_row)
+
+    def _is_target_city(self, excel_row: list) -> bool:
+        """行データの市町村名の列が抽出対象の市町村か判定する
+
+        Args:
+            excel_row (list): Excelファイルから抽出した行データ
+
+        Returns:
+            result (bool): 抽出対象の市町村なら真
+
+        """
+        if len(excel_row) < 5:
+            return False
+
+        return self._normalize(excel_row[4]) == self.target_city
+
+    def _get_excel_lists(self, excel_url: str) -> Iterator[list]:
         """
         Args:
             excel_url (str): ExcelファイルのURL
                 北海道の発熱外来一覧表ExcelファイルのURL
 
-        Returns:
-            excel_lists (list of list): 北海道の発熱外来Excelデータ
-                北海道の新型コロナウイルス発熱外来一覧表Excelデータから抽出した表データを、
-                二次元配列のリストで返す。
+        Yields:
+            excel_row (list of str): 北海道の発熱外来Excelデータの行
+                北海道の新型コロナウイルス発熱外来一覧表ExcelデータのSheet1の4行目以降を、
+                読み取り専用モードで1行ずつ文字列のリストにして返す。
 
         """
+        from openpyxl import load_workbook
+
         excel_file = self.get_excel(excel_url)
-        df = pd.read_excel(
-            excel_file.content,
-            sheet_name="Sheet1",
-            header=None,
-            index_col=None,
-            skiprows=[0, 1, 2],
-            dtype=str,
-        )
-        df.replace(np.nan, "", inplace=True)
-        return df.values.tolist()
+        workbook = load_workbook(excel_file.content, read_only=True, data_only=True)
+        try:
+            for row in workbook["Sheet1"].iter_rows(min_row=4, values_only=True):
+                excel_row = [self._cell_to_str(value) for value in row]
+                # 読み取り専用モードでは末尾の空のセルが省略される場合があるため列数を揃える
+                excel_row += [""] * (self.COLUMN_COUNT - len(excel_row))
+                yield excel_row
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _cell_to_str(value: Optional[Union[str, int, float, object]]) -> str:
+        """Excelのセルの値をpandas.read_excelでdtype=strを指定した場合と同じ文字列に変換する
+
+        Args:
+            value (str, int, float or object): セルの値
+
+        Returns:
+            text (str): セルの値の文字列
+                空のセルは空文字列、整数値の小数は整数の文字列に変換する。
+
+        """
+        if value is None:
+            return ""
+
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+
+        return str(value)
 
     def _get_outpatient(self, excel_row: list) -> dict:
         """
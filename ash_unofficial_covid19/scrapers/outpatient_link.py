@@ -1,6 +1,6 @@
 import re
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
 from ..config import Config
 from ..scrapers.downloader import DownloadedHTML
@@ -47,8 +47,8 @@ class ScrapeOutpatientLink(Scraper):
             "url": "",
         }
         downloaded_html = DownloadedHTML(html_url)
-        soup = BeautifulSoup(downloaded_html.content, "html.parser")
-        for article in soup.find_all("article"):
+        soup = self.get_soup(downloaded_html.content, parse_only=SoupStrainer(["article", "div"]))
+        if soup.find("article"):
             # id属性などで対象を絞れないためdiv要素を全てなめる。
             # 子要素にa要素があればhref属性を取得し、それがExcelファイルへのリンクか判断。
             # 更にa要素の子要素にimg要素がありalt属性の値に「旭川」を含んでいればリンク文字列を取得。
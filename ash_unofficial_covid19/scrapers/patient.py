@@ -1,14 +1,18 @@
 import csv
+import json
+import os
 import re
+import subprocess
+import tempfile
 from datetime import date, datetime
-from typing import Optional, Union
+from typing import Iterator, Optional, Union
 
-import tabula
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 from dateutil.relativedelta import relativedelta
 
-from ..errors import ScrapeError
+from ..errors import HTTPDownloadError, ScrapeError
 from ..scrapers.downloader import DownloadedCSV, DownloadedHTML, DownloadedPDF
+from ..scrapers.fetcher import ConcurrentFetcher
 from ..scrapers.scraper import Scraper
 
 
@@ -63,7 +67,7 @@ class ScrapeAsahikawaPatients(Scraper):
             table_values (list of list): tableの内容で構成される二次元配列
 
         """
-        soup = BeautifulSoup(downloaded_html.content, "html.parser")
+        soup = self.get_soup(downloaded_html.content, parse_only=SoupStrainer("table"))
         table_values = list()
         try:
             for table in soup.find_all("table"):
@@ -263,6 +267,48 @@ class ScrapeHokkaidoPatients(Scraper):
             return None
 
 
+class ScrapeHokkaidoPatientsStream(ScrapeHokkaidoPatients):
+    """北海道新型コロナウイルス感染症患者データの逐次抽出
+
+    北海道オープンデータポータルの陽性患者属性CSVファイルをダウンロードしながら1行ずつ解析し、
+    新型コロナウイルス感染症患者データを順に返す。CSVファイル全体や抽出結果全体を
+    メモリ上に保持しないため、ファイルサイズに関わらずメモリ使用量が一定となる。
+
+    Attributes:
+        lists (Iterator[dict]): 患者データを表す辞書を順に返すイテレータ
+            ダウンロードしながら解析するため1回だけ反復できる
+
+    """
+
+    def __init__(self, csv_url: str):
+        """
+        Args:
+            csv_url (str): CSVファイルのURL
+
+        """
+        Scraper.__init__(self)
+        self.__streamed_csv = self.get_csv_stream(csv_url=csv_url, encoding="cp932")
+
+    @property
+    def lists(self) -> Iterator[dict]:
+        return self._iter_patients_data()
+
+    def _iter_patients_data(self) -> Iterator[dict]:
+        """CSVの行を順に患者データの辞書に変換して返す
+
+        Yields:
+            patient_data (dict): 新型コロナウイルス感染症患者データを表すハッシュ
+
+        """
+        try:
+            for row in csv.reader(self.__streamed_csv.content):
+                extracted_data = self._extract_patient_data(row)
+                if extracted_data is not None:
+                    yield extracted_data
+        except csv.Error as e:
+            raise ScrapeError(e.args[0])
+
+
 class ScrapeAsahikawaPatientsPDF(Scraper):
     """旭川市新型コロナウイルス陽性患者データの抽出
 
@@ -275,13 +321,15 @@ class ScrapeAsahikawaPatientsPDF(Scraper):
 
     """
 
-    def __init__(self, pdf_url: str, publication_date: date):
+    def __init__(self, pdf_url: str, publication_date: date, pdf_df: Optional[list] = None):
         """
         Args:
             pdf_url (str): PDFファイルのURL
                 旭川市の報道発表PDFファイルのURL
            publication_date (date): 報道発表日
                 報道発表PDFデータに公表日がないため、引数で指定した日付をセット
+           pdf_df (list of :obj:`pd.DataFrame`): PDFファイルから抽出済みの表データ
+                指定した場合はPDFファイルのダウンロードと表データの抽出を省略する
 
         """
         Scraper.__init__(self)
@@ -290,8 +338,9 @@ class ScrapeAsahikawaPatientsPDF(Scraper):
         else:
             raise TypeError("報道発表日の指定が正しくありません。")
 
-        downloaded_pdf = DownloadedPDF(pdf_url)
-        pdf_df = self._get_dataframe(downloaded_pdf)
+        if pdf_df is None:
+            downloaded_pdf = DownloadedPDF(pdf_url)
+            pdf_df = self._get_dataframe(downloaded_pdf)
         self.__lists = self._get_patients_data(pdf_df)
 
     @property
@@ -314,6 +363,8 @@ class ScrapeAsahikawaPatientsPDF(Scraper):
                 pandas DataFrameのリストで返す
 
         """
+        import tabula
+
         return tabula.read_pdf(downloaded_pdf.content, lattice=True, pages="all")
 
     def _get_patients_data(self, pdf_df: Union[list, dict]) -> Union[list, dict]:
@@ -418,3 +469,207 @@ class ScrapeAsahikawaPatientsPDF(Scraper):
             return None
 
         return patient_data
+
+
+class ScrapeAsahikawaPatientsPDFs(Scraper):
+    """複数の報道発表PDFファイルからの旭川市新型コロナウイルス陽性患者データの一括抽出
+
+    tabula.read_pdfはPDFファイル1件ごとにJavaを起動するため、過去分の報道発表PDFファイルを
+    まとめて取り込む場合は、一時ディレクトリにダウンロードしたPDFファイルを
+    tabulaのバッチモードで1回のJava起動でまとめて表データに変換する。
+    PDFファイルのダウンロードはホストごとの同時接続数を制限して並行で行う。
+
+    Attributes:
+        lists (list of dict): 旭川市の陽性患者データを表す辞書のリスト
+        pdf_lists (list of tuple): PDFファイルのURLと、そのPDFファイルから抽出した
+            陽性患者データを表す辞書のリストのタプルのリスト
+        errors (list of :obj:`ScrapeError`): 表データを抽出できなかったPDFファイルのエラーのリスト
+
+    """
+
+    def __init__(
+        self,
+        press_release_links: list,
+        fetcher: Optional[ConcurrentFetcher] = None,
+        downloaded_pdfs: Optional[list] = None,
+    ):
+        """
+        Args:
+            press_release_links (list of tuple): 報道発表PDFファイルのURLと報道発表日のタプルのリスト
+                ダウンロードや表データの抽出に失敗したPDFファイルはスキップする
+            fetcher (:obj:`ConcurrentFetcher`): PDFファイルを並行でダウンロードするオブジェクト
+            downloaded_pdfs (list of :obj:`DownloadedPDF`): ダウンロード済みのPDFデータのリスト
+                press_release_linksと同じ順序で指定した場合は、PDFファイルのダウンロードを省略する
+
+        """
+        Scraper.__init__(self)
+        self.__fetcher = fetcher if fetcher else ConcurrentFetcher()
+        for press_release_link in press_release_links:
+            if not isinstance(press_release_link[1], date):
+                raise TypeError("報道発表日の指定が正しくありません。")
+        if downloaded_pdfs is not None and len(downloaded_pdfs) != len(press_release_links):
+            raise TypeError("ダウンロード済みのPDFデータの指定が正しくありません。")
+
+        self.__pdf_lists = list()
+        self.__errors = list()
+        with tempfile.TemporaryDirectory() as pdf_dir:
+            if downloaded_pdfs is None:
+                pdf_files = self._save_pdf_files(press_release_links, pdf_dir)
+            else:
+                pdf_files = self._write_pdf_files(press_release_links, downloaded_pdfs, pdf_dir)
+            if not pdf_files:
+                return
+
+            pdf_dfs = self._get_dataframes(pdf_dir, [pdf_file[0] for pdf_file in pdf_files])
+
+        # 一部のPDFファイルの表データが読み込めない場合も、残りのPDFファイルは抽出する
+        for pdf_file, pdf_df in zip(pdf_files, pdf_dfs):
+            pdf_url, publication_date = pdf_file[1], pdf_file[2]
+            try:
+                if isinstance(pdf_df, ScrapeError):
+                    raise pdf_df
+                scraped_data = ScrapeAsahikawaPatientsPDF(
+                    pdf_url=pdf_url, publication_date=publication_date, pdf_df=pdf_df
+                )
+            except ScrapeError as e:
+                self.__errors.append(ScrapeError(pdf_url + ": " + e.message))
+                continue
+
+            self.__pdf_lists.append((pdf_url, scraped_data.lists))
+
+    @property
+    def lists(self) -> list:
+        return [row for _, pdf_list in self.__pdf_lists for row in pdf_list]
+
+    @property
+    def pdf_lists(self) -> list:
+        return self.__pdf_lists
+
+    @property
+    def errors(self) -> list:
+        return self.__errors
+
+    def _save_pdf_files(self, press_release_links: list, pdf_dir: str) -> list:
+        """報道発表PDFファイルをダウンロードして一時ディレクトリへ保存
+
+        Args:
+            press_release_links (list of tuple): 報道発表PDFファイルのURLと報道発表日のタプルのリスト
+            pdf_dir (str): 保存先ディレクトリのパス
+
+        Returns:
+            pdf_files (list of tuple): 保存したファイル名、PDFファイルのURL、報道発表日のタプルのリスト
+
+        """
+        # ファイル名の順序とリストの順序を揃えるため連番をファイル名にする
+        tasks = [
+            (
+                press_release_link[0],
+                self.get_pdf,
+                {"pdf_url": press_release_link[0]},
+                "{:05d}".format(i),
+                press_release_link[1],
+            )
+            for i, press_release_link in enumerate(press_release_links)
+        ]
+        pdf_files = list()
+        for task, future in self.__fetcher.fetch(tasks):
+            try:
+                downloaded_pdf = future.result()
+            except HTTPDownloadError:
+                continue
+
+            pdf_url, _, _, file_name, publication_date = task
+            with open(os.path.join(pdf_dir, file_name + ".pdf"), "wb") as f:
+                f.write(downloaded_pdf.content.getvalue())
+            pdf_files.append((file_name, pdf_url, publication_date))
+
+        return sorted(pdf_files)
+
+    @staticmethod
+    def _write_pdf_files(press_release_links: list, downloaded_pdfs: list, pdf_dir: str) -> list:
+        """ダウンロード済みの報道発表PDFファイルを一時ディレクトリへ保存
+
+        Args:
+            press_release_links (list of tuple): 報道発表PDFファイルのURLと報道発表日のタプルのリスト
+            downloaded_pdfs (list of :obj:`DownloadedPDF`): ダウンロード済みのPDFデータのリスト
+            pdf_dir (str): 保存先ディレクトリのパス
+
+        Returns:
+            pdf_files (list of tuple): 保存したファイル名、PDFファイルのURL、報道発表日のタプルのリスト
+
+        """
+        pdf_files = list()
+        for i, (press_release_link, downloaded_pdf) in enumerate(zip(press_release_links, downloaded_pdfs)):
+            file_name = "{:05d}".format(i)
+            with open(os.path.join(pdf_dir, file_name + ".pdf"), "wb") as f:
+                f.write(downloaded_pdf.content.getvalue())
+            pdf_files.append((file_name, press_release_link[0], press_release_link[1]))
+
+        return pdf_files
+
+    def _get_dataframes(self, pdf_dir: str, file_names: list) -> list:
+        """ディレクトリ内の全てのPDFファイルを1回のJava起動で表データに変換
+
+        Args:
+            pdf_dir (str): PDFファイルを保存したディレクトリのパス
+            file_names (list of str): 拡張子を除いたPDFファイル名のリスト
+
+        Returns:
+            pdf_dfs (list of list): PDFファイルごとの表データ（pandas DataFrameのリスト）のリスト
+                変換結果のファイルが存在しない場合は空のリスト、変換結果のファイルが
+                読み込めない場合は:obj:`ScrapeError`とする
+                Javaの起動や一括変換自体に失敗した場合は全てのPDFファイルを:obj:`ScrapeError`とする
+
+        """
+        import tabula
+        from tabula.errors import JavaNotFoundError
+
+        try:
+            tabula.convert_into_by_batch(pdf_dir, output_format="json", lattice=True, pages="all")
+        except (subprocess.CalledProcessError, JavaNotFoundError, OSError) as e:
+            return [ScrapeError("tabulaでPDFファイルを一括変換できません。" + str(e)) for _ in file_names]
+
+        pdf_dfs = list()
+        for file_name in file_names:
+            json_path = os.path.join(pdf_dir, file_name + ".json")
+            if not os.path.exists(json_path):
+                pdf_dfs.append(list())
+                continue
+
+            try:
+                with open(json_path, encoding="utf-8") as f:
+                    pdf_dfs.append(self._json_to_dataframes(json.load(f)))
+            except (ValueError, KeyError, TypeError) as e:
+                pdf_dfs.append(ScrapeError("tabulaの出力を表データに変換できません。" + str(e)))
+
+        return pdf_dfs
+
+    @staticmethod
+    def _json_to_dataframes(raw_json: list) -> list:
+        """tabulaのJSON出力をtabula.read_pdfと同じ形式のpandas DataFrameのリストに変換
+
+        Args:
+            raw_json (list): tabulaのJSON出力
+
+        Returns:
+            dataframes (list of :obj:`pd.DataFrame`): 表データのリスト
+                tabula.read_pdfと同様に1行目は見出しとして除き、数値に変換できる列は数値に変換する
+
+        """
+        import pandas as pd
+
+        dataframes = list()
+        for table in raw_json:
+            if len(table["data"]) == 0:
+                continue
+
+            rows = [[cell["text"] if cell["text"] else float("nan") for cell in row] for row in table["data"]]
+            df = pd.DataFrame(data=rows[1:], columns=range(len(rows[0])))
+            for column in df.columns:
+                try:
+                    df[column] = pd.to_numeric(df[column], errors="raise")
+                except (ValueError, TypeError):
+                    pass
+            dataframes.append(df)
+
+        return dataframes
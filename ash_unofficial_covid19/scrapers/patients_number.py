@@ -1,9 +1,12 @@
+import os
+import re
 import unicodedata
 from datetime import date
-from typing import Union
-
-import camelot
+from io import BytesIO
+from tempfile import TemporaryDirectory
+from typing import Optional, Union
 
+from ..errors import ScrapeError
 from ..scrapers.scraper import Scraper
 
 
@@ -29,21 +32,33 @@ class ScrapePatientsNumber(Scraper):
 
         """
         Scraper.__init__(self)
-        pdf_df = self._get_dataframes(pdf_url)
-        if isinstance(publication_date, date):
-            self.__lists = self._get_patients_number(pdf_df, publication_date)
-        else:
+        if not isinstance(publication_date, date):
             raise TypeError("報道発表日の指定が正しくありません。")
 
+        # 2022年9月27日以降の報道発表資料は「全体」の行だけ読めば良いので、
+        # まずPDFのテキストレイヤーから直接抽出し、検証に失敗した場合のみcamelotで表を解析する。
+        pdf_content = None
+        if publication_date > date(2022, 9, 26):
+            pdf_content = self.get_pdf(pdf_url).content
+            patients_number = self._get_patients_number_from_text(pdf_content, publication_date)
+            if patients_number is not None:
+                self.__lists = [patients_number]
+                return
+
+        pdf_df = self._get_dataframes(pdf_url, pdf_content)
+        self.__lists = self._get_patients_number(pdf_df, publication_date)
+
     @property
     def lists(self) -> list:
         return self.__lists
 
-    def _get_dataframes(self, pdf_url: str) -> list:
+    def _get_dataframes(self, pdf_url: str, pdf_content: Optional[BytesIO] = None) -> list:
         """
         Args:
             pdf_url (str): PDFファイルのURL
                 旭川市の報道発表PDFファイルのURL
+            pdf_content (BytesIO): ダウンロード済みのPDFファイルのBytesIOデータ
+                指定した場合は再度ダウンロードせず一時ファイルに書き出して解析する。
 
         Returns:
             dataframes (list of obj:`pd.DataFrame`): 旭川市の新型コロナ報道発表PDFデータ
@@ -51,7 +66,16 @@ class ScrapePatientsNumber(Scraper):
                 pandas DataFrameのリストで返す。
 
         """
-        tables = camelot.read_pdf(pdf_url)
+        import camelot
+
+        if pdf_content is None:
+            tables = camelot.read_pdf(pdf_url)
+        else:
+            with TemporaryDirectory() as temp_dir:
+                pdf_path = os.path.join(temp_dir, "press_release.pdf")
+                with open(pdf_path, "wb") as f:
+                    f.write(pdf_content.getvalue())
+                tables = camelot.read_pdf(pdf_path)
         dataframes = list()
         for table in tables:
             dataframes.append(table.df)
@@ -92,26 +116,9 @@ class ScrapePatientsNumber(Scraper):
                         continue
 
                     if self._nomalize(row[0].split("\n")[0]) == "全体":
-                        age_under_10 = (
-                            int(self._nomalize(row[1].split("\n")[0]))
-                            + int(self._nomalize(row[2].split("\n")[0]))
-                            + int(self._nomalize(row[3].split("\n")[0]))
-                        )
-                        age_60s = int(self._nomalize(row[9].split("\n")[0])) + int(
-                            self._nomalize(row[10].split("\n")[0])
-                        )
-                        patients_number["age_under_10"] = age_under_10
-                        patients_number["age_10s"] = int(self._nomalize(row[4].split("\n")[0]))
-                        patients_number["age_20s"] = int(self._nomalize(row[5].split("\n")[0]))
-                        patients_number["age_30s"] = int(self._nomalize(row[6].split("\n")[0]))
-                        patients_number["age_40s"] = int(self._nomalize(row[7].split("\n")[0]))
-                        patients_number["age_50s"] = int(self._nomalize(row[8].split("\n")[0]))
-                        patients_number["age_60s"] = age_60s
-                        patients_number["age_70s"] = int(self._nomalize(row[10].split("\n")[1]))
-                        patients_number["age_80s"] = int(self._nomalize(row[10].split("\n")[2]))
-                        patients_number["age_over_90"] = int(self._nomalize(row[10].split("\n")[3]))
-                        patients_number["investigating"] = 0
-                        patients_number_data.append(patients_number)
+                        numbers = [int(self._nomalize(row[i].split("\n")[0])) for i in range(1, 10)]
+                        numbers += [int(self._nomalize(text)) for text in row[10].split("\n")[:4]]
+                        patients_number_data.append(self._get_patients_number_by_age(numbers, publication_date))
                         return patients_number_data
 
             else:
@@ -159,6 +166,140 @@ class ScrapePatientsNumber(Scraper):
 
         return patients_number_data
 
+    def _get_text_rows(self, pdf_content: BytesIO) -> list:
+        """PDFのテキストレイヤーから座標を元に行単位の文字列リストを抽出
+
+        Args:
+            pdf_content (BytesIO): PDFファイルのBytesIOデータ
+
+        Returns:
+            text_rows (list of list): 行ごとに左から順に並べたテキストのリスト
+
+        """
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LAParams, LTTextContainer, LTTextLine
+
+        text_lines = list()
+        for page_number, page in enumerate(extract_pages(pdf_content, laparams=LAParams(char_margin=0.5))):
+            for element in page:
+                if not isinstance(element, LTTextContainer):
+                    continue
+                # テキストボックスにまとめられなかった行はページ直下に置かれる
+                text_lines_in_element = [element] if isinstance(element, LTTextLine) else element
+                for text_line in text_lines_in_element:
+                    if not isinstance(text_line, LTTextLine):
+                        continue
+                    text = text_line.get_text().strip()
+                    if text == "":
+                        continue
+                    y_center = (text_line.y0 + text_line.y1) / 2
+                    text_lines.append((page_number, -y_center, text_line.x0, text_line.height, text))
+
+        # 同じページで縦方向の中心が文字の高さの半分以内に収まるテキストを同じ行とみなす
+        text_rows = list()
+        current_row: list = list()
+        current_key: Optional[tuple] = None
+        for page_number, y, x, height, text in sorted(text_lines):
+            if current_key is None or current_key[0] != page_number or height / 2 < y - current_key[1]:
+                if current_row:
+                    text_rows.append([t for _, t in sorted(current_row)])
+                current_row = list()
+                current_key = (page_number, y)
+            current_row.append((x, text))
+
+        if current_row:
+            text_rows.append([t for _, t in sorted(current_row)])
+
+        return text_rows
+
+    def _get_patients_number_from_text(self, pdf_content: BytesIO, publication_date: date) -> Optional[dict]:
+        """PDFのテキストレイヤーから「全体」の行を探して年代別陽性患者数を抽出
+
+        Args:
+            pdf_content (BytesIO): PDFファイルのBytesIOデータ
+            publication_date (date): 報道発表日
+
+        Returns:
+            patients_number (dict): 年代別陽性患者数データの辞書
+                「全体」の行が見つからない場合や数値の検証に失敗した場合はNoneを返す。
+
+        """
+        from pdfminer.pdfparser import PDFSyntaxError
+        from pdfminer.psparser import PSException
+
+        try:
+            text_rows = self._get_text_rows(pdf_content)
+        except (PDFSyntaxError, PSException, ValueError):
+            # テキストレイヤーを読めないPDFはcamelotでの解析に任せる
+            return None
+
+        for text_row in text_rows:
+            # 「全体」のラベルと数値が1つのテキストとして抽出される場合もあるため行全体で判定する
+            row_text = unicodedata.normalize("NFKC", " ".join(text_row)).strip()
+            if not row_text.startswith("全体"):
+                continue
+
+            try:
+                numbers = self._extract_numbers(row_text[len("全体") :])
+            except ScrapeError:
+                return None
+
+            # 年代別の13列の後ろの合計の列と、年代別の合計が一致する場合だけ採用する
+            if len(numbers) < 14 or sum(numbers[:13]) != numbers[13]:
+                return None
+
+            return self._get_patients_number_by_age(numbers[:13], publication_date)
+
+        return None
+
+    @classmethod
+    def _extract_numbers(cls, text: str) -> list:
+        """文字列から空白区切りの数値を抽出してリストで返す
+
+        Args:
+            text (str): 数値を含む文字列
+
+        Returns:
+            numbers (list of int): 抽出した数値のリスト
+
+        """
+        normalized_text = unicodedata.normalize("NFKC", text).replace(",", "")
+        numbers = list()
+        for token in normalized_text.split():
+            if re.fullmatch("[0-9]+", token) is None:
+                raise ScrapeError("数値以外の文字列が含まれています。")
+            numbers.append(int(token))
+        return numbers
+
+    @staticmethod
+    def _get_patients_number_by_age(numbers: list, publication_date: date) -> dict:
+        """「全体」の行の13列の数値を年代別陽性患者数データの辞書に変換
+
+        10歳未満は3列、60代は2列に分かれているためそれぞれ合算する。
+
+        Args:
+            numbers (list of int): 「全体」の行の数値のリスト
+            publication_date (date): 報道発表日
+
+        Returns:
+            patients_number (dict): 年代別陽性患者数データの辞書
+
+        """
+        return {
+            "publication_date": publication_date,
+            "age_under_10": numbers[0] + numbers[1] + numbers[2],
+            "age_10s": numbers[3],
+            "age_20s": numbers[4],
+            "age_30s": numbers[5],
+            "age_40s": numbers[6],
+            "age_50s": numbers[7],
+            "age_60s": numbers[8] + numbers[9],
+            "age_70s": numbers[10],
+            "age_80s": numbers[11],
+            "age_over_90": numbers[12],
+            "investigating": 0,
+        }
+
     @staticmethod
     def _nomalize(text: str) -> str:
         """文字列から余計な空白等を取り除き、全角数字等を正規化して返す。
@@ -1,7 +1,7 @@
 import re
 import urllib.parse
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
 from ..errors import ScrapeError
 from ..scrapers.downloader import DownloadedHTML
@@ -52,7 +52,7 @@ class ScrapePressReleaseLink(Scraper):
             press_release_link (list of dict): tableの内容で構成される二次元配列
 
         """
-        soup = BeautifulSoup(downloaded_html.content, "html.parser")
+        soup = self.get_soup(downloaded_html.content, parse_only=SoupStrainer("a"))
         press_release_link = list()
         for a in soup.find_all("a"):
             anker_text = self.format_string(self.z2h_number(a.text.strip()))
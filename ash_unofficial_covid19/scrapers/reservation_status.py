@@ -1,7 +1,7 @@
 import re
 from typing import Optional
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
 from ..scrapers.downloader import DownloadedHTML
 from ..scrapers.scraper import Scraper
@@ -52,7 +52,7 @@ class ScrapeReservationStatus(Scraper):
                 HTMLデータから抽出した表データを二次元配列リストで返す。
 
         """
-        soup = BeautifulSoup(downloaded_html.content, "html.parser")
+        soup = self.get_soup(downloaded_html.content, parse_only=SoupStrainer("table", id=table_id))
         table = soup.find("table", id=table_id)
         for tbody in table.find_all("tbody"):
             target_tbody = tbody
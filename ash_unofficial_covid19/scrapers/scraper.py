@@ -3,7 +3,16 @@ from abc import ABCMeta, abstractmethod
 from datetime import date
 from typing import Optional
 
-from ..scrapers.downloader import DownloadedCSV, DownloadedExcel, DownloadedHTML, DownloadedJSON, DownloadedPDF
+from bs4 import BeautifulSoup, SoupStrainer
+
+from ..scrapers.downloader import (
+    DownloadedCSV,
+    DownloadedExcel,
+    DownloadedHTML,
+    DownloadedJSON,
+    DownloadedPDF,
+    StreamedCSV,
+)
 
 
 class Scraper(metaclass=ABCMeta):
@@ -27,6 +36,22 @@ class Scraper(metaclass=ABCMeta):
         """
         return DownloadedHTML(html_url)
 
+    @staticmethod
+    def get_soup(html_content: bytes, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+        """HTMLのうち必要な要素だけを解析したBeautifulSoupオブジェクトを返す
+
+        C実装のlxmlで解析し、parse_onlyを指定した場合は条件に合う要素の部分木だけを構築する。
+
+        Args:
+            html_content (bytes): HTMLファイルのbytesデータ
+            parse_only (:obj:`SoupStrainer`): 解析対象の要素の条件
+
+        Returns:
+            soup (:obj:`BeautifulSoup`): 解析結果のBeautifulSoupオブジェクト
+
+        """
+        return BeautifulSoup(html_content, "lxml", parse_only=parse_only)
+
     @staticmethod
     def get_csv(csv_url: str, encoding: str = "utf-8") -> DownloadedCSV:
         """CSVファイルのbytesデータを要素に持つオブジェクトを返す
@@ -41,6 +66,20 @@ class Scraper(metaclass=ABCMeta):
         """
         return DownloadedCSV(url=csv_url, encoding=encoding)
 
+    @staticmethod
+    def get_csv_stream(csv_url: str, encoding: str = "utf-8") -> StreamedCSV:
+        """CSVファイルを1行ずつ返すイテレータを要素に持つオブジェクトを返す
+
+        Args:
+            csv_url (str): CSVファイルのURL
+            encoding (str): CSVファイルの文字コード
+
+        Returns:
+            streamed_csv (:obj:`StreamedCSV`): CSVファイルの行のイテレータを要素に持つオブジェクト
+
+        """
+        return StreamedCSV(url=csv_url, encoding=encoding)
+
     @staticmethod
     def get_pdf(pdf_url: str) -> DownloadedPDF:
         """PDFファイルのBytesIOデータを要素に持つオブジェクトを返す
@@ -1,3 +1,9 @@
+import hashlib
+import re
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Optional, Union
 from urllib.parse import urlparse
 
 import psycopg2
@@ -9,6 +15,190 @@ from ..errors import DatabaseConnectionError
 from ..logs import AppLog
 
 
+@dataclass(frozen=True)
+class QueryRecord:
+    """実行したSQL文1件の計測結果
+
+    Attributes:
+        statement (str): リテラルとプレースホルダを?に置き換えて正規化したSQL文
+        fingerprint (str): 正規化したSQL文のハッシュ値
+        duration (float): 実行時間（ミリ秒）
+        row_count (int): 取得または更新した行数
+
+    """
+
+    statement: str
+    fingerprint: str
+    duration: float
+    row_count: int
+
+
+class QueryCollector:
+    """1件のリクエストで実行したSQL文の計測結果を集める
+
+    activateしたコンテキストでInstrumentedCursorが実行したSQL文の正規化した文、
+    実行時間、行数を記録し、実行時間が閾値以上のものは遅いクエリとしてログに出力する。
+
+    Attributes:
+        records (list of :obj:`QueryRecord`): 実行したSQL文の計測結果のリスト
+        count (int): 実行したSQL文の件数
+        total_duration (float): SQL文の実行時間の合計（ミリ秒）
+
+    """
+
+    SQL_NORMALIZE_PATTERNS = (
+        (re.compile(r"'(?:[^']|'')*'"), "?"),
+        (re.compile(r"%(?:\(\w+\))?s"), "?"),
+        (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+        (re.compile(r"\s+"), " "),
+        # execute_valuesで展開した複数行のVALUESは1行分にまとめる
+        (re.compile(r"(\((?:\?, ?)*\?\))(?:, ?\((?:\?, ?)*\?\))+"), r"\1, ..."),
+    )
+
+    def __init__(self, slow_query_threshold: float = Config.SLOW_QUERY_THRESHOLD_MS):
+        """
+        Args:
+            slow_query_threshold (float): 遅いクエリとしてログに出力する実行時間の閾値（ミリ秒）
+
+        """
+        self.__slow_query_threshold = slow_query_threshold
+        self.__records: list = list()
+
+    @property
+    def records(self) -> list:
+        return self.__records
+
+    @property
+    def count(self) -> int:
+        return len(self.__records)
+
+    @property
+    def total_duration(self) -> float:
+        return sum(record.duration for record in self.__records)
+
+    @classmethod
+    def normalize(cls, statement: Union[str, bytes]) -> str:
+        """SQL文のリテラルとプレースホルダを?に置き換え、空白をまとめて正規化する
+
+        Args:
+            statement (str or bytes): SQL文
+
+        Returns:
+            normalized_statement (str): 正規化したSQL文
+
+        """
+        if isinstance(statement, bytes):
+            statement = statement.decode("utf-8", errors="replace")
+
+        for pattern, replacement in cls.SQL_NORMALIZE_PATTERNS:
+            statement = pattern.sub(replacement, statement)
+        return statement.strip()
+
+    @staticmethod
+    def get_fingerprint(normalized_statement: str) -> str:
+        """正規化したSQL文のハッシュ値を返す
+
+        Args:
+            normalized_statement (str): 正規化したSQL文
+
+        Returns:
+            fingerprint (str): 正規化したSQL文のSHA-256ハッシュ値の先頭16文字
+
+        """
+        return hashlib.sha256(normalized_statement.encode("utf-8")).hexdigest()[:16]
+
+    def add(self, statement: Union[str, bytes], duration: float, row_count: int) -> QueryRecord:
+        """SQL文の計測結果を記録する
+
+        Args:
+            statement (str or bytes): 実行したSQL文
+            duration (float): 実行時間（ミリ秒）
+            row_count (int): 取得または更新した行数
+
+        Returns:
+            record (:obj:`QueryRecord`): 記録した計測結果
+
+        """
+        normalized_statement = self.normalize(statement)
+        record = QueryRecord(
+            statement=normalized_statement,
+            fingerprint=self.get_fingerprint(normalized_statement),
+            duration=duration,
+            row_count=row_count,
+        )
+        self.__records.append(record)
+        if self.__slow_query_threshold <= duration:
+            AppLog().warning(
+                "遅いクエリ: fingerprint={0} duration={1:.1f}ms rows={2} statement={3}".format(
+                    record.fingerprint, record.duration, record.row_count, record.statement
+                )
+            )
+        return record
+
+    def activate(self) -> Token:
+        """現在のコンテキストで実行するSQL文の計測結果をこのオブジェクトに集める
+
+        Returns:
+            token (:obj:`Token`): deactivateで元に戻すためのトークン
+
+        """
+        return _current_query_collector.set(self)
+
+    @staticmethod
+    def deactivate(token: Token) -> None:
+        """activateする前の状態に戻す
+
+        Args:
+            token (:obj:`Token`): activateが返したトークン
+
+        """
+        _current_query_collector.reset(token)
+
+    @staticmethod
+    def get_current() -> Optional["QueryCollector"]:
+        """現在のコンテキストでactivateされているオブジェクトを返す
+
+        Returns:
+            collector (:obj:`QueryCollector`): 計測結果を集めるオブジェクト
+                activateされていない場合はNoneを返す。
+
+        """
+        return _current_query_collector.get()
+
+
+_current_query_collector: ContextVar[Optional[QueryCollector]] = ContextVar("query_collector", default=None)
+
+
+class InstrumentedCursor(DictCursor):
+    """実行したSQL文の実行時間と行数をQueryCollectorへ記録するCursor
+
+    QueryCollectorがactivateされていないコンテキストでは、DictCursorと同じように動作する。
+
+    """
+
+    def execute(self, query, vars=None):
+        collector = QueryCollector.get_current()
+        if collector is None:
+            return super().execute(query, vars)
+
+        started_at = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            collector.add(query, (time.perf_counter() - started_at) * 1000, self.rowcount)
+
+    def executemany(self, query, vars_list):
+        collector = QueryCollector.get_current()
+        if collector is None:
+            return super().executemany(query, vars_list)
+
+        started_at = time.perf_counter()
+        try:
+            return super().executemany(query, vars_list)
+        finally:
+            collector.add(query, (time.perf_counter() - started_at) * 1000, self.rowcount)
+
+
 class ConnectionPool:
     """PostgreSQLサーバへの接続を管理する
 
@@ -24,7 +214,7 @@ class ConnectionPool:
             self.__pool = SimpleConnectionPool(
                 minconn=2,
                 maxconn=5,
-                cursor_factory=DictCursor,
+                cursor_factory=InstrumentedCursor,
                 database=url.path[1:],
                 user=url.username,
                 password=url.password,
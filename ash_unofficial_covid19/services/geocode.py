@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta, timezone
+
+from ..config import Config
+from ..models.geocode import GeocodeFactory
+from ..services.database import ConnectionPool
+from ..services.service import Service
+
+
+class GeocodeService(Service):
+    """施設名から緯度経度を検索した結果のキャッシュを扱うサービス"""
+
+    def __init__(self, pool: ConnectionPool):
+        """
+        Args:
+            table_name (str): テーブル名
+            pool (:obj:`ConnectionPool`): SimpleConnectionPoolを要素に持つオブジェクト
+
+        """
+        Service.__init__(self, "geocodes", pool)
+
+    def create(self, geocodes: GeocodeFactory) -> None:
+        """データベースへ検索結果のキャッシュを保存
+
+        Args:
+            geocodes (:obj:`GeocodeFactory`): 検索結果のキャッシュデータ
+                検索結果のキャッシュデータのオブジェクトのリストを要素に持つオブジェクト
+
+        """
+        items = (
+            "query",
+            "longitude",
+            "latitude",
+            "is_pinned",
+            "updated_at",
+        )
+
+        data_lists = list()
+        for geocode in geocodes.items:
+            data_lists.append(
+                [
+                    geocode.query,
+                    geocode.longitude,
+                    geocode.latitude,
+                    geocode.is_pinned,
+                    datetime.now(timezone(timedelta(hours=+9))),
+                ]
+            )
+
+        if not data_lists:
+            return
+
+        # データベースへ登録処理
+        self.upsert(
+            items=items,
+            primary_key="query",
+            data_lists=data_lists,
+        )
+
+    def find_all(self) -> GeocodeFactory:
+        """有効な検索結果のキャッシュの全件リストを返す
+
+        見つからなかったという結果のキャッシュは、一定期間を過ぎたら再検索するため返さない。
+
+        Returns:
+            res (:obj:`GeocodeFactory`): 検索結果のキャッシュ一覧データ
+                検索結果のキャッシュデータのオブジェクトのリストを要素に持つオブジェクト
+
+        """
+        state = (
+            "SELECT"
+            + " "
+            + "query,longitude,latitude,is_pinned"
+            + " "
+            + "FROM"
+            + " "
+            + self.table_name
+            + " "
+            + "WHERE longitude IS NOT NULL OR is_pinned OR updated_at > %s"
+            + ";"
+        )
+        expired_at = datetime.now(timezone(timedelta(hours=+9))) - timedelta(days=Config.GEOCODE_NEGATIVE_CACHE_DAYS)
+        factory = GeocodeFactory()
+        with self.get_connection() as cur:
+            cur.execute(state, (expired_at,))
+            factory.create_many(cur.fetchall(), columns=[column.name for column in cur.description])
+
+        return factory
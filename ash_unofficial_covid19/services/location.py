@@ -1,16 +1,17 @@
 from datetime import datetime, timedelta, timezone
-from decimal import ROUND_HALF_UP, Decimal
-from typing import TypedDict, Union
-
-import numpy as np
+from typing import TYPE_CHECKING, Sequence, TypedDict, Union
 
 from ..models.location import LocationFactory
 from ..models.outpatient import OutpatientLocation, OutpatientLocationFactory
 from ..models.point import Point
 from ..models.reservation_status import ReservationStatusLocation, ReservationStatusLocationFactory
+from ..numerics import round_half_up
 from ..services.database import ConnectionPool
 from ..services.service import Service
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 class LocationService(Service):
     """医療機関の緯度経度データを扱うサービス"""
@@ -68,7 +69,7 @@ class LocationService(Service):
         state = (
             "SELECT"
             + " "
-            + "medical_institution_name,longitude,latitude"
+            + "latitude,longitude,medical_institution_name"
             + " "
             + "FROM"
             + " "
@@ -80,8 +81,7 @@ class LocationService(Service):
         factory = LocationFactory()
         with self.get_connection() as cur:
             cur.execute(state)
-            for row in cur.fetchall():
-                factory.create(**row)
+            factory.create_many(cur.fetchall(), columns=[column.name for column in cur.description])
 
         return factory
 
@@ -98,16 +98,33 @@ class LocationService(Service):
             distance (float): 2点間の距離（メートル、小数点以下第4位を切り上げ）
 
         """
+        return float(LocationService.get_distances(start_point=start_point, end_points=[end_point])[0])
+
+    @staticmethod
+    def get_distances(start_point: Point, end_points: Sequence[Point]) -> "np.ndarray":
+        """
+        1つの地点から複数の地点それぞれまでの距離をまとめて計算して返す。
+
+        Args:
+            start_point (obj:`Point`): 緯度と経度を要素に持つオブジェクト
+            end_points (list of :obj:`Point`): 緯度と経度を要素に持つオブジェクトのリスト
+
+        Returns:
+            distances (:obj:`np.ndarray`): 各地点までの距離の配列（メートル、小数点以下第4位を切り上げ）
+
+        """
+        import numpy as np
+
         earth_radius = 6378137.00
         start_latitude = np.radians(start_point.latitude)
         start_longitude = np.radians(start_point.longitude)
-        end_latitude = np.radians(end_point.latitude)
-        end_longitude = np.radians(end_point.longitude)
-        distance = earth_radius * np.arccos(
+        end_latitude = np.radians(np.array([end_point.latitude for end_point in end_points], dtype="float64"))
+        end_longitude = np.radians(np.array([end_point.longitude for end_point in end_points], dtype="float64"))
+        distances = earth_radius * np.arccos(
             np.sin(start_latitude) * np.sin(end_latitude)
             + np.cos(start_latitude) * np.cos(end_latitude) * np.cos(end_longitude - start_longitude)
         )
-        return float(Decimal(str(distance)).quantize(Decimal("0.001"), rounding=ROUND_HALF_UP))
+        return round_half_up(distances, 3)
 
     @classmethod
     def get_near_locations(
@@ -129,26 +146,23 @@ class LocationService(Service):
                 小数点第3位を切り上げ）を要素に持つ辞書のリスト
 
         """
-        tmp_locations = list()
+        import numpy as np
+
         OrderedLocation = TypedDict(
             "OrderedLocation",
             {"order": int, "location": Union[ReservationStatusLocation, OutpatientLocation], "distance": float},
         )
-        for location in locations.items:
-            ordered_location: OrderedLocation = {
-                "order": 0,
-                "location": location,
-                "distance": self.get_distance(start_point=current_point, end_point=location),
-            }
-            tmp_locations.append(ordered_location)
-
-        near_locations = sorted(tmp_locations, key=lambda x: x["distance"])[:10]
-        for i in range(len(near_locations)):
+        items = locations.items
+        distances = self.get_distances(start_point=current_point, end_points=items)
+        # 距離が同じ場合は元の並び順を保つ
+        nearest_indexes = np.argsort(distances, kind="stable")[:10]
+        # 距離を分かりやすくするためキロメートルに変換する。
+        kilometers = round_half_up(distances[nearest_indexes] / 1000, 2).tolist()
+
+        near_locations = list()
+        for i, index in enumerate(nearest_indexes.tolist()):
             # 現在地から近い順で連番を付与する。
-            near_locations[i]["order"] = i + 1
-            # 距離を分かりやすくするためキロメートルに変換する。
-            near_locations[i]["distance"] = float(
-                Decimal(str(near_locations[i]["distance"] / 1000)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-            )
+            near_location: OrderedLocation = {"order": i + 1, "location": items[index], "distance": kilometers[i]}
+            near_locations.append(near_location)
 
         return near_locations
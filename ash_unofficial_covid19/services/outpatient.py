@@ -199,7 +199,7 @@ class OutpatientService(Service):
             + "reserve.medical_institution_name,city,address,phone_number,is_target_not_family,"
             + "is_pediatrics,mon,tue,wed,thu,fri,sat,sun,"
             + "is_face_to_face_for_positive_patients,is_online_for_positive_patients,"
-            + "is_home_visitation_for_positive_patients,memo,longitude,latitude "
+            + "is_home_visitation_for_positive_patients,memo,latitude,longitude "
             + "FROM "
             + self.table_name
             + " "
@@ -215,7 +215,6 @@ class OutpatientService(Service):
                 cur.execute(state + where_sentence + order_sentence)
             else:
                 cur.execute(state + where_sentence + order_sentence, search_args)
-            for row in cur.fetchall():
-                factory.create(**row)
+            factory.create_many(cur.fetchall(), columns=[column.name for column in cur.description])
 
         return factory
@@ -1,18 +1,20 @@
 from datetime import date, datetime, timedelta, timezone
-from decimal import ROUND_HALF_UP, Decimal
+from typing import TYPE_CHECKING
 
-import pandas as pd
 import psycopg2
-from dateutil.relativedelta import relativedelta
 
 from ..config import Config
 from ..errors import ServiceError
 from ..models.patient import AsahikawaPatientFactory, HokkaidoPatientFactory
+from ..numerics import get_per_hundred_thousand_population, round_half_up
 from ..services.database import ConnectionPool
-from ..services.service import Service
+from ..services.service import DailyAggregateService, Service
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-class AsahikawaPatientService(Service):
+
+class AsahikawaPatientService(DailyAggregateService):
     """旭川市の公表する新型コロナウイルス感染症患者データを扱うサービス"""
 
     def __init__(self, pool: ConnectionPool):
@@ -131,8 +133,9 @@ class AsahikawaPatientService(Service):
             + " "
             + "a.patient_number,a.city_code,a.prefecture,a.city_name,"
             + "a.publication_date,"
-            + "h.onset_date,a.residence,a.age,a.sex,h.occupation as h_occupation,"
-            + "a.occupation as a_occupation,h.status,h.symptom,"
+            + "h.onset_date,a.residence,a.age,a.sex,"
+            # 北海道データがない場合、職業は旭川データの値をセット
+            + "COALESCE(h.occupation,a.occupation) AS occupation,h.status,h.symptom,"
             + "h.overseas_travel_history,h.be_discharged,a.note,"
             + "a.hokkaido_patient_number,a.surrounding_status,a.close_contact"
             + " "
@@ -151,15 +154,7 @@ class AsahikawaPatientService(Service):
         factory = AsahikawaPatientFactory()
         with self.get_connection() as cur:
             cur.execute(state)
-            for dict_cursor in cur.fetchall():
-                row = dict(dict_cursor)
-                # 北海道データがない場合、職業は旭川データの値をセット
-                if row["h_occupation"] is None:
-                    row["occupation"] = row["a_occupation"]
-                else:
-                    row["occupation"] = row["h_occupation"]
-                del row["h_occupation"], row["a_occupation"]
-                factory.create(**row)
+            factory.create_many(cur.fetchall(), columns=[column.name for column in cur.description])
 
         return factory
 
@@ -241,8 +236,7 @@ class AsahikawaPatientService(Service):
         factory = AsahikawaPatientFactory()
         with self.get_connection() as cur:
             cur.execute(state)
-            for row in cur.fetchall():
-                factory.create(**row)
+            factory.create_many(cur.fetchall(), columns=[column.name for column in cur.description])
 
         return (factory, max_page)
 
@@ -370,7 +364,8 @@ class AsahikawaPatientService(Service):
             + "generate_series(%s::DATE, %s::DATE, '1 day')) "
             + "AS day_ranges LEFT JOIN asahikawa_patients ON "
             + "from_day <= asahikawa_patients.publication_date AND "
-            + "asahikawa_patients.publication_date < to_day GROUP BY from_day;"
+            + "asahikawa_patients.publication_date < to_day GROUP BY from_day "
+            + "ORDER BY from_day;"
         )
         aggregate_by_days = list()
         with self.get_connection() as cur:
@@ -413,7 +408,7 @@ class AsahikawaPatientService(Service):
 
         return aggregate_by_weeks
 
-    def get_aggregate_by_weeks_per_age(self, from_date: date, to_date: date) -> pd.DataFrame:
+    def get_aggregate_by_weeks_per_age(self, from_date: date, to_date: date) -> "pd.DataFrame":
         """指定した期間の1週間ごとの年代別の陽性患者数の集計結果を返す
 
         Args:
@@ -425,6 +420,8 @@ class AsahikawaPatientService(Service):
                 1週間ごとの日付とその週の年代別新規陽性患者数をpandasのDataFrameで返す
 
         """
+        import pandas as pd
+
         if not isinstance(from_date, date) or not isinstance(to_date, date):
             raise ServiceError("期間の範囲指定が日付になっていません。")
 
@@ -478,14 +475,12 @@ class AsahikawaPatientService(Service):
                 1週間ごとの日付とその週の1日あたり平均新規陽性患者数を要素とする
                 タプルのリスト
         """
+        import numpy as np
+
         aggregate_by_weeks = self.get_aggregate_by_weeks(from_date=from_date, to_date=to_date)
-        seven_days_moving_average = list()
-        for patients_number in aggregate_by_weeks:
-            moving_average = float(
-                Decimal(str(patients_number[1] / 7)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-            )
-            seven_days_moving_average.append((patients_number[0], moving_average))
-        return seven_days_moving_average
+        patients_numbers = np.array([row[1] for row in aggregate_by_weeks], dtype="float64")
+        moving_averages = round_half_up(patients_numbers / 7, 2).tolist()
+        return list(zip([row[0] for row in aggregate_by_weeks], moving_averages))
 
     def get_per_hundred_thousand_population_per_week(self, from_date: date, to_date: date) -> list:
         """1週間の人口10万人あたりの新規陽性患者数の計算結果を返す
@@ -500,15 +495,10 @@ class AsahikawaPatientService(Service):
                 タプルのリスト
         """
         aggregate_by_weeks = self.get_aggregate_by_weeks(from_date=from_date, to_date=to_date)
-        per_hundred_thousand_population_per_week = list()
-        for patients_number in aggregate_by_weeks:
-            per_hundred_thousand_population = float(
-                Decimal(str(patients_number[1] / Config.POPULATION * 100000)).quantize(
-                    Decimal("0.01"), rounding=ROUND_HALF_UP
-                )
-            )
-            per_hundred_thousand_population_per_week.append((patients_number[0], per_hundred_thousand_population))
-        return per_hundred_thousand_population_per_week
+        per_hundred_thousand_population = get_per_hundred_thousand_population(
+            [row[1] for row in aggregate_by_weeks], Config.POPULATION
+        )
+        return list(zip([row[0] for row in aggregate_by_weeks], per_hundred_thousand_population))
 
     def get_reproduction_number(self, to_date: date) -> float:
         """指定した日時点の実効再生産数の簡易推定値を算出
@@ -523,30 +513,10 @@ class AsahikawaPatientService(Service):
             reproduction_number (float): 実効再生産数
 
         """
-        generation_time = 5
-        from_date = to_date - relativedelta(days=6 + generation_time)
-        aggregate_by_days = self.get_aggregate_by_days(from_date=from_date, to_date=to_date)
-        latest_number = 0
-        generation_time_before_number = 0
-        i = 0
-        for patients_number in aggregate_by_days:
-            if i < 5:
-                generation_time_before_number += patients_number[1]
-            elif 5 <= i and i < 7:
-                generation_time_before_number += patients_number[1]
-                latest_number += patients_number[1]
-            else:
-                latest_number += patients_number[1]
-            i += 1
-
-        if generation_time_before_number == 0:
-            return 0
+        if not isinstance(to_date, date):
+            raise ServiceError("期間の範囲指定が日付になっていません。")
 
-        return float(
-            Decimal(str(latest_number / generation_time_before_number)).quantize(
-                Decimal("0.01"), rounding=ROUND_HALF_UP
-            )
-        )
+        return self.get_reproduction_number_series(from_date=to_date, to_date=to_date)[0][1]
 
     def get_total_by_months(self, from_date: date, to_date: date) -> list:
         """指定した期間の1か月ごとの陽性患者数の累計結果を返す
@@ -1,18 +1,20 @@
 from datetime import date, datetime, timedelta, timezone
-from decimal import ROUND_HALF_UP, Decimal
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, Union
 
-import pandas as pd
 import psycopg2
 
 from ..config import Config
 from ..errors import ServiceError
-from ..models.patients_number import PatientsNumberFactory
+from ..models.patients_number import PatientsNumberArrayFactory, PatientsNumberFactory, PatientsNumberRangeIndex
+from ..numerics import get_per_hundred_thousand_population
 from ..services.database import ConnectionPool
-from ..services.service import Service
+from ..services.service import DailyAggregateService, Service
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-class PatientsNumberService(Service):
+
+class PatientsNumberService(DailyAggregateService):
     """旭川市の新型コロナウイルス感染症日別年代別陽性患者数データを扱うサービス"""
 
     def __init__(self, pool: ConnectionPool):
@@ -43,12 +45,13 @@ class PatientsNumberService(Service):
         else:
             return
 
-    def create(self, patients_numbers: PatientsNumberFactory) -> None:
+    def create(self, patients_numbers: Union[PatientsNumberFactory, PatientsNumberArrayFactory]) -> None:
         """データベースへ新型コロナウイルス感染症日別年代別陽性患者数データを一括登録
 
         Args:
             patients_number (:obj:`PatientsNumberFactory`): 陽性患者数データリスト
                 日別年代別陽性患者数データのオブジェクトのリストを要素に持つオブジェクト
+                PatientsNumberArrayFactoryの場合は構造化配列からそのまま登録データを作成する
 
         """
         items = (
@@ -68,25 +71,28 @@ class PatientsNumberService(Service):
         )
 
         # バルクインサートするデータのリストを作成
-        data_lists = list()
-        for patients_number in patients_numbers.items:
-            data_lists.append(
-                [
-                    patients_number.publication_date,
-                    patients_number.age_under_10,
-                    patients_number.age_10s,
-                    patients_number.age_20s,
-                    patients_number.age_30s,
-                    patients_number.age_40s,
-                    patients_number.age_50s,
-                    patients_number.age_60s,
-                    patients_number.age_70s,
-                    patients_number.age_80s,
-                    patients_number.age_over_90,
-                    patients_number.investigating,
-                    datetime.now(timezone(timedelta(hours=+9))),
-                ]
-            )
+        if isinstance(patients_numbers, PatientsNumberArrayFactory):
+            data_lists = patients_numbers.to_data_lists(datetime.now(timezone(timedelta(hours=+9))))
+        else:
+            data_lists = list()
+            for patients_number in patients_numbers.items:
+                data_lists.append(
+                    [
+                        patients_number.publication_date,
+                        patients_number.age_under_10,
+                        patients_number.age_10s,
+                        patients_number.age_20s,
+                        patients_number.age_30s,
+                        patients_number.age_40s,
+                        patients_number.age_50s,
+                        patients_number.age_60s,
+                        patients_number.age_70s,
+                        patients_number.age_80s,
+                        patients_number.age_over_90,
+                        patients_number.investigating,
+                        datetime.now(timezone(timedelta(hours=+9))),
+                    ]
+                )
 
         # データベースへ登録処理
         self.upsert(
@@ -171,9 +177,7 @@ class PatientsNumberService(Service):
                 cur.execute(state + order_sentence)
             else:
                 cur.execute(state + where_sentence + order_sentence, target_date_list)
-
-            for dict_cursor in cur.fetchall():
-                factory.create(**dict(dict_cursor))
+            factory.create_many(cur.fetchall(), columns=[column.name for column in cur.description])
 
         return factory
 
@@ -384,17 +388,12 @@ class PatientsNumberService(Service):
                 タプルのリスト
         """
         aggregate_by_weeks = self.get_aggregate_by_weeks(from_date=from_date, to_date=to_date)
-        per_hundred_thousand_population_per_week = list()
-        for week_data in aggregate_by_weeks:
-            per_hundred_thousand_population = float(
-                Decimal(str(week_data[1] / Config.POPULATION * 100000)).quantize(
-                    Decimal("0.01"), rounding=ROUND_HALF_UP
-                )
-            )
-            per_hundred_thousand_population_per_week.append((week_data[0], per_hundred_thousand_population))
-        return per_hundred_thousand_population_per_week
+        per_hundred_thousand_population = get_per_hundred_thousand_population(
+            [week_data[1] for week_data in aggregate_by_weeks], Config.POPULATION
+        )
+        return list(zip([week_data[0] for week_data in aggregate_by_weeks], per_hundred_thousand_population))
 
-    def get_aggregate_by_weeks_per_age(self, from_date: date, to_date: date) -> pd.DataFrame:
+    def get_aggregate_by_weeks_per_age(self, from_date: date, to_date: date) -> "pd.DataFrame":
         """指定した期間の1週間ごとの年代別の陽性患者数の集計結果を返す
 
         Args:
@@ -424,40 +423,15 @@ class PatientsNumberService(Service):
             + "patients_numbers.publication_date < to_week GROUP BY from_week "
             + "ORDER BY weeks;"
         )
-        df = pd.DataFrame(
-            columns=[
-                "10歳未満",
-                "10代",
-                "20代",
-                "30代",
-                "40代",
-                "50代",
-                "60代",
-                "70代",
-                "80代",
-                "90歳以上",
-                "調査中等",
-            ]
-        )
+        factory = PatientsNumberArrayFactory()
         with self.get_connection() as cur:
             cur.execute(state, (from_date.strftime("%Y-%m-%d"), to_date.strftime("%Y-%m-%d")))
-            for row in cur.fetchall():
-                df.at[row["weeks"], "10歳未満"] = row["age_under_10"]
-                df.at[row["weeks"], "10代"] = row["age_10s"]
-                df.at[row["weeks"], "20代"] = row["age_20s"]
-                df.at[row["weeks"], "30代"] = row["age_30s"]
-                df.at[row["weeks"], "40代"] = row["age_40s"]
-                df.at[row["weeks"], "50代"] = row["age_50s"]
-                df.at[row["weeks"], "60代"] = row["age_60s"]
-                df.at[row["weeks"], "70代"] = row["age_70s"]
-                df.at[row["weeks"], "80代"] = row["age_80s"]
-                df.at[row["weeks"], "90歳以上"] = row["age_over_90"]
-                df.at[row["weeks"], "調査中等"] = row["investigating"]
-
-        df.fillna(0, inplace=True)
-        return df.fillna(0)
-
-    def get_aggregate_by_months_per_age(self, from_date: date, to_date: date) -> pd.DataFrame:
+            # 患者数がない期間のSUMはNULLになるため、PatientsNumberArrayFactoryで0とする
+            factory.create_many(cur.fetchall())
+
+        return factory.to_dataframe()
+
+    def get_aggregate_by_months_per_age(self, from_date: date, to_date: date) -> "pd.DataFrame":
         """指定した期間の1月ごとの年代別の陽性患者数の集計結果を返す
 
         Args:
@@ -487,80 +461,34 @@ class PatientsNumberService(Service):
             + "patients_numbers.publication_date < to_month GROUP BY from_month "
             + "ORDER BY months;"
         )
-        df = pd.DataFrame(
-            columns=[
-                "10歳未満",
-                "10代",
-                "20代",
-                "30代",
-                "40代",
-                "50代",
-                "60代",
-                "70代",
-                "80代",
-                "90歳以上",
-                "調査中等",
-            ]
-        )
+        factory = PatientsNumberArrayFactory()
         with self.get_connection() as cur:
             cur.execute(state, (from_date.strftime("%Y-%m-%d"), to_date.strftime("%Y-%m-%d")))
-            for row in cur.fetchall():
-                df.at[row["months"], "10歳未満"] = row["age_under_10"]
-                df.at[row["months"], "10代"] = row["age_10s"]
-                df.at[row["months"], "20代"] = row["age_20s"]
-                df.at[row["months"], "30代"] = row["age_30s"]
-                df.at[row["months"], "40代"] = row["age_40s"]
-                df.at[row["months"], "50代"] = row["age_50s"]
-                df.at[row["months"], "60代"] = row["age_60s"]
-                df.at[row["months"], "70代"] = row["age_70s"]
-                df.at[row["months"], "80代"] = row["age_80s"]
-                df.at[row["months"], "90歳以上"] = row["age_over_90"]
-                df.at[row["months"], "調査中等"] = row["investigating"]
-
-        df.fillna(0, inplace=True)
-        return df.fillna(0)
-
-    def get_patients_number_by_age(self, from_date: date, to_date: date) -> list:
-        """年代別の陽性患者数を返す
+            # 患者数がない期間のSUMはNULLになるため、PatientsNumberArrayFactoryで0とする
+            factory.create_many(cur.fetchall())
 
-        Args:
-            from_date (obj:`date`): 累計の始期
-            to_date (obj:`date`): 累計の終期
+        return factory.to_dataframe()
+
+    def get_range_index(self) -> PatientsNumberRangeIndex:
+        """全期間の日別年代別陽性患者数から期間集計の索引を作成して返す
 
         Returns:
-            patients_number_by_age (list of tuple): 集計結果
-                年代別の陽性患者数を要素とするタプルのリスト
+            range_index (:obj:`PatientsNumberRangeIndex`): 年代別の患者数の累積和による期間集計の索引
 
         """
-        self._date_range_validator(from_date, to_date)
-        # 調査中等は集計しない。
         state = (
-            "SELECT "
-            + "SUM(age_under_10) AS age_under_10, SUM(age_10s) AS age_10s, "
-            + "SUM(age_20s) AS age_20s, SUM(age_30s) AS age_30s, "
-            + "SUM(age_40s) AS age_40s, SUM(age_50s) AS age_50s, "
-            + "SUM(age_60s) AS age_60s, SUM(age_70s) AS age_70s, "
-            + "SUM(age_80s) AS age_80s, SUM(age_over_90) AS age_over_90 "
-            + "FROM patients_numbers WHERE DATE(publication_date) "
-            + "BETWEEN %s AND %s;"
+            "SELECT publication_date, age_under_10, age_10s, age_20s, age_30s, "
+            + "age_40s, age_50s, age_60s, age_70s, age_80s, age_over_90, investigating "
+            + "FROM "
+            + self.table_name
+            + " ORDER BY publication_date;"
         )
+        factory = PatientsNumberArrayFactory()
         with self.get_connection() as cur:
-            cur.execute(state, (from_date.strftime("%Y-%m-%d"), to_date.strftime("%Y-%m-%d")))
-            for row in cur.fetchall():
-                patients_number_by_age = [
-                    ("10歳未満", row["age_under_10"]),
-                    ("10代", row["age_10s"]),
-                    ("20代", row["age_20s"]),
-                    ("30代", row["age_30s"]),
-                    ("40代", row["age_40s"]),
-                    ("50代", row["age_50s"]),
-                    ("60代", row["age_60s"]),
-                    ("70代", row["age_70s"]),
-                    ("80代", row["age_80s"]),
-                    ("90歳以上", row["age_over_90"]),
-                ]
+            cur.execute(state)
+            factory.create_many(cur.fetchall())
 
-        return patients_number_by_age
+        return PatientsNumberRangeIndex(factory)
 
     def get_total_by_months(self, from_date: date, to_date: date) -> list:
         """指定した期間の1か月ごとの陽性患者数の累計結果を返す
@@ -73,8 +73,7 @@ class PressReleaseLinkService(Service):
         factory = PressReleaseLinkFactory()
         with self.get_connection() as cur:
             cur.execute(state)
-            for row in cur.fetchall():
-                factory.create(**row)
+            factory.create_many(cur.fetchall(), columns=[column.name for column in cur.description])
 
         return factory
 
@@ -247,10 +247,10 @@ class ReservationStatusService(Service):
 
         state = (
             "SELECT "
-            + "area,reserve.medical_institution_name,division,"
-            + "address,phone_number,vaccine,status,inoculation_time,"
+            + "reserve.medical_institution_name,division,vaccine,area,"
+            + "address,phone_number,status,inoculation_time,"
             + "is_target_family,is_target_not_family,is_target_suberb,"
-            + "latitude,longitude,memo "
+            + "memo,latitude,longitude "
             + "FROM "
             + self.table_name
             + " "
@@ -266,8 +266,7 @@ class ReservationStatusService(Service):
                 cur.execute(state + order_sentence)
             else:
                 cur.execute(state + where_sentence + order_sentence, search_args)
-            for row in cur.fetchall():
-                factory.create(**row)
+            factory.create_many(cur.fetchall(), columns=[column.name for column in cur.description])
 
         return factory
 
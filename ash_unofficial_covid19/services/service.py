@@ -1,11 +1,14 @@
-from abc import ABCMeta
-from datetime import datetime
+from abc import ABCMeta, abstractmethod
+from datetime import date, datetime, timedelta
+from typing import Callable
 
 import psycopg2
 from psycopg2.extras import execute_values
 
 from ..errors import ServiceError
 from ..logs import AppLog
+from ..metrics import PipelineMetrics
+from ..numerics import get_growth_rates, get_moving_averages, get_reproduction_numbers
 from ..services.database import ConnectionPool, CursorFromConnectionPool
 
 
@@ -76,10 +79,13 @@ class Service(metaclass=ABCMeta):
         )
 
         try:
-            with self.get_connection() as cur:
-                execute_values(cur, state, data_lists)
-
             data_number = len(data_lists)
+            with PipelineMetrics.stage("upsert"):
+                with self.get_connection() as cur:
+                    execute_values(cur, state, data_lists)
+                # コミットできた件数だけを登録した行数とする
+                PipelineMetrics.count("rows_written", data_number)
+
             self.info_log(self.table_name + "テーブルへ" + str(data_number) + "件データを登録しました。")
         except (
             psycopg2.DataError,
@@ -134,3 +140,114 @@ class Service(metaclass=ABCMeta):
             self.__logger.error(message)
         else:
             self.__logger.info("エラーメッセージの指定が正しくない")
+
+
+class DailyAggregateService(Service):
+    """1日ごとの陽性患者数を集計できるサービスの基底クラス
+
+    get_aggregate_by_daysの集計結果から、移動平均、実効再生産数、増加率の
+    1日ごとの系列データを求める。
+
+    """
+
+    @abstractmethod
+    def get_aggregate_by_days(self, from_date: date, to_date: date) -> list:
+        """指定した期間の1日ごとの陽性患者数の集計結果を返す
+
+        Args:
+            from_date (obj:`date`): 集計の始期
+            to_date (obj:`date`): 集計の終期
+
+        Returns:
+            aggregate_by_days (list of tuple): 集計結果
+                1日ごとの日付とその日の新規陽性患者数を要素とする、日付順のタプルのリスト
+
+        """
+        pass
+
+    def get_moving_average_series(self, from_date: date, to_date: date, window: int = 7) -> list:
+        """指定した期間の1日ごとの新規陽性患者数の移動平均を返す
+
+        集計の始期より前のwindow - 1日分も含めて1日ごとの陽性患者数を1回で取得し、
+        累積和の差から各日の移動平均を求める。
+
+        Args:
+            from_date (obj:`date`): 集計の始期
+            to_date (obj:`date`): 集計の終期
+            window (int): 平均する日数
+
+        Returns:
+            moving_average_series (list of tuple): 集計結果
+                1日ごとの日付とその日までのwindow日間の1日あたり平均新規陽性患者数を要素とする
+                タプルのリスト
+
+        """
+        if not isinstance(window, int) or window < 1:
+            raise ServiceError("平均する日数は1以上の整数で指定してください。")
+
+        return self._get_series(from_date, to_date, window - 1, lambda numbers: get_moving_averages(numbers, window))
+
+    def get_reproduction_number_series(self, from_date: date, to_date: date) -> list:
+        """指定した期間の1日ごとの実効再生産数の簡易推定値を返す
+
+        国立感染症研究所の「COVID-19感染報告者数に基づく簡易実効再生産数推定方法」に基づき計算している。
+        https://www.niid.go.jp/niid/ja/diseases/ka/corona-virus/2019-ncov/2502-idsc/iasr-in/10465-496d04.html
+
+        Args:
+            from_date (obj:`date`): 集計の始期
+            to_date (obj:`date`): 集計の終期
+
+        Returns:
+            reproduction_number_series (list of tuple): 集計結果
+                1日ごとの日付とその日時点の実効再生産数を要素とするタプルのリスト
+
+        """
+        generation_time = 5
+        return self._get_series(
+            from_date,
+            to_date,
+            6 + generation_time,
+            lambda numbers: get_reproduction_numbers(numbers, generation_time),
+        )
+
+    def get_growth_rate_series(self, from_date: date, to_date: date, window: int = 7) -> list:
+        """指定した期間の1日ごとの新規陽性患者数の増加率を返す
+
+        Args:
+            from_date (obj:`date`): 集計の始期
+            to_date (obj:`date`): 集計の終期
+            window (int): 比較する期間の日数
+
+        Returns:
+            growth_rate_series (list of tuple): 集計結果
+                1日ごとの日付と、その日までのwindow日間の陽性患者数の合計の、その前のwindow日間の
+                合計からの増加率（前の期間が0人の場合はNone）を要素とするタプルのリスト
+
+        """
+        if not isinstance(window, int) or window < 1:
+            raise ServiceError("比較する期間の日数は1以上の整数で指定してください。")
+
+        return self._get_series(from_date, to_date, 2 * window - 1, lambda numbers: get_growth_rates(numbers, window))
+
+    def _get_series(self, from_date: date, to_date: date, lookback_days: int, calculate: Callable) -> list:
+        """1日ごとの陽性患者数から計算した系列データを日付と組にして返す
+
+        Args:
+            from_date (obj:`date`): 集計の始期
+            to_date (obj:`date`): 集計の終期
+            lookback_days (int): 始期の値の計算に必要な始期より前の日数
+            calculate (Callable): 1日ごとの陽性患者数のリストから、先頭のlookback_days日分を
+                除いた系列データのリストを計算する関数
+
+        Returns:
+            series (list of tuple): 日付と系列データの値を要素とするタプルのリスト
+
+        """
+        if not isinstance(from_date, date) or not isinstance(to_date, date):
+            raise ServiceError("期間の範囲指定が日付になっていません。")
+
+        aggregate_by_days = self.get_aggregate_by_days(
+            from_date=from_date - timedelta(days=lookback_days), to_date=to_date
+        )
+        values = calculate([row[1] for row in aggregate_by_days])
+        return list(zip([row[0] for row in aggregate_by_days[lookback_days:]], values))
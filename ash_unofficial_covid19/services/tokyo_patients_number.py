@@ -1,9 +1,9 @@
 from datetime import date, datetime, timedelta, timezone
-from decimal import ROUND_HALF_UP, Decimal
 
 from ..config import Config
 from ..errors import ServiceError
 from ..models.tokyo_patients_number import TokyoPatientsNumberFactory
+from ..numerics import get_per_hundred_thousand_population
 from ..services.database import ConnectionPool
 from ..services.service import Service
 
@@ -76,8 +76,7 @@ class TokyoPatientsNumberService(Service):
         factory = TokyoPatientsNumberFactory()
         with self.get_connection() as cur:
             cur.execute(state)
-            for row in cur.fetchall():
-                factory.create(**row)
+            factory.create_many(cur.fetchall(), columns=[column.name for column in cur.description])
 
         return factory
 
@@ -134,20 +133,11 @@ class TokyoPatientsNumberService(Service):
                 タプルのリスト
         """
         aggregate_by_weeks = self.get_aggregate_by_weeks(from_date=from_date, to_date=to_date)
-        per_hundred_thousand_population_per_week = list()
-        for aggregate in aggregate_by_weeks:
-            if aggregate[1] is None:
-                patients_number = 0
-            else:
-                patients_number = aggregate[1]
-            target_week = aggregate[0]
-            per_hundred_thousand_population = float(
-                Decimal(str(patients_number / Config.TOKYO_POPULATION * 100000)).quantize(
-                    Decimal("0.01"), rounding=ROUND_HALF_UP
-                )
-            )
-            per_hundred_thousand_population_per_week.append((target_week, per_hundred_thousand_population))
-        return per_hundred_thousand_population_per_week
+        # 患者数のNoneは0とする
+        per_hundred_thousand_population = get_per_hundred_thousand_population(
+            [aggregate[1] or 0 for aggregate in aggregate_by_weeks], Config.TOKYO_POPULATION
+        )
+        return list(zip([aggregate[0] for aggregate in aggregate_by_weeks], per_hundred_thousand_population))
 
     def get_last_update_date(self) -> date:
         """東京都のオープンデータの最新の公表日を取得する
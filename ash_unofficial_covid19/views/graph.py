@@ -1,15 +1,25 @@
+import hashlib
+import json
+import os
+import threading
 from abc import abstractmethod
+from collections import OrderedDict
 from datetime import date
 from io import BytesIO
+from pathlib import Path
+from tempfile import NamedTemporaryFile
 from typing import Optional
 
+import pandas as pd
 from matplotlib import dates as mdates
-from matplotlib import pyplot as plt
+from matplotlib.axes import Axes
 from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from matplotlib.font_manager import FontProperties
 from matplotlib.ticker import MultipleLocator, PercentFormatter
 from PIL import Image
 
+from ..config import Config
 from ..services.database import ConnectionPool
 from ..views.patients_number import (
     ByAgeView,
@@ -21,30 +31,288 @@ from ..views.patients_number import (
 )
 from ..views.view import View
 
+FONT_FILE = "./ash_unofficial_covid19/static/fonts/NotoSansJP-Regular.otf"
+
+AGE_COLORS = [
+    "#0946F1",
+    "#4979F5",
+    "#7096F8",
+    "#9DB7F9",
+    "#FF5838",
+    "#FFA28B",
+    "#FFE7E6",
+    "#F1F1F4",
+    "#D8D8DB",
+    "#949497",
+    "#626264",
+]
+
+
+class FigureTemplate:
+    """グラフの種類と画像サイズごとに再利用する図のテンプレート
+
+    軸の目盛りやフォーマッター、フォントなどデータによらない要素を保持し、
+    描画のたびにデータを表す要素だけを差し替えて使う。
+    pyplotの状態を使わないため、複数のスレッドから使うことができる。
+
+    Attributes:
+        figure (:obj:`Figure`): 図
+        ax (:obj:`Axes`): グラフを描画する軸
+        resources (dict): フォントなど描画に使う静的な要素の辞書
+        lock (:obj:`threading.Lock`): テンプレートを使用中であることを示すロック
+
+    """
+
+    def __init__(self, figsize: Optional[tuple[float, float]] = None, dpi: Optional[float] = None):
+        """
+        Args:
+            figsize (tuple): グラフ画像データの縦横サイズを要素に持つタプル
+            dpi (float): グラフ画像データの解像度
+
+        """
+        self.__figure = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(self.__figure)
+        self.__ax = self.__figure.add_subplot()
+        self.__subplot_params = {
+            name: getattr(self.__figure.subplotpars, name)
+            for name in ("left", "bottom", "right", "top", "wspace", "hspace")
+        }
+        self.__resources: dict = dict()
+        self.__lock = threading.Lock()
+
+    @property
+    def figure(self) -> Figure:
+        return self.__figure
+
+    @property
+    def ax(self) -> Axes:
+        return self.__ax
+
+    @property
+    def resources(self) -> dict:
+        return self.__resources
+
+    @property
+    def lock(self) -> threading.Lock:
+        return self.__lock
+
+    def tight_layout(self) -> None:
+        """余白を初期値に戻してからグラフの余白を詰める
+
+        tight_layoutの結果は現在の余白に依存するため、前回の描画の影響を受けないようにする。
+
+        """
+        self.__figure.subplots_adjust(**self.__subplot_params)
+        self.__figure.tight_layout()
+
 
 class GraphView(View):
-    """グラフを出力するクラスの基底クラス"""
+    """グラフを出力するクラスの基底クラス
+
+    グラフの種類と画像サイズごとに図のテンプレートを作成してキャッシュし、
+    描画のたびにデータを表す要素だけを差し替える。
+    キャッシュするテンプレートの数は、最近使われたものから一定数までとする。
+
+    """
+
+    _templates: OrderedDict = OrderedDict()
+    _templates_lock = threading.Lock()
+
+    def get_graph_image(
+        self,
+        figsize: Optional[tuple[float, float]] = None,
+        quality: int = Config.GRAPH_WEBP_QUALITY,
+        method: int = Config.GRAPH_WEBP_METHOD,
+        dpi: Optional[float] = None,
+    ) -> BytesIO:
+        """グラフの画像を生成
+
+        Args:
+            figsize (tuple): グラフ画像データの縦横サイズを要素に持つタプル
+            quality (int): WebPエンコードの品質
+            method (int): WebPエンコードの圧縮方法（大きいほど小さくなるが時間がかかる）
+            dpi (float): グラフ画像データの解像度
+
+        Returns:
+            graph_image (BytesIO): グラフの画像データ
+
+        """
+        template = self._get_template(figsize, dpi)
+        with template.lock:
+            artists = self._draw_data(template.ax, template.resources)
+            try:
+                template.tight_layout()
+                return self._figure_to_webp(template.figure, quality=quality, method=method)
+            finally:
+                for artist in artists:
+                    artist.remove()
+                template.ax.relim()
+
+    def _get_template(
+        self, figsize: Optional[tuple[float, float]] = None, dpi: Optional[float] = None
+    ) -> FigureTemplate:
+        """グラフの種類と画像サイズに対応する図のテンプレートを返す
+
+        Args:
+            figsize (tuple): グラフ画像データの縦横サイズを要素に持つタプル
+            dpi (float): グラフ画像データの解像度
+
+        Returns:
+            template (:obj:`FigureTemplate`): 図のテンプレート
+
+        """
+        key = (type(self), tuple(figsize) if figsize else None, dpi)
+        with self._templates_lock:
+            template = self._templates.get(key)
+            if template is None:
+                template = FigureTemplate(figsize, dpi)
+                template.resources.update(self._setup_axes(template.ax))
+                self._templates[key] = template
+                while Config.GRAPH_TEMPLATE_CACHE_SIZE < len(self._templates):
+                    self._templates.popitem(last=False)
+            else:
+                self._templates.move_to_end(key)
+
+        return template
+
+    def _setup_axes(self, ax: Axes) -> dict:
+        """データによらない軸の目盛りや書式を設定する
+
+        Args:
+            ax (:obj:`Axes`): グラフを描画する軸
+
+        Returns:
+            resources (dict): フォントなど描画に使う静的な要素の辞書
+
+        """
+        return dict()
+
+    def get_fingerprint(self, figsize: Optional[tuple[float, float]] = None, dpi: Optional[float] = None) -> str:
+        """グラフの入力データと画像サイズから、画像を作り直す必要があるか判定するための値を返す
+
+        Args:
+            figsize (tuple): グラフ画像データの縦横サイズを要素に持つタプル
+            dpi (float): グラフ画像データの解像度
+
+        Returns:
+            fingerprint (str): 入力データと画像サイズのハッシュ値
+
+        """
+        digest = hashlib.sha256()
+        settings = (type(self).__name__, figsize, dpi, Config.GRAPH_WEBP_QUALITY, Config.GRAPH_WEBP_METHOD)
+        digest.update(repr(settings).encode("utf-8"))
+        for graph_data in self._get_graph_data():
+            if isinstance(graph_data, pd.DataFrame):
+                digest.update(
+                    repr((graph_data.columns.tolist(), graph_data.dtypes.astype(str).tolist())).encode("utf-8")
+                )
+                # object型の列はto_numpy().tobytes()ではポインタの値になるため、値から求めたハッシュ値を使う
+                digest.update(pd.util.hash_pandas_object(graph_data, index=True).to_numpy().tobytes())
+            else:
+                digest.update(repr(graph_data).encode("utf-8"))
+
+        return digest.hexdigest()
 
     @abstractmethod
-    def get_graph_image(self, figsize: Optional[tuple[float, float]] = None) -> BytesIO:
+    def _get_graph_data(self) -> tuple:
+        """グラフの入力データを返す
+
+        Returns:
+            graph_data (tuple): グラフの入力データのリストやDataFrameのタプル
+
+        """
+        pass
+
+    @abstractmethod
+    def _draw_data(self, ax: Axes, resources: dict) -> list:
+        """データを表す要素を描画する
+
+        Args:
+            ax (:obj:`Axes`): グラフを描画する軸
+            resources (dict): フォントなど描画に使う静的な要素の辞書
+
+        Returns:
+            artists (list): 描画後に取り除く要素のリスト
+
+        """
         pass
 
+    def save_graph_image(self, save_path: Path, figsize: Optional[tuple[float, float]] = None) -> Path:
+        """グラフの画像を生成してファイルに保存する
+
+        公開中の画像が書き込み途中の状態で配信されないよう、同じディレクトリの一時ファイルへ
+        書き込んでから置き換える。別プロセスから呼び出すこともできる。
+
+        Args:
+            save_path (Path): 保存先のファイルパス
+            figsize (tuple): グラフ画像データの縦横サイズを要素に持つタプル
+
+        Returns:
+            save_path (Path): 保存先のファイルパス
+
+        """
+        graph_image = self.get_graph_image(figsize=figsize)
+        with NamedTemporaryFile(dir=save_path.parent, prefix=save_path.name + ".", delete=False) as f:
+            f.write(graph_image.getvalue())
+        # 一時ファイルは所有者しか読めない権限で作成されるため、公開用の権限に変更する
+        os.chmod(f.name, 0o644)
+        os.replace(f.name, save_path)
+        return save_path
+
     @staticmethod
-    def _png_to_webp(png_data: BytesIO) -> BytesIO:
-        """PNG形式のBytesIOをWebp形式に変換する。
+    def _figure_to_webp(
+        fig: Figure, quality: int = Config.GRAPH_WEBP_QUALITY, method: int = Config.GRAPH_WEBP_METHOD
+    ) -> BytesIO:
+        """グラフをAggで描画し、RGBAのバッファから直接Webp形式に変換する。
+
+        PNG形式を経由せず、描画結果のバッファをコピーせずにPILの画像として扱う。
 
         Args:
-            png_data (BytesIO): PNG形式のBytesIOデータ
+            fig (:obj:`Figure`): 描画するグラフ
+            quality (int): WebPエンコードの品質
+            method (int): WebPエンコードの圧縮方法
 
         Returns:
             webp_data (BytesIO): Webp形式のBytesIOデータ
 
         """
-        image = Image.open(png_data)
+        canvas = fig.canvas if isinstance(fig.canvas, FigureCanvasAgg) else FigureCanvasAgg(fig)
+        canvas.draw()
+        buffer = canvas.buffer_rgba()
+        height, width = buffer.shape[:2]
+        image = Image.frombuffer("RGBA", (width, height), buffer, "raw", "RGBA", 0, 1)
         webp_data = BytesIO()
-        image.save(webp_data, format="Webp")
+        image.save(webp_data, format="Webp", quality=quality, method=method)
         return webp_data
 
+    @staticmethod
+    def _draw_stacked_bars(ax: Axes, df, labels: list) -> list:
+        """年代別の割合を積み上げ棒グラフで描画する
+
+        Args:
+            ax (:obj:`Axes`): グラフを描画する軸
+            df (:obj:`pd.DataFrame`): 行を年代、列を期間とする割合のデータ
+            labels (list of str): 期間の目盛りのラベル
+
+        Returns:
+            artists (list): 描画後に取り除く要素のリスト
+
+        """
+        # 文字列のカテゴリ軸は過去の描画のカテゴリを覚えてしまうため、位置を数値で指定する
+        positions = list(range(len(labels)))
+        artists = list()
+        for i in range(len(df)):
+            artists.append(
+                ax.bar(
+                    positions,
+                    df.iloc[i].to_numpy(),
+                    bottom=df.iloc[:i].sum().to_numpy(),
+                    color=AGE_COLORS[i],
+                )
+            )
+        ax.set_xticks(positions, labels)
+        return artists
+
 
 class DailyTotalGraphView(GraphView):
     """日別累計患者数グラフ"""
@@ -59,38 +327,22 @@ class DailyTotalGraphView(GraphView):
         patients_numbers = DailyTotalView(today, pool)
         self._patients_numbers = patients_numbers
 
-    def get_graph_image(self, figsize: Optional[tuple[float, float]] = None) -> BytesIO:
-        """グラフの画像を生成
-
-        Args:
-            figsize (tuple): グラフ画像データの縦横サイズを要素に持つタプル
-
-        Returns:
-            graph_image (BytesIO): グラフの画像データ
-
-        """
-        if figsize:
-            fig = plt.figure(figsize=figsize)
-        else:
-            fig = plt.figure()
-        ax = fig.add_subplot()
-        day_x = [row[0] for row in self._patients_numbers.daily_total_data]
-        day_y = [row[1] for row in self._patients_numbers.daily_total_data]
-        ax.bar(day_x, day_y, color="#4979F5")
+    def _setup_axes(self, ax: Axes) -> dict:
         ax.yaxis.set_major_locator(MultipleLocator(50))
         ax.xaxis.set_major_locator(mdates.MonthLocator())
         ax.xaxis.set_major_formatter(mdates.DateFormatter("%y-%m-%d"))
         ax.grid(axis="y", color="lightgray")
         ax.tick_params(labelsize=8)
         ax.tick_params(axis="x", rotation=45)
-        fig.tight_layout()
-        canvas = FigureCanvasAgg(fig)
-        png_data = BytesIO()
-        canvas.print_png(png_data)
-        plt.cla()
-        plt.clf()
-        plt.close()
-        return self._png_to_webp(png_data)
+        return dict()
+
+    def _get_graph_data(self) -> tuple:
+        return (self._patients_numbers.daily_total_data,)
+
+    def _draw_data(self, ax: Axes, resources: dict) -> list:
+        day_x = [row[0] for row in self._patients_numbers.daily_total_data]
+        day_y = [row[1] for row in self._patients_numbers.daily_total_data]
+        return [ax.bar(day_x, day_y, color="#4979F5")]
 
 
 class MonthTotalGraphView(GraphView):
@@ -106,39 +358,27 @@ class MonthTotalGraphView(GraphView):
         patients_numbers = MonthTotalView(today, pool)
         self._patients_numbers = patients_numbers
 
-    def get_graph_image(self, figsize: Optional[tuple[float, float]] = None) -> BytesIO:
-        """グラフの画像を生成
-
-        Args:
-            figsize (tuple): グラフ画像データの縦横サイズを要素に持つタプル
+    def _setup_axes(self, ax: Axes) -> dict:
+        ax.yaxis.set_major_locator(MultipleLocator(5000))
+        ax.grid(axis="y", color="lightgray")
+        ax.tick_params(labelsize=8)
+        ax.tick_params(axis="x", rotation=45)
+        return dict()
 
-        Returns:
-            graph_image (BytesIO): グラフの画像データ
+    def _get_graph_data(self) -> tuple:
+        return (self._patients_numbers.month_total_data,)
 
-        """
+    def _draw_data(self, ax: Axes, resources: dict) -> list:
         # グラフの描画は直近12か月分のみとする
         # month_total_data = self._patients_numbers.month_total_data[-12:]
         month_total_data = self._patients_numbers.month_total_data
-        if figsize:
-            fig = plt.figure(figsize=figsize)
-        else:
-            fig = plt.figure()
-        ax = fig.add_subplot()
         month_total_x = [row[0].strftime("%Y-%m") for row in month_total_data]
         month_total_y = [row[1] for row in month_total_data]
-        ax.bar(month_total_x, month_total_y, facecolor="#4979F5")
-        ax.yaxis.set_major_locator(MultipleLocator(5000))
-        ax.grid(axis="y", color="lightgray")
-        ax.tick_params(labelsize=8)
-        ax.tick_params(axis="x", rotation=45)
-        fig.tight_layout()
-        canvas = FigureCanvasAgg(fig)
-        png_data = BytesIO()
-        canvas.print_png(png_data)
-        plt.cla()
-        plt.clf()
-        plt.close()
-        return self._png_to_webp(png_data)
+        # 文字列のカテゴリ軸は過去の描画のカテゴリを覚えてしまうため、位置を数値で指定する
+        positions = list(range(len(month_total_x)))
+        bars = ax.bar(positions, month_total_y, facecolor="#4979F5")
+        ax.set_xticks(positions, month_total_x)
+        return [bars]
 
 
 class ByAgeGraphView(GraphView):
@@ -154,40 +394,16 @@ class ByAgeGraphView(GraphView):
         patients_numbers = ByAgeView(today, pool)
         self._patients_numbers = patients_numbers
 
-    def get_graph_image(self, figsize: Optional[tuple[float, float]] = None) -> BytesIO:
-        """グラフの画像を生成
+    def _setup_axes(self, ax: Axes) -> dict:
+        return {"font": FontProperties(fname=FONT_FILE, size=14)}
 
-        Args:
-            figsize (tuple): グラフ画像データの縦横サイズを要素に持つタプル
+    def _get_graph_data(self) -> tuple:
+        return (self._patients_numbers.by_age_data,)
 
-        Returns:
-            graph_image (BytesIO): グラフの画像データ
-
-        """
-        font = FontProperties(
-            fname="./ash_unofficial_covid19/static/fonts/NotoSansJP-Regular.otf",
-            size=14,
-        )
-        if figsize:
-            fig = plt.figure(figsize=figsize)
-        else:
-            fig = plt.figure()
-        ax = fig.add_subplot()
+    def _draw_data(self, ax: Axes, resources: dict) -> list:
         by_age_label = [row[0] for row in self._patients_numbers.by_age_data]
         by_age_x = [row[1] for row in self._patients_numbers.by_age_data]
-        pie_colors = [
-            "#0946F1",
-            "#4979F5",
-            "#7096F8",
-            "#9DB7F9",
-            "#FF5838",
-            "#FFA28B",
-            "#FFE7E6",
-            "#F1F1F4",
-            "#D8D8DB",
-            "#949497",
-        ]
-        ax.pie(
+        wedges, texts, autotexts = ax.pie(
             by_age_x,
             labels=by_age_label,
             rotatelabels=True,
@@ -196,18 +412,11 @@ class ByAgeGraphView(GraphView):
             radius=1.3,
             labeldistance=1.1,
             pctdistance=0.7,
-            colors=pie_colors,
+            colors=AGE_COLORS[:10],
             counterclock=False,
-            textprops={"font_properties": font},
+            textprops={"font_properties": resources["font"]},
         )
-        fig.tight_layout()
-        canvas = FigureCanvasAgg(fig)
-        png_data = BytesIO()
-        canvas.print_png(png_data)
-        plt.cla()
-        plt.clf()
-        plt.close()
-        return self._png_to_webp(png_data)
+        return wedges + texts + autotexts
 
 
 class PerHundredThousandPopulationGraphView(GraphView):
@@ -223,78 +432,43 @@ class PerHundredThousandPopulationGraphView(GraphView):
         patients_numbers = PerHundredThousandPopulationView(today, pool)
         self._patients_numbers = patients_numbers
 
-    def get_graph_image(self, figsize: Optional[tuple[float, float]] = None) -> BytesIO:
-        """グラフの画像を生成
-
-        Args:
-            figsize (tuple): グラフ画像データの縦横サイズを要素に持つタプル
-
-        Returns:
-            graph_image (BytesIO): グラフの画像データ
-
-        """
-        font_file = "./ash_unofficial_covid19/static/fonts/NotoSansJP-Regular.otf"
-        legend_font = FontProperties(fname=font_file, size=14)
-        if figsize:
-            fig = plt.figure(figsize=figsize)
-        else:
-            fig = plt.figure()
-        ax = fig.add_subplot()
-
-        tokyo_per_hundred_thousand_population_x = [
-            row[0] for row in self._patients_numbers.tokyo_per_hundred_thousand_population_data
-        ]
-        tokyo_per_hundred_thousand_population_y = [
-            row[1] for row in self._patients_numbers.tokyo_per_hundred_thousand_population_data
-        ]
-        ax.plot(
-            tokyo_per_hundred_thousand_population_x,
-            tokyo_per_hundred_thousand_population_y,
-            color="#949497",
-            label="東京都",
-        )
-
-        sapporo_per_hundred_thousand_population_x = [
-            row[0] for row in self._patients_numbers.sapporo_per_hundred_thousand_population_data
-        ]
-        sapporo_per_hundred_thousand_population_y = [
-            row[1] for row in self._patients_numbers.sapporo_per_hundred_thousand_population_data
-        ]
-        ax.plot(
-            sapporo_per_hundred_thousand_population_x,
-            sapporo_per_hundred_thousand_population_y,
-            color="#FF5838",
-            label="札幌市",
-        )
-
-        per_hundred_thousand_population_x = [
-            row[0] for row in self._patients_numbers.per_hundred_thousand_population_data
-        ]
-        per_hundred_thousand_population_y = [
-            row[1] for row in self._patients_numbers.per_hundred_thousand_population_data
-        ]
-        ax.plot(
-            per_hundred_thousand_population_x,
-            per_hundred_thousand_population_y,
-            color="#4979F5",
-            label="旭川市",
-        )
-
+    def _setup_axes(self, ax: Axes) -> dict:
         ax.yaxis.set_major_locator(MultipleLocator(100))
         ax.xaxis.set_major_locator(mdates.MonthLocator())
         ax.xaxis.set_major_formatter(mdates.DateFormatter("%y-%m-%d"))
         ax.grid(axis="y", color="lightgray")
         ax.tick_params(labelsize=8)
         ax.tick_params(axis="x", rotation=45)
-        ax.legend(prop=legend_font, loc="upper left")
-        fig.tight_layout()
-        canvas = FigureCanvasAgg(fig)
-        png_data = BytesIO()
-        canvas.print_png(png_data)
-        plt.cla()
-        plt.clf()
-        plt.close()
-        return self._png_to_webp(png_data)
+        return {"legend_font": FontProperties(fname=FONT_FILE, size=14)}
+
+    def _get_graph_data(self) -> tuple:
+        return (
+            self._patients_numbers.tokyo_per_hundred_thousand_population_data,
+            self._patients_numbers.sapporo_per_hundred_thousand_population_data,
+            self._patients_numbers.per_hundred_thousand_population_data,
+        )
+
+    def _draw_data(self, ax: Axes, resources: dict) -> list:
+        artists = list()
+        series = [
+            (self._patients_numbers.tokyo_per_hundred_thousand_population_data, "#949497", "東京都"),
+            (self._patients_numbers.sapporo_per_hundred_thousand_population_data, "#FF5838", "札幌市"),
+            (self._patients_numbers.per_hundred_thousand_population_data, "#4979F5", "旭川市"),
+        ]
+        for per_hundred_thousand_population_data, color, label in series:
+            per_hundred_thousand_population_x = [row[0] for row in per_hundred_thousand_population_data]
+            per_hundred_thousand_population_y = [row[1] for row in per_hundred_thousand_population_data]
+            artists.extend(
+                ax.plot(
+                    per_hundred_thousand_population_x,
+                    per_hundred_thousand_population_y,
+                    color=color,
+                    label=label,
+                )
+            )
+
+        artists.append(ax.legend(prop=resources["legend_font"], loc="upper left"))
+        return artists
 
 
 class WeeklyPerAgeGraphView(GraphView):
@@ -310,59 +484,22 @@ class WeeklyPerAgeGraphView(GraphView):
         patients_numbers = WeeklyPerAgeView(today, pool)
         self._patients_numbers = patients_numbers
 
-    def get_graph_image(self, figsize: Optional[tuple[float, float]] = None) -> BytesIO:
-        """グラフの画像を生成
+    def _setup_axes(self, ax: Axes) -> dict:
+        ax.tick_params(labelsize=4)
+        ax.tick_params(axis="x", rotation=90)
+        ax.yaxis.set_major_formatter(PercentFormatter(1.0))
+        return {"legend_font": FontProperties(fname=FONT_FILE, size=10)}
 
-        Args:
-            figsize (tuple): グラフ画像データの縦横サイズを要素に持つタプル
+    def _get_graph_data(self) -> tuple:
+        return (self._patients_numbers.weekly_per_age_data,)
 
-        Returns:
-            graph_image (BytesIO): グラフの画像データ
-
-        """
+    def _draw_data(self, ax: Axes, resources: dict) -> list:
         df = self._patients_numbers.weekly_per_age_data.transpose()
         df = df / df.sum()
-        font_file = "./ash_unofficial_covid19/static/fonts/NotoSansJP-Regular.otf"
-        legend_font = FontProperties(fname=font_file, size=10)
-        if figsize:
-            fig = plt.figure(figsize=figsize)
-        else:
-            fig = plt.figure()
-        ax = fig.add_subplot()
-        colors = [
-            "#0946F1",
-            "#4979F5",
-            "#7096F8",
-            "#9DB7F9",
-            "#FF5838",
-            "#FFA28B",
-            "#FFE7E6",
-            "#F1F1F4",
-            "#D8D8DB",
-            "#949497",
-            "#626264",
-        ]
         cols = list(map(lambda x: x.strftime("%m-%d"), df.columns.tolist()))
-        for i in range(len(df)):
-            ax.bar(
-                cols,
-                df.iloc[i],
-                bottom=df.iloc[:i].sum(),
-                color=colors[i],
-            )
-
-        ax.tick_params(labelsize=4)
-        ax.tick_params(axis="x", rotation=90)
-        ax.yaxis.set_major_formatter(PercentFormatter(1.0))
-        ax.legend(df.index.tolist(), prop=legend_font, loc=4)
-        fig.tight_layout()
-        canvas = FigureCanvasAgg(fig)
-        png_data = BytesIO()
-        canvas.print_png(png_data)
-        plt.cla()
-        plt.clf()
-        plt.close()
-        return self._png_to_webp(png_data)
+        artists = self._draw_stacked_bars(ax, df, cols)
+        artists.append(ax.legend(artists, df.index.tolist(), prop=resources["legend_font"], loc=4))
+        return artists
 
 
 class MonthlyPerAgeGraphView(GraphView):
@@ -378,55 +515,93 @@ class MonthlyPerAgeGraphView(GraphView):
         patients_numbers = MonthlyPerAgeView(today, pool)
         self._patients_numbers = patients_numbers
 
-    def get_graph_image(self, figsize: Optional[tuple[float, float]] = None) -> BytesIO:
-        """グラフの画像を生成
+    def _setup_axes(self, ax: Axes) -> dict:
+        ax.tick_params(axis="x", rotation=45)
+        ax.yaxis.set_major_formatter(PercentFormatter(1.0))
+        return {"legend_font": FontProperties(fname=FONT_FILE, size=12)}
+
+    def _get_graph_data(self) -> tuple:
+        return (self._patients_numbers.monthly_per_age_data,)
+
+    def _draw_data(self, ax: Axes, resources: dict) -> list:
+        df = self._patients_numbers.monthly_per_age_data.transpose()
+        df = df / df.sum()
+        cols = list(map(lambda x: x.strftime("%y-%m"), df.columns.tolist()))
+        artists = self._draw_stacked_bars(ax, df, cols)
+        artists.append(ax.legend(artists, df.index.tolist(), prop=resources["legend_font"], loc="lower left"))
+        return artists
+
+
+class GraphManifest:
+    """グラフ画像ごとに、作成したときの入力データのハッシュ値を記録するマニフェスト
 
+    グラフ画像と同じディレクトリにJSONファイルとして保存し、入力データが変わっていない
+    グラフ画像の作成を省略するために使う。
+
+    Attributes:
+        fingerprints (dict): ファイル名をキー、ハッシュ値を値とする辞書
+
+    """
+
+    def __init__(self, manifest_path: Path):
+        """
         Args:
-            figsize (tuple): グラフ画像データの縦横サイズを要素に持つタプル
+            manifest_path (Path): マニフェストファイルのパス
+
+        """
+        self.__manifest_path = manifest_path
+        try:
+            fingerprints = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            fingerprints = dict()
+        self.__fingerprints = fingerprints if isinstance(fingerprints, dict) else dict()
+
+    @property
+    def fingerprints(self) -> dict:
+        return self.__fingerprints
+
+    def is_fresh(self, file_name: str, fingerprint: str) -> bool:
+        """グラフ画像が作成済みで、入力データが変わっていないか判定する
+
+        Args:
+            file_name (str): グラフ画像のファイル名
+            fingerprint (str): 入力データのハッシュ値
 
         Returns:
-            graph_image (BytesIO): グラフの画像データ
+            is_fresh (bool): 作り直す必要がなければTrue
 
         """
-        df = self._patients_numbers.monthly_per_age_data.transpose()
-        df = df / df.sum()
-        font_file = "./ash_unofficial_covid19/static/fonts/NotoSansJP-Regular.otf"
-        legend_font = FontProperties(fname=font_file, size=12)
-        if figsize:
-            fig = plt.figure(figsize=figsize)
-        else:
-            fig = plt.figure()
-        ax = fig.add_subplot()
-        colors = [
-            "#0946F1",
-            "#4979F5",
-            "#7096F8",
-            "#9DB7F9",
-            "#FF5838",
-            "#FFA28B",
-            "#FFE7E6",
-            "#F1F1F4",
-            "#D8D8DB",
-            "#949497",
-            "#626264",
-        ]
-        cols = list(map(lambda x: x.strftime("%y-%m"), df.columns.tolist()))
-        for i in range(len(df)):
-            ax.bar(
-                cols,
-                df.iloc[i],
-                bottom=df.iloc[:i].sum(),
-                color=colors[i],
-            )
+        if self.__fingerprints.get(file_name) != fingerprint:
+            return False
 
-        ax.tick_params(axis="x", rotation=45)
-        ax.yaxis.set_major_formatter(PercentFormatter(1.0))
-        ax.legend(df.index.tolist(), prop=legend_font, loc="lower left")
-        fig.tight_layout()
-        canvas = FigureCanvasAgg(fig)
-        png_data = BytesIO()
-        canvas.print_png(png_data)
-        plt.cla()
-        plt.clf()
-        plt.close()
-        return self._png_to_webp(png_data)
+        return self.__manifest_path.parent.joinpath(file_name).exists()
+
+    def update(self, file_name: str, fingerprint: str) -> None:
+        """グラフ画像を作成したときの入力データのハッシュ値を記録する
+
+        Args:
+            file_name (str): グラフ画像のファイル名
+            fingerprint (str): 入力データのハッシュ値
+
+        """
+        self.__fingerprints[file_name] = fingerprint
+
+    def save(self) -> None:
+        """マニフェストファイルを保存する"""
+        with NamedTemporaryFile(
+            mode="w", encoding="utf-8", dir=self.__manifest_path.parent, suffix=".tmp", delete=False
+        ) as f:
+            json.dump(self.__fingerprints, f, indent=2, sort_keys=True)
+        os.chmod(f.name, 0o644)
+        os.replace(f.name, self.__manifest_path)
+
+
+# グラフ名とグラフを出力するクラスの対応
+GRAPH_VIEWS = {
+    "daily_total": DailyTotalGraphView,
+    "month_total": MonthTotalGraphView,
+    "by_age": ByAgeGraphView,
+    "per_hundred_thousand_population": PerHundredThousandPopulationGraphView,
+    "weekly_per_age": WeeklyPerAgeGraphView,
+    "monthly_per_age": MonthlyPerAgeGraphView,
+}
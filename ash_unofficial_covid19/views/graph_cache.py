@@ -0,0 +1,219 @@
+import hashlib
+import os
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING, Optional
+
+from ..config import Config
+from ..metrics import PipelineMetrics
+from ..services.database import ConnectionPool
+from ..services.patients_number import PatientsNumberService
+from ..services.sapporo_patients_number import SapporoPatientsNumberService
+from ..services.tokyo_patients_number import TokyoPatientsNumberService
+
+if TYPE_CHECKING:
+    from ..views.graph import GraphView
+
+
+class GraphImageCache:
+    """グラフ画像のディスクキャッシュ
+
+    グラフ名、画像の幅と高さと解像度、グラフのデータのバージョンの組み合わせごとに
+    WebP形式の画像を保存する。組み合わせから求めたETagをファイル名とし、
+    保存するファイル数は最近使われたものから一定数までとする。
+    Webアプリとデータ取り込み処理の別プロセスから共有して使うことができる。
+
+    Attributes:
+        cache_dir (Path): キャッシュを保存するディレクトリ
+
+    """
+
+    # グラフのデータのバージョンはプロセス内で共有し、一定時間ごとにデータベースから求め直す
+    __data_version_lock = threading.Lock()
+    __data_version: Optional[tuple] = None
+
+    def __init__(self, cache_dir: str = Config.GRAPH_CACHE_DIR, max_files: int = Config.GRAPH_CACHE_MAX_FILES):
+        """
+        Args:
+            cache_dir (str): キャッシュを保存するディレクトリのパス
+            max_files (int): キャッシュするファイル数の上限
+
+        """
+        self.__cache_dir = Path(cache_dir)
+        self.__max_files = max_files
+        self.__cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def cache_dir(self) -> Path:
+        return self.__cache_dir
+
+    @classmethod
+    def get_data_version(cls, today: date, pool: ConnectionPool) -> str:
+        """グラフのデータのバージョンを返す
+
+        画像のリクエストのたびにデータベースへ問い合わせないよう、
+        同じ基準日のバージョンはプロセス内でConfig.GRAPH_DATA_VERSION_TTL秒間再利用する。
+
+        Args:
+            today (date): グラフを作成する基準日
+            pool (:obj:`ConnectionPool`): SimpleConnectionPoolを要素に持つオブジェクト
+
+        Returns:
+            data_version (str): グラフのデータのバージョン
+
+        """
+        now = time.monotonic()
+        with cls.__data_version_lock:
+            if cls.__data_version is not None and cls.__data_version[0] == today and now < cls.__data_version[1]:
+                return cls.__data_version[2]
+
+        data_version = cls._get_data_version(today, pool)
+        with cls.__data_version_lock:
+            cls.__data_version = (today, now + Config.GRAPH_DATA_VERSION_TTL, data_version)
+        return data_version
+
+    @staticmethod
+    def _get_data_version(today: date, pool: ConnectionPool) -> str:
+        """データベースからグラフのデータのバージョンを求める
+
+        基準日と、旭川市、札幌市、東京都の陽性患者数データの最終更新日時を組み合わせたものとする。
+
+        Args:
+            today (date): グラフを作成する基準日
+            pool (:obj:`ConnectionPool`): SimpleConnectionPoolを要素に持つオブジェクト
+
+        Returns:
+            data_version (str): グラフのデータのバージョン
+
+        """
+        services = (
+            PatientsNumberService(pool),
+            SapporoPatientsNumberService(pool),
+            TokyoPatientsNumberService(pool),
+        )
+        return ",".join([today.isoformat()] + [service.get_last_updated().isoformat() for service in services])
+
+    @staticmethod
+    def get_etag(name: str, width: int, height: int, dpi: int, data_version: str) -> str:
+        """グラフ画像のETagを返す
+
+        同じ組み合わせからは常に同じ画像が作成されるため、強いETagとして使うことができる。
+
+        Args:
+            name (str): グラフ名
+            width (int): 画像の幅（ピクセル）
+            height (int): 画像の高さ（ピクセル）
+            dpi (int): 画像の解像度
+            data_version (str): グラフのデータのバージョン
+
+        Returns:
+            etag (str): ETag
+
+        """
+        key = ",".join([name, str(width), str(height), str(dpi), data_version])
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+    def get(self, etag: str) -> Optional[bytes]:
+        """キャッシュしたグラフ画像を返す
+
+        Args:
+            etag (str): ETag
+
+        Returns:
+            graph_image (bytes): WebP形式のグラフ画像データ
+                キャッシュにない場合はNoneを返す。
+
+        """
+        cache_path = self._get_cache_path(etag)
+        try:
+            graph_image = cache_path.read_bytes()
+            # 最近使われたものを残すため、更新日時を使用日時とする
+            os.utime(cache_path)
+        except FileNotFoundError:
+            return None
+
+        return graph_image
+
+    def render(
+        self, name: str, width: int, height: int, dpi: int, today: date, pool: ConnectionPool, data_version: str
+    ) -> bytes:
+        """グラフ画像を作成してキャッシュに保存する
+
+        Args:
+            name (str): グラフ名
+            width (int): 画像の幅（ピクセル）
+            height (int): 画像の高さ（ピクセル）
+            dpi (int): 画像の解像度
+            today (date): グラフを作成する基準日
+            pool (:obj:`ConnectionPool`): SimpleConnectionPoolを要素に持つオブジェクト
+            data_version (str): グラフのデータのバージョン
+
+        Returns:
+            graph_image (bytes): WebP形式のグラフ画像データ
+
+        """
+        from ..views.graph import GRAPH_VIEWS
+
+        graph_view = GRAPH_VIEWS[name](today, pool)
+        graph_image = self._render(graph_view, width, height, dpi)
+        self._put(self.get_etag(name, width, height, dpi, data_version), graph_image)
+        return graph_image
+
+    def prewarm(self, today: date, pool: ConnectionPool, sizes: list = Config.GRAPH_PREWARM_SIZES) -> None:
+        """よく使われる画像サイズのグラフ画像をあらかじめキャッシュに保存する
+
+        Args:
+            today (date): グラフを作成する基準日
+            pool (:obj:`ConnectionPool`): SimpleConnectionPoolを要素に持つオブジェクト
+            sizes (list of tuple): 画像の幅、高さ、解像度のタプルのリスト
+
+        """
+        from ..views.graph import GRAPH_VIEWS
+
+        # データの取り込み直後に呼び出すため、再利用せずにデータベースから求める
+        data_version = self._get_data_version(today, pool)
+        for name, graph_view_class in GRAPH_VIEWS.items():
+            etags = [(self.get_etag(name, *size, data_version), size) for size in sizes]
+            etags = [(etag, size) for etag, size in etags if not self._get_cache_path(etag).exists()]
+            if not etags:
+                continue
+
+            with PipelineMetrics.stage("graph_data"):
+                graph_view = graph_view_class(today, pool)
+            with PipelineMetrics.stage("graph_cache"):
+                for etag, size in etags:
+                    self._put(etag, self._render(graph_view, *size))
+
+    @staticmethod
+    def _render(graph_view: "GraphView", width: int, height: int, dpi: int) -> bytes:
+        """指定したピクセル数と解像度でグラフ画像を作成する"""
+        return graph_view.get_graph_image(figsize=(width / dpi, height / dpi), dpi=dpi).getvalue()
+
+    def _get_cache_path(self, etag: str) -> Path:
+        return self.__cache_dir.joinpath(etag + ".webp")
+
+    def _put(self, etag: str, graph_image: bytes) -> None:
+        """グラフ画像をキャッシュに保存し、上限を超えた分を古いものから削除する
+
+        Args:
+            etag (str): ETag
+            graph_image (bytes): WebP形式のグラフ画像データ
+
+        """
+        with NamedTemporaryFile(dir=self.__cache_dir, suffix=".tmp", delete=False) as f:
+            f.write(graph_image)
+        os.replace(f.name, self._get_cache_path(etag))
+
+        cache_files = list()
+        for cache_path in self.__cache_dir.glob("*.webp"):
+            try:
+                cache_files.append((cache_path.stat().st_mtime, cache_path))
+            except FileNotFoundError:
+                continue
+
+        cache_files.sort()
+        for _, cache_path in cache_files[: max(0, len(cache_files) - self.__max_files)]:
+            cache_path.unlink(missing_ok=True)
@@ -1,15 +1,23 @@
+import json
 import re
-from datetime import date
-from decimal import ROUND_HALF_UP, Decimal
+import threading
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Optional
 
 from dateutil.relativedelta import relativedelta
 
+from ..errors import DataModelError, ViewError
+from ..models.patients_number import AGE_COLUMNS, AGE_LABELS, PatientsNumberRangeIndex
+from ..numerics import round_half_up
 from ..services.database import ConnectionPool
 from ..services.patients_number import PatientsNumberService
 from ..services.sapporo_patients_number import SapporoPatientsNumberService
 from ..services.tokyo_patients_number import TokyoPatientsNumberService
 from ..views.view import View
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class PatientsNumberView(View):
     """旭川市新型コロナウイルス感染症陽性患者数データ
@@ -22,6 +30,21 @@ class PatientsNumberView(View):
 
     """
 
+    # グラフ用JSONデータで日付を日数で表す際の起点日
+    GRAPH_EPOCH = date(2020, 1, 1)
+
+    # 系列データの名前とCSVファイルの見出し
+    SERIES_HEADERS = {
+        "reproduction_number": "実効再生産数",
+        "moving_average": "7日間移動平均",
+        "growth_rate": "前週比増加率",
+    }
+
+    # 期間集計の索引はプロセス内で共有し、データの最終更新日時が変わったときに作り直す
+    __range_index_lock = threading.Lock()
+    __range_index: Optional[PatientsNumberRangeIndex] = None
+    __range_index_version: Optional[datetime] = None
+
     def __init__(self, today: date, pool: ConnectionPool):
         """
         Args:
@@ -32,8 +55,15 @@ class PatientsNumberView(View):
         self._service = PatientsNumberService(pool)
         self._today = today
         last_updated = self._service.get_last_updated()
+        self.__last_updated_at = last_updated
         self.__last_updated = last_updated.strftime("%Y年%m月%d日%H時%M分")
 
+    def __getstate__(self) -> dict:
+        """別プロセスへ渡せるよう、データベース接続を持つサービスを除いた状態を返す"""
+        state = self.__dict__.copy()
+        state["_service"] = None
+        return state
+
     @property
     def last_updated(self):
         return self.__last_updated
@@ -86,6 +116,67 @@ class PatientsNumberView(View):
 
         return date_year + "年" + date_month + "月" + date_day + "日" + "（" + day_of_week_kanji + "）"
 
+    @classmethod
+    def to_day_offset(cls, target_date: date) -> int:
+        """日付をグラフ用JSONデータの起点日からの日数に変換
+
+        Args:
+            target_date (date): 対象の日付
+
+        Returns:
+            day_offset (int): 起点日からの日数
+
+        """
+        if isinstance(target_date, datetime):
+            target_date = target_date.date()
+        return (target_date - cls.GRAPH_EPOCH).days
+
+    @classmethod
+    def series_to_graph_dict(cls, rows: list) -> dict:
+        """日付と値の組のリストをグラフ用JSONデータの辞書に変換
+
+        Args:
+            rows (list of list): 日付と値の組のリスト
+
+        Returns:
+            graph_dict (dict): 起点日からの日数のリストxと値のリストyの辞書
+
+        """
+        return {"x": [cls.to_day_offset(row[0]) for row in rows], "y": [row[1] for row in rows]}
+
+    @classmethod
+    def dataframe_to_graph_dict(cls, df: "pd.DataFrame") -> dict:
+        """行を期間、列を年代とするDataFrameをグラフ用JSONデータの辞書に変換
+
+        Args:
+            df (:obj:`pd.DataFrame`): 期間ごとの年代別新規陽性患者数
+
+        Returns:
+            graph_dict (dict): 期間の起点日からの日数のリストx、年代のリストlabels、
+                年代ごとの患者数のリストvaluesの辞書
+
+        """
+        return {
+            "x": [cls.to_day_offset(index) for index in df.index],
+            "labels": df.columns.tolist(),
+            "values": [[int(value) for value in df[column].tolist()] for column in df.columns],
+        }
+
+    @classmethod
+    def graph_dict_to_json(cls, graph_dict: dict) -> str:
+        """グラフ用JSONデータの辞書を、起点日を加えた空白のないJSON文字列に変換
+
+        Args:
+            graph_dict (dict): グラフ用JSONデータの辞書
+
+        Returns:
+            json_data (str): グラフ用JSONデータの文字列
+
+        """
+        json_dict = {"epoch": cls.GRAPH_EPOCH.strftime("%Y-%m-%d")}
+        json_dict.update(graph_dict)
+        return json.dumps(json_dict, ensure_ascii=False, separators=(",", ":"))
+
     def get_daily_total_csv(self) -> str:
         """陽性患者日計CSVファイルの文字列データを返す
 
@@ -142,6 +233,108 @@ class PatientsNumberView(View):
         json_data = self._service.get_dicts(from_date=from_date, to_date=self._today)
         return self.dict_to_json(json_data)
 
+    def get_series(self, name: str) -> list:
+        """日ごとの系列データを返す
+
+        Args:
+            name (str): 系列データの名前
+                reproduction_number、moving_average、growth_rateのいずれか
+
+        Returns:
+            series (list of tuple): 公表日と系列データの値を要素とするタプルのリスト
+
+        """
+        from_date = date(2020, 2, 23)
+        if name == "reproduction_number":
+            return self._service.get_reproduction_number_series(from_date=from_date, to_date=self._today)
+        elif name == "moving_average":
+            return self._service.get_moving_average_series(from_date=from_date, to_date=self._today)
+        elif name == "growth_rate":
+            return self._service.get_growth_rate_series(from_date=from_date, to_date=self._today)
+        else:
+            raise ViewError("系列データの名前が正しくありません。")
+
+    def get_series_csv(self, name: str) -> str:
+        """日ごとの系列データのCSVファイルの文字列データを返す
+
+        Args:
+            name (str): 系列データの名前
+
+        Returns:
+            csv_data (str): 日ごとの系列データのCSVファイルの文字列データ
+
+        """
+        csv_data = [list(row) for row in self.get_series(name)]
+        csv_data.insert(0, ["公表日", self.SERIES_HEADERS[name]])
+        return self.list_to_csv(csv_data)
+
+    def get_series_json(self, name: str) -> str:
+        """日ごとの系列データのJSONファイルの文字列データを返す
+
+        Args:
+            name (str): 系列データの名前
+
+        Returns:
+            json_data (str): 日ごとの系列データのJSONファイルの文字列データ
+
+        """
+        json_data = dict((d.strftime("%Y-%m-%d"), value) for d, value in self.get_series(name))
+        return self.dict_to_json(json_data)
+
+    def get_range_index(self) -> PatientsNumberRangeIndex:
+        """期間集計の索引を返す
+
+        Returns:
+            range_index (:obj:`PatientsNumberRangeIndex`): 年代別の患者数の累積和による期間集計の索引
+
+        """
+        with PatientsNumberView.__range_index_lock:
+            if (
+                PatientsNumberView.__range_index is None
+                or PatientsNumberView.__range_index_version != self.__last_updated_at
+            ):
+                PatientsNumberView.__range_index = self._service.get_range_index()
+                PatientsNumberView.__range_index_version = self.__last_updated_at
+            return PatientsNumberView.__range_index
+
+    def get_range_total_json(
+        self, from_date: Optional[date] = None, to_date: Optional[date] = None, ages: Optional[list] = None
+    ) -> str:
+        """指定した期間の陽性患者数の合計のJSONファイルの文字列データを返す
+
+        Args:
+            from_date (date): 集計の始期
+                省略した場合はデータの最初の日付とする
+            to_date (date): 集計の終期
+                省略した場合は基準日とする
+            ages (list of str): 集計する年代の列名のリスト
+                省略した場合は調査中等を含むすべての年代とする
+
+        Returns:
+            json_data (str): 期間と、陽性患者数の合計、年代別の合計のJSONファイルの文字列データ
+
+        """
+        range_index = self.get_range_index()
+        if to_date is None:
+            to_date = self._today
+        if from_date is None:
+            from_date = range_index.start_date or to_date
+        if to_date < from_date:
+            raise ViewError("集計の終期が始期より前になっています。")
+
+        try:
+            totals_by_age = range_index.get_totals_by_age(from_date, to_date, ages)
+        except DataModelError as e:
+            raise ViewError(e.message)
+
+        json_data = {
+            "from": from_date.strftime("%Y-%m-%d"),
+            "to": to_date.strftime("%Y-%m-%d"),
+            "total": sum(total for _, total in totals_by_age),
+            "by_age": dict(totals_by_age),
+        }
+        return self.dict_to_json(json_data)
+
 
 class DailyTotalView(PatientsNumberView):
     """日別累計患者数グラフ
@@ -204,6 +397,15 @@ class DailyTotalView(PatientsNumberView):
     def daily_total_data(self):
         return self.__daily_total_data
 
+    def get_graph_json(self) -> str:
+        """日別累計患者数グラフのJSONデータを返す
+
+        Returns:
+            json_data (str): グラフ用JSONデータの文字列
+
+        """
+        return self.graph_dict_to_json(self.series_to_graph_dict(self.__daily_total_data))
+
 
 class MonthTotalView(PatientsNumberView):
     """月別累計患者数グラフ
@@ -262,6 +464,15 @@ class MonthTotalView(PatientsNumberView):
     def month_total_data(self):
         return self.__month_total_data
 
+    def get_graph_json(self) -> str:
+        """月別累計患者数グラフのJSONデータを返す
+
+        Returns:
+            json_data (str): グラフ用JSONデータの文字列
+
+        """
+        return self.graph_dict_to_json(self.series_to_graph_dict(self.__month_total_data))
+
 
 class ByAgeView(PatientsNumberView):
     """年代別患者数割合グラフ
@@ -285,7 +496,9 @@ class ByAgeView(PatientsNumberView):
         if from_date < date(2020, 2, 23):
             from_date = date(2020, 2, 23)
         from_date = date(2020, 2, 23)
-        self.__by_age_data = self._service.get_patients_number_by_age(from_date=from_date, to_date=today)
+        # 調査中等は集計しない。
+        totals_by_age = self.get_range_index().get_totals_by_age(from_date, today, AGE_COLUMNS[:-1])
+        self.__by_age_data = [(AGE_LABELS[i], total) for i, (_, total) in enumerate(totals_by_age)]
         self.__graph_alt = ", ".join(["{0} {1}人".format(row[0], row[1]) for row in self.__by_age_data])
 
     @property
@@ -296,6 +509,19 @@ class ByAgeView(PatientsNumberView):
     def by_age_data(self):
         return self.__by_age_data
 
+    def get_graph_json(self) -> str:
+        """年代別患者数割合グラフのJSONデータを返す
+
+        Returns:
+            json_data (str): グラフ用JSONデータの文字列
+
+        """
+        graph_dict = {
+            "labels": [row[0] for row in self.__by_age_data],
+            "values": [row[1] for row in self.__by_age_data],
+        }
+        return self.graph_dict_to_json(graph_dict)
+
 
 class PerHundredThousandPopulationView(PatientsNumberView):
     """1週間の人口10万人あたり患者数グラフ
@@ -351,9 +577,7 @@ class PerHundredThousandPopulationView(PatientsNumberView):
 
         this_week = self.__per_hundred_thousand_population_data[-1][1]
         last_week = self.__per_hundred_thousand_population_data[-2][1]
-        increase_from_last_week = float(
-            Decimal(str(this_week - last_week)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-        )
+        increase_from_last_week = round_half_up(this_week - last_week, 2)
         self.__this_week = "{:,}".format(this_week)
         self.__last_week = "{:,}".format(last_week)
         self.__increase_from_last_week = "{:+,}".format(increase_from_last_week)
@@ -392,6 +616,20 @@ class PerHundredThousandPopulationView(PatientsNumberView):
     def tokyo_per_hundred_thousand_population_data(self):
         return self.__tokyo_per_hundred_thousand_population_data
 
+    def get_graph_json(self) -> str:
+        """1週間の人口10万人あたり患者数グラフのJSONデータを返す
+
+        Returns:
+            json_data (str): グラフ用JSONデータの文字列
+
+        """
+        graph_dict = {
+            "asahikawa": self.series_to_graph_dict(self.__per_hundred_thousand_population_data),
+            "sapporo": self.series_to_graph_dict(self.__sapporo_per_hundred_thousand_population_data),
+            "tokyo": self.series_to_graph_dict(self.__tokyo_per_hundred_thousand_population_data),
+        }
+        return self.graph_dict_to_json(graph_dict)
+
 
 class WeeklyPerAgeView(PatientsNumberView):
     """1週間ごとの年代別新規陽性患者数グラフ
@@ -431,6 +669,15 @@ class WeeklyPerAgeView(PatientsNumberView):
     def weekly_per_age_data(self):
         return self.__weekly_per_age_data
 
+    def get_graph_json(self) -> str:
+        """1週間ごとの年代別新規陽性患者数グラフのJSONデータを返す
+
+        Returns:
+            json_data (str): グラフ用JSONデータの文字列
+
+        """
+        return self.graph_dict_to_json(self.dataframe_to_graph_dict(self.__weekly_per_age_data))
+
     def _get_graph_alt(self) -> str:
         """グラフの代替テキストを生成
 
@@ -487,6 +734,15 @@ class MonthlyPerAgeView(PatientsNumberView):
     def monthly_per_age_data(self):
         return self.__monthly_per_age_data
 
+    def get_graph_json(self) -> str:
+        """1月ごとの年代別新規陽性患者数グラフのJSONデータを返す
+
+        Returns:
+            json_data (str): グラフ用JSONデータの文字列
+
+        """
+        return self.graph_dict_to_json(self.dataframe_to_graph_dict(self.__monthly_per_age_data))
+
     def _get_graph_alt(self) -> str:
         """グラフの代替テキストを生成
 
@@ -0,0 +1,628 @@
+"""サービスとビューのデータベース処理の性能計測
+
+db/schema.sqlを使い捨てのPostgreSQLデータベースへ読み込み、現在の履歴の1倍、10倍、100倍の
+合成データを登録して、サービスとビューの公開メソッドの処理時間のパーセンタイルを計測する。
+合成データは基準日から過去へ履歴を伸ばすことで件数を増やすため、各メソッドが集計する期間の件数は
+倍率によらず同じで、テーブル全体の件数だけが増える。
+
+計測結果はコミット済みのベースライン（benchmarks/baselines/database.json）と比較し、
+p50とp90が許容範囲を超えて遅くなったものがあれば終了コード1で終了する。
+ベースラインにないメソッドは比較しない。
+
+--database-urlで既存のPostgreSQLサーバへの管理用の接続先を指定した場合は、そのサーバに
+使い捨てのデータベースを作成する。指定しない場合はPATHにあるinitdbとpg_ctlで
+一時ディレクトリにPostgreSQLサーバを起動する。データを変更するcreate、upsert、deleteと、
+データベースを使わない書式変換のメソッドは計測の対象外とする。
+
+Usage:
+    python -m benchmarks.database [--scales 1,10,100] [--repeat 20] [--tolerance 0.2]
+    python -m benchmarks.database --scales 1,10,100 --update-baseline
+
+"""
+import argparse
+import csv
+import inspect
+import json
+import math
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import date, datetime, timedelta, timezone
+from io import StringIO
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+from urllib.parse import urlparse, urlunparse
+
+import psycopg2
+
+from ash_unofficial_covid19.config import Config
+from ash_unofficial_covid19.models.point import Point
+from ash_unofficial_covid19.services.database import ConnectionPool
+from ash_unofficial_covid19.services.geocode import GeocodeService
+from ash_unofficial_covid19.services.location import LocationService
+from ash_unofficial_covid19.services.outpatient import OutpatientService
+from ash_unofficial_covid19.services.patient import AsahikawaPatientService, HokkaidoPatientService
+from ash_unofficial_covid19.services.patients_number import PatientsNumberService
+from ash_unofficial_covid19.services.press_release_link import PressReleaseLinkService
+from ash_unofficial_covid19.services.reservation_status import ReservationStatusService
+from ash_unofficial_covid19.services.sapporo_patients_number import SapporoPatientsNumberService
+from ash_unofficial_covid19.services.tokyo_patients_number import TokyoPatientsNumberService
+from ash_unofficial_covid19.views.graph import GRAPH_VIEWS
+from ash_unofficial_covid19.views.outpatient import OutpatientView
+from ash_unofficial_covid19.views.patient import AsahikawaPatientView
+from ash_unofficial_covid19.views.patients_number import (
+    ByAgeView,
+    DailyTotalView,
+    MonthlyPerAgeView,
+    MonthTotalView,
+    PatientsNumberView,
+    PerHundredThousandPopulationView,
+    WeeklyPerAgeView,
+)
+from ash_unofficial_covid19.views.press_release import PressReleaseView
+from ash_unofficial_covid19.views.reservation_status import ReservationStatusView
+from ash_unofficial_covid19.views.xml import AtomView, RssView
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+SCHEMA_PATH = ROOT_DIR / "db" / "schema.sql"
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "database.json"
+
+# 合成データの基準日と、1倍の場合の件数（2023年5月時点の履歴に合わせる）
+REFERENCE_TODAY = date(2023, 5, 8)
+PATIENTS_NUMBERS_DAYS = (REFERENCE_TODAY - date(2020, 2, 23)).days + 1
+ASAHIKAWA_PATIENTS_LAST_DATE = date(2022, 1, 27)
+ASAHIKAWA_PATIENTS_DAYS = (ASAHIKAWA_PATIENTS_LAST_DATE - date(2020, 2, 23)).days + 1
+ASAHIKAWA_PATIENTS = 4000
+OUTPATIENTS = 1600
+RESERVATION_STATUSES = 400
+
+AGES = ["10歳未満", "10代", "20代", "30代", "40代", "50代", "60代", "70代", "80代", "90歳以上", ""]
+AREAS = ["中央", "東旭川", "神楽", "神居", "江丹別", "永山", "東鷹栖", "北星"]
+DIVISIONS = ["1・2回目", "3回目", "4回目"]
+CITIES = ["旭川市", "札幌市", "函館市", "帯広市"]
+UPDATED_AT = datetime(2023, 5, 8, 18, 0, tzinfo=timezone(timedelta(hours=+9)))
+CURRENT_POINT = Point(longitude=142.365976, latitude=43.778422)
+
+# データを変更するメソッドとデータベースを使わない書式変換のメソッドは計測しない
+EXCLUDED_METHODS = {
+    "create",
+    "delete",
+    "upsert",
+    "get_connection",
+    "info_log",
+    "error_log",
+    "get_distance",
+    "list_to_csv",
+    "dict_to_json",
+    "format_date_style",
+    "to_day_offset",
+    "series_to_graph_dict",
+    "dataframe_to_graph_dict",
+    "graph_dict_to_json",
+    # グラフの描画はデータ件数によらないため、benchmarksの他の計測で扱う
+    "get_graph_image",
+    "save_graph_image",
+    "tight_layout",
+}
+
+
+@contextmanager
+def _temporary_server() -> Iterator[str]:
+    """一時ディレクトリにPostgreSQLサーバを起動し、管理用の接続先URLを返す"""
+    initdb = shutil.which("initdb")
+    pg_ctl = shutil.which("pg_ctl")
+    if initdb is None or pg_ctl is None:
+        raise SystemExit("initdbとpg_ctlが見つかりません。--database-urlでPostgreSQLサーバを指定してください。")
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        subprocess.run(
+            [initdb, "-D", data_dir, "-U", "postgres", "--auth=trust", "--encoding=UTF8", "--no-locale"],
+            check=True,
+            capture_output=True,
+        )
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+
+        # 使い捨てのため、データの登録を速くする設定で起動する
+        options = "-c listen_addresses=127.0.0.1 -p {0} -k {1} -c fsync=off -c synchronous_commit=off".format(
+            port, data_dir
+        )
+        log_path = str(Path(data_dir) / "postgresql.log")
+        subprocess.run([pg_ctl, "-D", data_dir, "-o", options, "-l", log_path, "-w", "start"], check=True)
+        try:
+            yield "postgresql://postgres@127.0.0.1:{0}/postgres".format(port)
+        finally:
+            subprocess.run([pg_ctl, "-D", data_dir, "-m", "immediate", "-w", "stop"], capture_output=True)
+
+
+@contextmanager
+def _throwaway_database(admin_url: str, database_name: str) -> Iterator[str]:
+    """使い捨てのデータベースを作成してスキーマを読み込み、接続先URLを返す"""
+    admin_connection = psycopg2.connect(admin_url)
+    admin_connection.autocommit = True
+    try:
+        with admin_connection.cursor() as cur:
+            cur.execute("DROP DATABASE IF EXISTS " + database_name + ";")
+            cur.execute("CREATE DATABASE " + database_name + " ENCODING 'UTF8' TEMPLATE template0;")
+
+        database_url = urlunparse(urlparse(admin_url)._replace(path="/" + database_name))
+        connection = psycopg2.connect(database_url)
+        with connection, connection.cursor() as cur:
+            cur.execute(SCHEMA_PATH.read_text(encoding="utf-8"))
+        connection.close()
+        try:
+            yield database_url
+        finally:
+            with admin_connection.cursor() as cur:
+                cur.execute("DROP DATABASE IF EXISTS " + database_name + ";")
+    finally:
+        admin_connection.close()
+
+
+def _copy(cur, table_name: str, columns: list, rows: Iterable) -> int:
+    """COPYでテーブルへ行をまとめて登録し、登録した行数を返す"""
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    row_count = 0
+    for row in rows:
+        writer.writerow(["\\N" if value is None else value for value in row])
+        row_count += 1
+
+    buffer.seek(0)
+    cur.copy_expert(
+        "COPY " + table_name + " (" + ",".join(columns) + ") FROM STDIN WITH (FORMAT csv, NULL '\\N');", buffer
+    )
+    return row_count
+
+
+def _fill_synthetic_data(database_url: str, scale: int) -> dict:
+    """履歴を倍率分だけ過去へ伸ばした合成データを登録し、テーブルごとの件数を返す"""
+    rng = random.Random(scale)
+    row_counts = dict()
+    connection = psycopg2.connect(database_url)
+    with connection, connection.cursor() as cur:
+        days = PATIENTS_NUMBERS_DAYS * scale
+        dates = [REFERENCE_TODAY - timedelta(days=days - 1 - i) for i in range(days)]
+        age_columns = [
+            "age_under_10",
+            "age_10s",
+            "age_20s",
+            "age_30s",
+            "age_40s",
+            "age_50s",
+            "age_60s",
+            "age_70s",
+            "age_80s",
+            "age_over_90",
+            "investigating",
+        ]
+        row_counts["patients_numbers"] = _copy(
+            cur,
+            "patients_numbers",
+            ["publication_date"] + age_columns + ["updated_at"],
+            ([d] + [rng.randint(0, 40) for _ in age_columns] + [UPDATED_AT] for d in dates),
+        )
+        for table_name, maximum in (("sapporo_patients_numbers", 3000), ("tokyo_patients_numbers", 20000)):
+            row_counts[table_name] = _copy(
+                cur,
+                table_name,
+                ["publication_date", "patients_number", "updated_at"],
+                ((d, rng.randint(0, maximum), UPDATED_AT) for d in dates),
+            )
+        row_counts["press_release_links"] = _copy(
+            cur,
+            "press_release_links",
+            ["url", "publication_date", "updated_at"],
+            ((Config.BASE_URL + "press/" + d.strftime("%Y%m%d") + ".pdf", d, UPDATED_AT) for d in dates),
+        )
+
+        patients = ASAHIKAWA_PATIENTS * scale
+        patient_days = ASAHIKAWA_PATIENTS_DAYS * scale
+        row_counts["asahikawa_patients"] = _copy(
+            cur,
+            "asahikawa_patients",
+            [
+                "patient_number",
+                "city_code",
+                "prefecture",
+                "city_name",
+                "publication_date",
+                "residence",
+                "age",
+                "sex",
+                "occupation",
+                "status",
+                "symptom",
+                "note",
+                "hokkaido_patient_number",
+                "surrounding_status",
+                "close_contact",
+                "updated_at",
+            ],
+            (
+                (
+                    i + 1,
+                    "012041",
+                    "北海道",
+                    "旭川市",
+                    ASAHIKAWA_PATIENTS_LAST_DATE - timedelta(days=patient_days - 1 - (i * patient_days) // patients),
+                    "旭川市",
+                    rng.choice(AGES),
+                    rng.choice(["男性", "女性"]),
+                    "",
+                    "",
+                    "",
+                    "",
+                    100000 + i,
+                    "",
+                    "",
+                    UPDATED_AT,
+                )
+                for i in range(patients)
+            ),
+        )
+
+        outpatient_names = ["合成発熱外来" + str(i).zfill(7) for i in range(OUTPATIENTS * scale)]
+        row_counts["outpatients"] = _copy(
+            cur,
+            "outpatients",
+            [
+                "is_outpatient",
+                "is_positive_patients",
+                "public_health_care_center",
+                "medical_institution_name",
+                "city",
+                "address",
+                "phone_number",
+                "is_target_not_family",
+                "is_pediatrics",
+                "mon",
+                "tue",
+                "wed",
+                "thu",
+                "fri",
+                "sat",
+                "sun",
+                "memo",
+                "updated_at",
+            ],
+            (
+                [rng.random() < 0.9, rng.random() < 0.5, "旭川市", name, rng.choice(CITIES)]
+                + ["旭川市1条通1丁目", "0166-00-0000", rng.random() < 0.5, rng.random() < 0.3]
+                + ["9:00～17:00"] * 5
+                + ["", "", "", UPDATED_AT]
+                for name in outpatient_names
+            ),
+        )
+
+        reservation_names = list()
+        reservation_rows = list()
+        for i in range(RESERVATION_STATUSES * scale):
+            name = "合成接種医療機関" + str(i // len(DIVISIONS)).zfill(7)
+            if i % len(DIVISIONS) == 0:
+                reservation_names.append(name)
+            reservation_rows.append(
+                (rng.choice(AREAS), name, "旭川市1条通1丁目", "0166-00-0000", DIVISIONS[i % len(DIVISIONS)])
+                + ("ファイザー", "受付中", "随時", True, rng.random() < 0.5, rng.random() < 0.5, "", UPDATED_AT)
+            )
+        row_counts["reservation_statuses"] = _copy(
+            cur,
+            "reservation_statuses",
+            [
+                "area",
+                "medical_institution_name",
+                "address",
+                "phone_number",
+                "division",
+                "vaccine",
+                "status",
+                "inoculation_time",
+                "is_target_family",
+                "is_target_not_family",
+                "is_target_suberb",
+                "memo",
+                "updated_at",
+            ],
+            reservation_rows,
+        )
+
+        locations = [
+            (name, CURRENT_POINT.longitude + rng.uniform(-0.1, 0.1), CURRENT_POINT.latitude + rng.uniform(-0.1, 0.1))
+            for name in outpatient_names + reservation_names
+        ]
+        row_counts["locations"] = _copy(
+            cur,
+            "locations",
+            ["medical_institution_name", "longitude", "latitude", "updated_at"],
+            (location + (UPDATED_AT,) for location in locations),
+        )
+        row_counts["geocodes"] = _copy(
+            cur,
+            "geocodes",
+            ["query", "longitude", "latitude", "is_pinned", "updated_at"],
+            (location + (False, UPDATED_AT) for location in locations),
+        )
+        cur.execute("ANALYZE;")
+
+    connection.close()
+    return row_counts
+
+
+def _get_cases(pool: ConnectionPool) -> list:
+    """計測するケース名と関数のタプルのリストを返す"""
+    today = REFERENCE_TODAY
+    from_date = today - timedelta(days=364)
+    patients_to_date = ASAHIKAWA_PATIENTS_LAST_DATE
+    patients_from_date = patients_to_date - timedelta(days=364)
+
+    patient = AsahikawaPatientService(pool)
+    patients_number = PatientsNumberService(pool)
+    sapporo = SapporoPatientsNumberService(pool)
+    tokyo = TokyoPatientsNumberService(pool)
+    press_release_link = PressReleaseLinkService(pool)
+    geocode = GeocodeService(pool)
+    location = LocationService(pool)
+    outpatient = OutpatientService(pool)
+    reservation_status = ReservationStatusService(pool)
+    outpatient_locations = outpatient.find()
+    cases = [
+        ("AsahikawaPatientService.find", lambda: patient.find(page=1)),
+        ("AsahikawaPatientService.find_all", patient.find_all),
+        ("AsahikawaPatientService.get_rows", patient.get_rows),
+        ("AsahikawaPatientService.get_last_updated", patient.get_last_updated),
+        ("AsahikawaPatientService.get_patients_number", lambda: patient.get_patients_number(patients_to_date)),
+        ("AsahikawaPatientService.get_reproduction_number", lambda: patient.get_reproduction_number(patients_to_date)),
+        ("HokkaidoPatientService.get_last_updated", HokkaidoPatientService(pool).get_last_updated),
+        ("PatientsNumberService.find", patients_number.find),
+        ("PatientsNumberService.get_last_updated", patients_number.get_last_updated),
+        ("PressReleaseLinkService.find_all", press_release_link.find_all),
+        ("PressReleaseLinkService.get_latest_publication_date", press_release_link.get_latest_publication_date),
+        ("PressReleaseLinkService.get_last_updated", press_release_link.get_last_updated),
+        ("GeocodeService.find_all", geocode.find_all),
+        ("GeocodeService.get_last_updated", geocode.get_last_updated),
+        ("LocationService.find_all", location.find_all),
+        (
+            "LocationService.get_near_locations",
+            lambda: location.get_near_locations(outpatient_locations, CURRENT_POINT),
+        ),
+        ("LocationService.get_last_updated", location.get_last_updated),
+        ("OutpatientService.find", outpatient.find),
+        ("OutpatientService.get_medical_institution_list", outpatient.get_medical_institution_list),
+        ("OutpatientService.get_last_updated", outpatient.get_last_updated),
+        ("ReservationStatusService.find", reservation_status.find),
+        ("ReservationStatusService.get_area_list", reservation_status.get_area_list),
+        ("ReservationStatusService.get_dicts", reservation_status.get_dicts),
+        ("ReservationStatusService.get_division_list", reservation_status.get_division_list),
+        ("ReservationStatusService.get_medical_institution_list", reservation_status.get_medical_institution_list),
+        ("ReservationStatusService.get_last_updated", reservation_status.get_last_updated),
+    ]
+    # 期間を指定して集計するメソッド
+    for method_name in (
+        "get_aggregate_by_days",
+        "get_aggregate_by_days_per_age",
+        "get_aggregate_by_weeks",
+        "get_aggregate_by_weeks_per_age",
+        "get_patients_number_by_age",
+        "get_per_hundred_thousand_population_per_week",
+        "get_seven_days_moving_average",
+        "get_total_by_months",
+    ):
+        method = getattr(patient, method_name)
+        cases.append(
+            (
+                "AsahikawaPatientService." + method_name,
+                lambda method=method: method(patients_from_date, patients_to_date),
+            )
+        )
+    for service, method_names in (
+        (
+            patients_number,
+            (
+                "get_aggregate_by_days",
+                "get_aggregate_by_months_per_age",
+                "get_aggregate_by_weeks",
+                "get_aggregate_by_weeks_per_age",
+                "get_dicts",
+                "get_lists",
+                "get_per_hundred_thousand_population_per_week",
+                "get_total_by_months",
+            ),
+        ),
+        (sapporo, ("get_aggregate_by_weeks", "get_per_hundred_thousand_population_per_week")),
+        (tokyo, ("get_aggregate_by_weeks", "get_per_hundred_thousand_population_per_week")),
+    ):
+        for method_name in method_names:
+            method = getattr(service, method_name)
+            cases.append((type(service).__name__ + "." + method_name, lambda method=method: method(from_date, today)))
+    for service in (sapporo, tokyo):
+        for method_name in ("find_all", "get_last_update_date", "get_last_updated"):
+            cases.append((type(service).__name__ + "." + method_name, getattr(service, method_name)))
+
+    # ビューは作成時にデータベースからデータを取得するため、作成処理も計測する
+    view_classes = [
+        PatientsNumberView,
+        DailyTotalView,
+        MonthTotalView,
+        ByAgeView,
+        PerHundredThousandPopulationView,
+        WeeklyPerAgeView,
+        MonthlyPerAgeView,
+        AtomView,
+        RssView,
+    ] + list(GRAPH_VIEWS.values())
+    for view_class in view_classes:
+        cases.append((view_class.__name__ + ".__init__", lambda view_class=view_class: view_class(today, pool)))
+    for view_class in (AsahikawaPatientView, OutpatientView, ReservationStatusView, PressReleaseView):
+        cases.append((view_class.__name__ + ".__init__", lambda view_class=view_class: view_class(pool)))
+
+    patients_number_view = PatientsNumberView(today, pool)
+    for method_name in (
+        "get_daily_total_csv",
+        "get_daily_total_json",
+        "get_daily_total_per_age_csv",
+        "get_daily_total_per_age_json",
+    ):
+        cases.append(("PatientsNumberView." + method_name, getattr(patients_number_view, method_name)))
+    for view_class in (
+        DailyTotalView,
+        MonthTotalView,
+        ByAgeView,
+        PerHundredThousandPopulationView,
+        WeeklyPerAgeView,
+        MonthlyPerAgeView,
+    ):
+        cases.append((view_class.__name__ + ".get_graph_json", view_class(today, pool).get_graph_json))
+    for name, graph_view_class in GRAPH_VIEWS.items():
+        cases.append((graph_view_class.__name__ + ".get_fingerprint", graph_view_class(today, pool).get_fingerprint))
+
+    patient_view = AsahikawaPatientView(pool)
+    outpatient_view = OutpatientView(pool)
+    reservation_status_view = ReservationStatusView(pool)
+    cases += [
+        ("AsahikawaPatientView.find", lambda: patient_view.find(page=1)),
+        ("AsahikawaPatientView.get_csv", patient_view.get_csv),
+        ("AsahikawaPatientView.get_today", patient_view.get_today),
+        ("OutpatientView.find", outpatient_view.find),
+        ("OutpatientView.get_last_updated", outpatient_view.get_last_updated),
+        ("OutpatientView.get_medical_institution_list", outpatient_view.get_medical_institution_list),
+        (
+            "OutpatientView.search_by_gps",
+            lambda: outpatient_view.search_by_gps(CURRENT_POINT.longitude, CURRENT_POINT.latitude),
+        ),
+        ("ReservationStatusView.find", reservation_status_view.find),
+        ("ReservationStatusView.get_area_list", reservation_status_view.get_area_list),
+        ("ReservationStatusView.get_division_list", reservation_status_view.get_division_list),
+        ("ReservationStatusView.get_last_updated", reservation_status_view.get_last_updated),
+        ("ReservationStatusView.get_medical_institution_list", reservation_status_view.get_medical_institution_list),
+        ("ReservationStatusView.get_reservation_status_json", reservation_status_view.get_reservation_status_json),
+        (
+            "ReservationStatusView.search_by_gps",
+            lambda: reservation_status_view.search_by_gps(
+                CURRENT_POINT.longitude, CURRENT_POINT.latitude, DIVISIONS[0]
+            ),
+        ),
+    ]
+    for view_class in (AtomView, RssView):
+        xml_view = view_class(today, pool)
+        for method_name in ("get_feed", "get_last_modified_header", "get_outpatient_medical_institution_feed_list"):
+            cases.append((view_class.__name__ + "." + method_name, getattr(xml_view, method_name)))
+
+    return cases
+
+
+def _get_uncovered_methods(case_names: set) -> list:
+    """計測の対象にも対象外にもなっていないサービスとビューの公開メソッドを返す"""
+    uncovered = list()
+    classes = [PressReleaseLinkService, GeocodeService, LocationService, OutpatientService, ReservationStatusService]
+    classes += [AsahikawaPatientService, HokkaidoPatientService, PatientsNumberService]
+    classes += [SapporoPatientsNumberService, TokyoPatientsNumberService, PatientsNumberView, DailyTotalView]
+    classes += [MonthTotalView, ByAgeView, PerHundredThousandPopulationView, WeeklyPerAgeView, MonthlyPerAgeView]
+    classes += [AsahikawaPatientView, OutpatientView, ReservationStatusView, PressReleaseView, AtomView, RssView]
+    classes += list(GRAPH_VIEWS.values())
+    for cls in classes:
+        for name, member in inspect.getmembers(cls):
+            if name.startswith("_") or name in EXCLUDED_METHODS or not callable(member):
+                continue
+            if cls.__name__ + "." + name not in case_names:
+                uncovered.append(cls.__name__ + "." + name)
+    return uncovered
+
+
+def _get_percentile(sorted_values: list, percentile: float) -> float:
+    """昇順に並べた値のパーセンタイル（nearest-rank法）を返す"""
+    return sorted_values[max(0, math.ceil(percentile / 100 * len(sorted_values)) - 1)]
+
+
+def measure(func: Callable, repeat: int) -> dict:
+    """関数を1回実行して暖機した後、指定回数実行した処理時間のパーセンタイル（ミリ秒）を返す"""
+    func()
+    elapsed_times = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed_times.append((time.perf_counter() - start) * 1000)
+    elapsed_times.sort()
+    return {key: round(_get_percentile(elapsed_times, p), 3) for key, p in (("p50", 50), ("p90", 90), ("p99", 99))}
+
+
+def _is_regression(result: dict, baseline: dict, tolerance: float, min_delta: float) -> bool:
+    """p50かp90がベースラインから許容範囲を超えて遅くなったかを返す"""
+    for key in ("p50", "p90"):
+        if (
+            key in baseline
+            and baseline[key] * (1 + tolerance) < result[key]
+            and min_delta < result[key] - baseline[key]
+        ):
+            return True
+    return False
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="使い捨てのデータベースを作成するPostgreSQLサーバへの管理用の接続先")
+    parser.add_argument("--scales", default="1,10,100", help="合成データの倍率のカンマ区切りのリスト")
+    parser.add_argument("--repeat", type=int, default=20, help="1つのメソッドの計測の繰り返し回数")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="ベースラインから遅くなってもよい割合")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="遅くなったとみなす最小の差（ミリ秒）")
+    parser.add_argument("--update-baseline", action="store_true", help="計測結果でベースラインを更新する")
+    args = parser.parse_args()
+
+    baselines = json.loads(BASELINE_PATH.read_text(encoding="utf-8")) if BASELINE_PATH.exists() else dict()
+    results = dict()
+    regressions = list()
+    case_names = set()
+    server = _temporary_server() if args.database_url is None else nullcontext(args.database_url)
+    with server as admin_url:
+        for scale in [int(value) for value in args.scales.split(",")]:
+            with _throwaway_database(admin_url, "ash_benchmark_" + str(scale) + "x") as database_url:
+                row_counts = _fill_synthetic_data(database_url, scale)
+                print("# {0}x: {1}".format(scale, ", ".join(k + "=" + str(v) for k, v in row_counts.items())))
+                Config.DATABASE_URL = database_url
+                pool = ConnectionPool()
+                try:
+                    cases = _get_cases(pool)
+                    case_names.update(case_name for case_name, _ in cases)
+                    scale_results = dict()
+                    scale_baselines = baselines.get(str(scale), dict())
+                    for case_name, func in cases:
+                        result = measure(func, args.repeat)
+                        scale_results[case_name] = result
+                        baseline = scale_baselines.get(case_name)
+                        status = "no baseline"
+                        if baseline:
+                            status = "{0:.2f}x".format(result["p50"] / baseline["p50"] if baseline["p50"] else 1.0)
+                            if _is_regression(result, baseline, args.tolerance, args.min_delta_ms):
+                                status += " REGRESSION"
+                                regressions.append("{0}x {1}".format(scale, case_name))
+                        print(
+                            "{0}x {1}: p50 {2[p50]:.2f}ms, p90 {2[p90]:.2f}ms, p99 {2[p99]:.2f}ms ({3})".format(
+                                scale, case_name, result, status
+                            )
+                        )
+                    results[str(scale)] = scale_results
+                finally:
+                    pool.close_connection()
+
+    for method_name in _get_uncovered_methods(case_names):
+        print("warning: " + method_name + "が計測されていません。", file=sys.stderr)
+
+    if args.update_baseline:
+        baselines.update(results)
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps(baselines, ensure_ascii=False, indent=2, sort_keys=True) + "\n")
+        print("ベースラインを更新しました: " + str(BASELINE_PATH))
+        return
+
+    if regressions:
+        print("遅くなったメソッド: " + ", ".join(regressions), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
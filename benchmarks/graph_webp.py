@@ -0,0 +1,71 @@
+"""グラフ画像のWebP変換処理の速度比較
+
+Aggで描画したグラフをPNG形式を経由してWebP形式に変換する場合と、
+RGBAのバッファから直接WebP形式に変換する場合（GraphView._figure_to_webp）の処理時間を比較する。
+
+Usage:
+    python -m benchmarks.graph_webp [--repeat 5] [--days 365]
+
+"""
+import argparse
+import time
+from datetime import date, timedelta
+from io import BytesIO
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
+
+from ash_unofficial_covid19.config import Config
+from ash_unofficial_covid19.views.graph import GraphView
+
+
+def _get_figure(days: int) -> Figure:
+    """日別の棒グラフを描画したFigureを返す"""
+    fig = Figure(figsize=(9.6, 4.8))
+    ax = fig.add_subplot()
+    day_x = [date(2022, 1, 1) + timedelta(days=i) for i in range(days)]
+    day_y = [(i * 37) % 500 for i in range(days)]
+    ax.bar(day_x, day_y, color="#4979F5")
+    ax.grid(axis="y", color="lightgray")
+    fig.tight_layout()
+    return fig
+
+
+def _png_to_webp(fig: Figure) -> BytesIO:
+    """PNG形式を経由してWebP形式に変換する"""
+    png_data = BytesIO()
+    FigureCanvasAgg(fig).print_png(png_data)
+    webp_data = BytesIO()
+    Image.open(png_data).save(
+        webp_data, format="Webp", quality=Config.GRAPH_WEBP_QUALITY, method=Config.GRAPH_WEBP_METHOD
+    )
+    return webp_data
+
+
+def _measure(func, repeat: int) -> float:
+    """関数を指定回数実行して1回あたりの最短処理時間（秒）を返す"""
+    elapsed_times = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed_times.append(time.perf_counter() - start)
+    return min(elapsed_times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="計測の繰り返し回数")
+    parser.add_argument("--days", type=int, default=365, help="グラフに描画する日数")
+    args = parser.parse_args()
+
+    fig = _get_figure(args.days)
+    png_time = _measure(lambda: _png_to_webp(fig), args.repeat)
+    direct_time = _measure(lambda: GraphView._figure_to_webp(fig), args.repeat)
+    print(
+        "PNG経由 {0:.4f}s, RGBAバッファから直接 {1:.4f}s, x{2:.2f} faster".format(png_time, direct_time, png_time / direct_time)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""HTMLスクレイピングの解析処理の速度比較
+
+html.parserで全体のDOMを構築する場合と、lxmlとSoupStrainerで対象の要素だけを
+解析する場合の処理時間を、tests/のHTMLフィクスチャで比較する。
+実際のページを保存したHTMLファイルのパスを引数に指定すると、それも計測対象に加える。
+
+Usage:
+    python -m benchmarks.html_parsing [--repeat 200] [page.html ...]
+
+"""
+import argparse
+import ast
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from ash_unofficial_covid19.scrapers.scraper import Scraper
+
+TESTS_DIR = Path(__file__).resolve().parent.parent / "tests" / "scrapers"
+
+# フィクスチャを定義したテストファイルと各スクレイパーが解析対象とする要素の条件
+FIXTURES = [
+    ("test_patient.py", SoupStrainer("table")),
+    ("test_press_release_link.py", SoupStrainer("a")),
+    ("test_reservation_status.py", SoupStrainer("table", id="tablepress-26-no-2")),
+    ("test_outpatient_link.py", SoupStrainer(["article", "div"])),
+]
+
+
+def _load_fixture(file_name: str) -> bytes:
+    """テストファイルからhtml_contentフィクスチャの文字列を取り出す"""
+    tree = ast.parse((TESTS_DIR / file_name).read_text(encoding="utf-8"))
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef) and node.name == "html_content":
+            for statement in node.body:
+                if isinstance(statement, ast.Return) and isinstance(statement.value, ast.Constant):
+                    return statement.value.value.encode("utf-8")
+    raise ValueError(file_name + "にhtml_contentフィクスチャがありません。")
+
+
+def _measure(func, repeat: int) -> float:
+    """関数を指定回数実行した合計処理時間（秒）を返す"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("html_paths", nargs="*", help="追加で計測するHTMLファイルのパス（全てのa要素を対象とする）")
+    parser.add_argument("--repeat", type=int, default=200, help="計測の繰り返し回数")
+    args = parser.parse_args()
+
+    targets = [(file_name, _load_fixture(file_name), strainer) for file_name, strainer in FIXTURES]
+    for html_path in args.html_paths:
+        targets.append((html_path, Path(html_path).read_bytes(), SoupStrainer("a")))
+
+    for name, html_content, strainer in targets:
+        full_time = _measure(lambda: BeautifulSoup(html_content, "html.parser"), args.repeat)
+        targeted_time = _measure(lambda: Scraper.get_soup(html_content, parse_only=strainer), args.repeat)
+        print(
+            "{0}: html.parser {1:.3f}s, lxml+SoupStrainer {2:.3f}s, x{3:.1f} faster".format(
+                name, full_time, targeted_time, full_time / targeted_time
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Webアプリとデータ取り込み処理の起動時間（モジュールの読み込み時間）の計測
+
+gunicornのワーカーは再起動のたびにroute.pyを読み込み直すため、
+`python -X importtime` でroute.pyと各取り込み処理のモジュールの読み込み時間を計測し、
+上限の時間を超えた場合や、関数内で遅延して読み込むべき重いライブラリが
+モジュールの読み込み時に読み込まれた場合は失敗とする。
+
+numpy、pandas、matplotlib、PILなどHEAVY_MODULESに挙げた重いライブラリは、
+モジュールの先頭では読み込まず、使用する関数の中で読み込む。型注釈だけに使う場合は
+`if TYPE_CHECKING:` の中で読み込み、注釈は文字列で書く。
+
+取り込み処理のモジュールは読み込み時にデータベースへ接続するため、
+データベースに接続できない環境では接続エラーを無視して、それまでの読み込み時間を計測する。
+
+Usage:
+    python -m benchmarks.import_time [--repeat 5] [--budget-scale 1.0]
+
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+
+# 計測対象のモジュールと読み込み時間の上限（ミリ秒）
+BUDGETS = {
+    "ash_unofficial_covid19.route": 500,
+    "ash_unofficial_covid19.import_patients": 500,
+    "ash_unofficial_covid19.import_patients_numbers": 500,
+    "ash_unofficial_covid19.import_outpatients": 500,
+    "ash_unofficial_covid19.import_reservation_statuses": 500,
+}
+
+# モジュールの読み込み時に読み込んではならない重いライブラリ
+HEAVY_MODULES = ["camelot", "cv2", "matplotlib", "numpy", "openpyxl", "pandas", "pdfminer", "PIL", "tabula"]
+
+IMPORT_CODE = """
+import json
+import sys
+
+from ash_unofficial_covid19.errors import DatabaseConnectionError
+
+try:
+    import {module_name}
+except DatabaseConnectionError:
+    pass
+
+loaded_modules = {{name.split(".")[0] for name in sys.modules}}
+print(json.dumps(sorted(loaded_modules & set({heavy_modules!r}))))
+"""
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def _parse_import_time(stderr: str) -> int:
+    """`-X importtime` の出力から、最上位のモジュールの累積読み込み時間の合計（マイクロ秒）を返す"""
+    total = 0
+    for line in stderr.splitlines():
+        matched = IMPORT_TIME_LINE.match(line)
+        if matched and matched.group(3) == " ":
+            total += int(matched.group(2))
+    return total
+
+
+def measure(module_name: str) -> tuple:
+    """新しいPythonプロセスでモジュールを読み込み、読み込み時間と読み込まれた重いライブラリを返す
+
+    Args:
+        module_name (str): 計測するモジュール名
+
+    Returns:
+        result (tuple): 読み込み時間（ミリ秒）と読み込まれた重いライブラリ名のリストのタプル
+
+    """
+    code = IMPORT_CODE.format(module_name=module_name, heavy_modules=HEAVY_MODULES)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    )
+    return _parse_import_time(completed.stderr) / 1000, json.loads(completed.stdout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="計測の繰り返し回数（最小値を採用する）")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="実行環境に合わせて上限の時間に掛ける倍率")
+    args = parser.parse_args()
+
+    failed = False
+    for module_name, budget in BUDGETS.items():
+        results = [measure(module_name) for _ in range(args.repeat)]
+        elapsed = min(result[0] for result in results)
+        heavy_modules = results[0][1]
+        scaled_budget = budget * args.budget_scale
+        is_ok = elapsed <= scaled_budget and not heavy_modules
+        failed = failed or not is_ok
+        print(
+            "{0}: {1:.1f}ms (budget {2:.0f}ms) heavy modules: {3} ... {4}".format(
+                module_name, elapsed, scaled_budget, ", ".join(heavy_modules) or "none", "OK" if is_ok else "NG"
+            )
+        )
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""route.pyの負荷試験
+
+benchmarks.databaseと同じ合成データを登録した使い捨てのデータベースに対し、トップページ、
+発熱外来の一覧と詳細、現在地からの検索のPOST、CSVとJSONのダウンロード、フィードを
+実際のアクセスに近い割合で混ぜたリクエストを、指定した同時接続数で送信する。
+同時接続数ごとにスループットと、ルートごとのレイテンシのp50、p95、p99を出力する。
+
+既定ではFlaskのテストクライアントでアプリをプロセス内で呼び出す。--gunicorn-workersを
+指定した場合は、gunicorn.conf.pyの設定でワーカー数だけを変えたgunicornをunixソケットで起動し、
+ワーカー数ごとに計測するため、gunicorn.conf.pyのworkersを計測結果から決められる。
+--unix-socketを指定した場合は、起動済みのgunicornへ送信し、データベースの準備は行わない。
+アプリに登録されていないルートは計測の対象から除く。
+
+Usage:
+    python -m benchmarks.load_test [--concurrency 1,4,16] [--requests 500]
+    python -m benchmarks.load_test --gunicorn-workers 1,3,5,9 --concurrency 8,32
+    python -m benchmarks.load_test --unix-socket /var/gunicorn/nginx.socket
+
+"""
+import argparse
+import http.client
+import os
+import queue
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+from urllib.parse import quote, urlencode
+
+from werkzeug.exceptions import HTTPException
+
+from ash_unofficial_covid19.config import Config
+from benchmarks.database import (
+    CURRENT_POINT,
+    REFERENCE_TODAY,
+    _fill_synthetic_data,
+    _get_percentile,
+    _temporary_server,
+    _throwaway_database,
+)
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+class Route(NamedTuple):
+    """負荷試験で送信するリクエスト
+
+    Attributes:
+        label (str): 計測結果に表示するルート名
+        method (str): HTTPメソッド
+        path (str): パスとクエリ文字列
+        data (dict): POSTするフォームの値
+        weight (int): リクエスト全体に占める割合の重み
+
+    """
+
+    label: str
+    method: str
+    path: str
+    data: Optional[dict]
+    weight: int
+
+
+# アクセスログのおおよその割合に合わせた重み
+ROUTES = [
+    Route("/", "GET", "/", None, 30),
+    Route("/outpatients", "GET", "/outpatients", None, 15),
+    Route("/outpatient/pediatrics", "GET", "/outpatient/pediatrics", None, 5),
+    Route(
+        "/outpatient/medical_institution/<name>",
+        "GET",
+        "/outpatient/medical_institution/" + quote("合成発熱外来0000001"),
+        None,
+        10,
+    ),
+    Route(
+        "/outpatients/search_by_gps",
+        "POST",
+        "/outpatients/search_by_gps",
+        {
+            "current_latitude": CURRENT_POINT.latitude,
+            "current_longitude": CURRENT_POINT.longitude,
+            "is_pediatrics": 0,
+        },
+        10,
+    ),
+    Route("/012041_asahikawa_covid19_patients.csv", "GET", "/012041_asahikawa_covid19_patients.csv", None, 2),
+    Route("/012041_asahikawa_covid19_daily_total.csv", "GET", "/012041_asahikawa_covid19_daily_total.csv", None, 2),
+    Route("/api/daily_total.json", "GET", "/api/daily_total.json", None, 2),
+    Route("/api/graph/<name>.json", "GET", "/api/graph/daily_total.json", None, 10),
+    Route("/graph/<name>.webp", "GET", "/graph/daily_total.webp", None, 8),
+    Route("/atom.xml", "GET", "/atom.xml", None, 3),
+    Route("/rss.xml", "GET", "/rss.xml", None, 3),
+]
+
+
+def get_registered_routes() -> list:
+    """アプリに登録されているルートだけを返す"""
+    from ash_unofficial_covid19.route import app
+
+    adapter = app.url_map.bind("localhost")
+    registered = list()
+    for route in ROUTES:
+        try:
+            adapter.match(route.path.split("?")[0], method=route.method)
+        except HTTPException:
+            print("warning: " + route.label + "はアプリに登録されていないため計測しません。", file=sys.stderr)
+            continue
+        registered.append(route)
+    return registered
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """unixソケットで接続するHTTPConnection"""
+
+    def __init__(self, socket_path: str, timeout: float = 60.0):
+        super().__init__("localhost", timeout=timeout)
+        self.__socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.__socket_path)
+
+
+class InProcessClient:
+    """Flaskのテストクライアントでリクエストを送信する"""
+
+    def __init__(self):
+        from ash_unofficial_covid19.route import app
+
+        self.__local = threading.local()
+        self.__app = app
+
+    def send(self, route: Route) -> int:
+        if not hasattr(self.__local, "client"):
+            self.__local.client = self.__app.test_client()
+        response = self.__local.client.open(route.path, method=route.method, data=route.data)
+        response.get_data()
+        return response.status_code
+
+
+class UnixSocketClient:
+    """gunicornのunixソケットへリクエストを送信する"""
+
+    def __init__(self, socket_path: str):
+        self.__socket_path = socket_path
+
+    def send(self, route: Route) -> int:
+        # gunicornのsyncワーカーはレスポンスごとに接続を閉じるため、リクエストごとに接続する
+        connection = UnixHTTPConnection(self.__socket_path)
+        try:
+            body = urlencode(route.data) if route.data else None
+            headers = {"Content-Type": "application/x-www-form-urlencoded"} if body else dict()
+            connection.request(route.method, route.path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            return response.status
+        finally:
+            connection.close()
+
+
+def run_load(client, routes: list, concurrency: int, request_count: int, seed: int) -> dict:
+    """重みに従って選んだリクエストを同時接続数のスレッドから送信し、計測結果を返す
+
+    Returns:
+        result (dict): スループット（件/秒）と、ルートごとのレイテンシ（ミリ秒）と失敗件数
+
+    """
+    rng = random.Random(seed)
+    requests = queue.SimpleQueue()
+    for route in rng.choices(routes, weights=[route.weight for route in routes], k=request_count):
+        requests.put(route)
+
+    latencies = {route.label: list() for route in routes}
+    errors = {route.label: 0 for route in routes}
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            try:
+                route = requests.get_nowait()
+            except queue.Empty:
+                return
+            start = time.perf_counter()
+            try:
+                status = client.send(route)
+            except (OSError, http.client.HTTPException):
+                status = 0
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies[route.label].append(elapsed)
+                if not 200 <= status < 400:
+                    errors[route.label] += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    per_route = dict()
+    for label, values in latencies.items():
+        if not values:
+            continue
+        values.sort()
+        per_route[label] = {
+            "count": len(values),
+            "errors": errors[label],
+            "p50": _get_percentile(values, 50),
+            "p95": _get_percentile(values, 95),
+            "p99": _get_percentile(values, 99),
+        }
+    return {"throughput": request_count / elapsed, "routes": per_route}
+
+
+def print_result(title: str, result: dict) -> None:
+    print("## {0}: {1:.1f} req/s".format(title, result["throughput"]))
+    for label, stats in result["routes"].items():
+        line = "  {0}: n={1[count]}, errors={1[errors]}, p50 {1[p50]:.1f}ms, p95 {1[p95]:.1f}ms, p99 {1[p99]:.1f}ms"
+        print(line.format(label, stats))
+
+
+@contextmanager
+def _seeded_database(admin_url: Optional[str], scale: int) -> Iterator[str]:
+    """合成データを登録した使い捨てのデータベースを作成し、接続先URLを返す"""
+    server = _temporary_server() if admin_url is None else nullcontext(admin_url)
+    with server as url:
+        with _throwaway_database(url, "ash_load_test") as database_url:
+            _fill_synthetic_data(database_url, scale)
+            yield database_url
+
+
+@contextmanager
+def _gunicorn(database_url: str, workers: int) -> Iterator[str]:
+    """gunicorn.conf.pyの設定でワーカー数を変えたgunicornを起動し、unixソケットのパスを返す"""
+    gunicorn = shutil.which("gunicorn")
+    if gunicorn is None:
+        raise SystemExit("gunicornが見つかりません。")
+
+    with tempfile.TemporaryDirectory() as socket_dir:
+        socket_path = os.path.join(socket_dir, "gunicorn.socket")
+        env = dict(os.environ, DATABASE_URL=database_url)
+        process = subprocess.Popen(
+            [gunicorn, "-c", "gunicorn.conf.py", "--bind", "unix:" + socket_path, "--workers", str(workers)]
+            + ["ash_unofficial_covid19.run:app"],
+            cwd=ROOT_DIR,
+            env=env,
+        )
+        try:
+            deadline = time.monotonic() + 60
+            while not os.path.exists(socket_path):
+                if process.poll() is not None or deadline < time.monotonic():
+                    raise SystemExit("gunicornを起動できませんでした。")
+                time.sleep(0.1)
+            yield socket_path
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="使い捨てのデータベースを作成するPostgreSQLサーバへの管理用の接続先")
+    parser.add_argument("--scale", type=int, default=1, help="合成データの倍率")
+    parser.add_argument("--concurrency", default="1,4,16", help="同時接続数のカンマ区切りのリスト")
+    parser.add_argument("--requests", type=int, default=500, help="同時接続数ごとに送信するリクエスト数")
+    parser.add_argument("--gunicorn-workers", help="gunicornを起動して計測するワーカー数のカンマ区切りのリスト")
+    parser.add_argument("--unix-socket", help="起動済みのgunicornのunixソケットのパス")
+    parser.add_argument("--seed", type=int, default=0, help="リクエストの順序を決める乱数のシード")
+    args = parser.parse_args()
+
+    concurrency_levels = [int(value) for value in args.concurrency.split(",")]
+    routes = get_registered_routes()
+    if not routes:
+        raise SystemExit("計測できるルートがありません。")
+
+    def measure(client, title: str) -> None:
+        # 初回のリクエストでのグラフ画像のキャッシュ作成などを計測に含めない
+        for route in routes:
+            client.send(route)
+        for concurrency in concurrency_levels:
+            result = run_load(client, routes, concurrency, args.requests, args.seed)
+            print_result("{0}, concurrency={1}".format(title, concurrency), result)
+
+    if args.unix_socket:
+        measure(UnixSocketClient(args.unix_socket), args.unix_socket)
+        return
+
+    with _seeded_database(args.database_url, args.scale) as database_url:
+        print("# reference date: {0}, scale: {1}x".format(REFERENCE_TODAY, args.scale))
+        if args.gunicorn_workers:
+            for workers in [int(value) for value in args.gunicorn_workers.split(",")]:
+                with _gunicorn(database_url, workers) as socket_path:
+                    measure(UnixSocketClient(socket_path), "gunicorn workers={0}".format(workers))
+        else:
+            Config.DATABASE_URL = database_url
+            measure(InProcessClient(), "in-process")
+
+
+if __name__ == "__main__":
+    main()
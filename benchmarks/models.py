@@ -0,0 +1,178 @@
+"""モデルオブジェクトの生成のメモリ使用量と速度の計測
+
+合成した行データから各Factoryでモデルオブジェクトを生成し、1件あたりのメモリ使用量と、
+キーワード引数で1件ずつ生成するcreateと、位置引数でまとめて生成するcreate_manyの
+処理時間を比較する。
+
+Usage:
+    python -m benchmarks.models [--rows 100000] [--repeat 3]
+
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Callable
+
+from ash_unofficial_covid19.models.location import LocationFactory
+from ash_unofficial_covid19.models.outpatient import OutpatientLocationFactory
+from ash_unofficial_covid19.models.patient import AsahikawaPatientFactory, HokkaidoPatientFactory
+from ash_unofficial_covid19.models.patients_number import PatientsNumberFactory
+from ash_unofficial_covid19.models.reservation_status import ReservationStatusLocationFactory
+
+START_DATE = date(2020, 2, 23)
+
+
+def _patient_row(i: int) -> dict:
+    return {
+        "patient_number": i + 1,
+        "city_code": "012041",
+        "prefecture": "北海道",
+        "city_name": "旭川市",
+        "publication_date": START_DATE + timedelta(days=i % 1000),
+        "onset_date": None,
+        "residence": "旭川市",
+        "age": "20代",
+        "sex": "女性",
+        "occupation": "会社員",
+        "status": "軽症",
+        "symptom": "発熱",
+        "overseas_travel_history": False,
+        "be_discharged": None,
+        "note": "",
+    }
+
+
+def _asahikawa_patient_row(i: int) -> dict:
+    row = _patient_row(i)
+    row.update({"hokkaido_patient_number": 100000 + i, "surrounding_status": "", "close_contact": ""})
+    return row
+
+
+def _outpatient_location_row(i: int) -> dict:
+    return {
+        "is_outpatient": True,
+        "is_positive_patients": True,
+        "public_health_care_center": "旭川市",
+        "medical_institution_name": "発熱外来" + str(i),
+        "city": "旭川市",
+        "address": "旭川市1条通1丁目",
+        "phone_number": "0166-00-0000",
+        "is_target_not_family": True,
+        "is_pediatrics": False,
+        "mon": "9:00～17:00",
+        "tue": "9:00～17:00",
+        "wed": "9:00～17:00",
+        "thu": "9:00～17:00",
+        "fri": "9:00～17:00",
+        "sat": "",
+        "sun": "",
+        "is_face_to_face_for_positive_patients": True,
+        "is_online_for_positive_patients": False,
+        "is_home_visitation_for_positive_patients": False,
+        "memo": "",
+        "latitude": 43.77,
+        "longitude": 142.36,
+    }
+
+
+def _reservation_status_location_row(i: int) -> dict:
+    return {
+        "medical_institution_name": "接種医療機関" + str(i),
+        "division": "3回目",
+        "vaccine": "ファイザー",
+        "area": "中央",
+        "address": "旭川市1条通1丁目",
+        "phone_number": "0166-00-0000",
+        "status": "受付中",
+        "inoculation_time": "随時",
+        "is_target_family": True,
+        "is_target_not_family": False,
+        "is_target_suberb": False,
+        "memo": "",
+        "latitude": 43.77,
+        "longitude": 142.36,
+    }
+
+
+def _location_row(i: int) -> dict:
+    return {"latitude": 43.77, "longitude": 142.36, "medical_institution_name": "医療機関" + str(i)}
+
+
+def _patients_number_row(i: int) -> dict:
+    row: dict = {"publication_date": START_DATE + timedelta(days=i)}
+    for key in ("age_under_10", "age_10s", "age_20s", "age_30s", "age_40s", "age_50s", "age_60s", "age_70s"):
+        row[key] = i % 7
+    row.update({"age_80s": 1, "age_over_90": 0, "investigating": 0})
+    return row
+
+
+# 行データの辞書のキーはモデルの引数の順に並べ、create_manyには値のタプルを渡す
+CASES = [
+    (AsahikawaPatientFactory, _asahikawa_patient_row),
+    (HokkaidoPatientFactory, _patient_row),
+    (OutpatientLocationFactory, _outpatient_location_row),
+    (ReservationStatusLocationFactory, _reservation_status_location_row),
+    (LocationFactory, _location_row),
+    (PatientsNumberFactory, _patients_number_row),
+]
+
+
+def measure_memory(factory_class, rows: list) -> float:
+    """createで全件を生成したFactoryが保持するメモリの1件あたりのバイト数を返す"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        factory = factory_class()
+        for row in rows:
+            factory.create(**row)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (after - before) / len(rows)
+
+
+def measure_time(func: Callable, repeat: int) -> float:
+    """関数を指定回数実行した処理時間の最小値（秒）を返す"""
+    elapsed_times = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed_times.append(time.perf_counter() - start)
+    return min(elapsed_times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000, help="生成するモデルオブジェクトの件数")
+    parser.add_argument("--repeat", type=int, default=3, help="処理時間の計測の繰り返し回数")
+    args = parser.parse_args()
+
+    for factory_class, row_function in CASES:
+        rows = [row_function(i) for i in range(args.rows)]
+        values = [tuple(row.values()) for row in rows]
+
+        def create():
+            factory = factory_class()
+            for row in rows:
+                factory.create(**row)
+
+        def create_many():
+            factory_class().create_many(values)
+
+        bytes_per_item = measure_memory(factory_class, rows)
+        create_seconds = measure_time(create, args.repeat)
+        create_many_seconds = measure_time(create_many, args.repeat)
+        print(
+            "{0}: {1:.0f} bytes/item, create {2:.0f} items/s, create_many {3:.0f} items/s ({4:.2f}x)".format(
+                factory_class.__name__,
+                bytes_per_item,
+                args.rows / create_seconds,
+                args.rows / create_many_seconds,
+                create_seconds / create_many_seconds,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""報道発表PDFから年代別陽性患者数を抽出する処理の速度比較
+
+テキストレイヤーから直接抽出する場合と、camelotで表を解析する場合の処理時間を比較する。
+
+Usage:
+    python -m benchmarks.patients_number_pdf path/to/press_release.pdf [...]
+
+"""
+import argparse
+import time
+from datetime import date
+from io import BytesIO
+
+from ash_unofficial_covid19.scrapers.patients_number import ScrapePatientsNumber
+
+
+def _measure(func, repeat: int) -> float:
+    """関数を指定回数実行して1回あたりの最短処理時間（秒）を返す"""
+    elapsed_times = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed_times.append(time.perf_counter() - start)
+    return min(elapsed_times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdf_paths", nargs="+", help="2022年9月27日以降の報道発表PDFファイルのパス")
+    parser.add_argument("--repeat", type=int, default=3, help="計測の繰り返し回数")
+    args = parser.parse_args()
+
+    publication_date = date(2022, 10, 1)
+    scraper = ScrapePatientsNumber.__new__(ScrapePatientsNumber)
+    for pdf_path in args.pdf_paths:
+        with open(pdf_path, "rb") as f:
+            content = f.read()
+
+        text_layer_result = scraper._get_patients_number_from_text(BytesIO(content), publication_date)
+        camelot_result = scraper._get_patients_number(scraper._get_dataframes(pdf_path), publication_date)
+        text_layer_time = _measure(
+            lambda: scraper._get_patients_number_from_text(BytesIO(content), publication_date), args.repeat
+        )
+        camelot_time = _measure(
+            lambda: scraper._get_patients_number(scraper._get_dataframes(pdf_path), publication_date), args.repeat
+        )
+
+        agreed = [text_layer_result] == camelot_result
+        print(
+            "{0}: text layer {1:.3f}s, camelot {2:.3f}s, x{3:.1f} faster, results agree: {4}".format(
+                pdf_path, text_layer_time, camelot_time, camelot_time / text_layer_time, agreed
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -50,6 +50,15 @@ CREATE TABLE locations(
     latitude FLOAT,
     updated_at TIMESTAMPTZ NOT NULL
 );
+DROP TABLE IF EXISTS geocodes;
+CREATE TABLE geocodes(
+    id SERIAL NOT NULL,
+    query VARCHAR(256) NOT NULL PRIMARY KEY,
+    longitude FLOAT,
+    latitude FLOAT,
+    is_pinned BOOLEAN NOT NULL DEFAULT FALSE,
+    updated_at TIMESTAMPTZ NOT NULL
+);
 DROP TABLE IF EXISTS press_release_links;
 CREATE TABLE press_release_links(
     id SERIAL NOT NULL,
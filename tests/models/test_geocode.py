@@ -0,0 +1,37 @@
+import pytest
+
+from ash_unofficial_covid19.errors import DataModelError
+from ash_unofficial_covid19.models.geocode import Geocode, GeocodeFactory
+
+
+def test_create():
+    test_data = {
+        "query": "市立旭川病院",
+        "longitude": 142.365976388889,
+        "latitude": 43.778422777778,
+    }
+    factory = GeocodeFactory()
+    # Geocodeクラスのオブジェクトが生成できるか確認する。
+    geocode = factory.create(**test_data)
+    assert isinstance(geocode, Geocode)
+    assert geocode.is_found
+    assert not geocode.is_pinned
+
+    # 見つからなかった検索結果も生成できるか確認する。
+    geocode = factory.create(query="存在しない病院")
+    assert not geocode.is_found
+    assert len(factory.items) == 2
+
+
+@pytest.mark.parametrize(
+    "test_data",
+    [
+        {"query": "", "longitude": 142.3, "latitude": 43.7},
+        {"query": "市立旭川病院", "longitude": 142.3},
+        {"query": "市立旭川病院", "longitude": "142.3", "latitude": "43.7"},
+    ],
+)
+def test_data_model_error(test_data):
+    factory = GeocodeFactory()
+    with pytest.raises(DataModelError):
+        factory.create(**test_data)
@@ -1,3 +1,6 @@
+import pytest
+
+from ash_unofficial_covid19.errors import DataModelError
 from ash_unofficial_covid19.models.location import Location, LocationFactory
 
 
@@ -11,3 +14,29 @@ def test_create():
     # Locationクラスのオブジェクトが生成できるか確認する。
     location = factory.create(**test_data)
     assert isinstance(location, Location)
+
+
+def test_create_many():
+    factory = LocationFactory()
+    # 緯度、経度、医療機関名の順に並べた値からまとめてオブジェクトを生成できるか確認する。
+    locations = factory.create_many([(43.778422777778, 142.365976388889, "市立旭川病院")])
+    assert factory.items == locations
+    assert locations[0].medical_institution_name == "市立旭川病院"
+    assert locations[0].longitude == 142.365976388889
+
+
+def test_create_many_with_columns():
+    factory = LocationFactory()
+    # 列名の並びが引数の並びと一致する場合はオブジェクトを生成できるか確認する。
+    locations = factory.create_many(
+        [(43.778422777778, 142.365976388889, "市立旭川病院")],
+        columns=["latitude", "longitude", "medical_institution_name"],
+    )
+    assert locations[0].latitude == 43.778422777778
+    # 緯度と経度の列が入れ替わっている場合はエラーになるか確認する。
+    with pytest.raises(DataModelError, match="一致しません"):
+        factory.create_many(
+            [(142.365976388889, 43.778422777778, "市立旭川病院")],
+            columns=["longitude", "latitude", "medical_institution_name"],
+        )
+    assert len(factory.items) == 1
@@ -38,6 +38,39 @@ class TestAsahikawaPatient:
         patient = factory.create(**test_data)
         assert isinstance(patient, AsahikawaPatient)
 
+    def test_create_many(self):
+        rows = [
+            (1120, "012041", "北海道", "旭川市", date(2021, 2, 26), None, "旭川市", "50代", "女性")
+            + ("", "", "", None, None, "", 19050, "調査中", "2人"),
+            (1121, "012041", "北海道", "旭川市", date(2021, 2, 26), None, "旭川市", "20代", "男性")
+            + ("会社員", "", "", None, None, "", 19051, "", ""),
+        ]
+        factory = AsahikawaPatientFactory()
+        # 引数の順に並べた値からまとめてオブジェクトを生成できるか確認する。
+        patients = factory.create_many(rows)
+        assert factory.items == patients
+        assert [patient.patient_number for patient in patients] == [1120, 1121]
+        assert patients[1].occupation == "会社員"
+        assert patients[0].hokkaido_patient_number == 19050
+        assert not hasattr(patients[0], "__dict__")
+
+    def test_create_many_with_columns(self):
+        rows = [
+            (1121, "012041", "北海道", "旭川市", date(2021, 2, 26), None, "旭川市", "20代", "男性")
+            + ("会社員", "", "", None, None, "", 19051, "", ""),
+        ]
+        columns = ["patient_number", "city_code", "prefecture", "city_name", "publication_date", "onset_date"]
+        columns += ["residence", "age", "sex", "occupation", "status", "symptom", "overseas_travel_history"]
+        columns += ["be_discharged", "note", "hokkaido_patient_number", "surrounding_status", "close_contact"]
+        factory = AsahikawaPatientFactory()
+        # 列名の並びが引数の並びと一致する場合はオブジェクトを生成できるか確認する。
+        patients = factory.create_many(rows, columns=columns)
+        assert patients[0].occupation == "会社員"
+        # 別名のない列がある場合はエラーになるか確認する。
+        columns[9] = "coalesce"
+        with pytest.raises(DataModelError):
+            factory.create_many(rows, columns=columns)
+
     @pytest.mark.parametrize(
         "invalid_data,expected",
         [
@@ -1,8 +1,16 @@
-from datetime import date
+from datetime import date, datetime
 
+import numpy as np
 import pytest
 
-from ash_unofficial_covid19.models.patients_number import PatientsNumber, PatientsNumberFactory
+from ash_unofficial_covid19.errors import DataModelError
+from ash_unofficial_covid19.models.patients_number import (
+    PatientsNumber,
+    PatientsNumberArrayFactory,
+    PatientsNumberFactory,
+    PatientsNumberRangeIndex,
+    get_patients_number_dtype,
+)
 
 
 class TestPatientsNumber:
@@ -62,3 +70,118 @@ class TestPatientsNumber:
         factory = PatientsNumberFactory()
         with pytest.raises(TypeError):
             factory.create(**test_data)
+
+
+class TestPatientsNumberArrayFactory:
+    @pytest.fixture()
+    def factory(self):
+        factory = PatientsNumberArrayFactory()
+        factory.create(
+            publication_date=date(2022, 1, 28),
+            age_under_10=12,
+            age_10s=19,
+            age_20s=12,
+            age_30s=14,
+            age_40s=13,
+            age_50s=15,
+            age_60s=3,
+            age_70s=2,
+            age_80s=2,
+            age_over_90=0,
+            investigating=5,
+        )
+        factory.create_many(
+            [
+                (date(2022, 1, 29), 10, 8, 11, 9, 6, 4, 2, 1, 0, 0, None),
+                (date(2022, 1, 30), 7, 9, 12, 8, 7, 3, 1, 2, 1, 1, 0),
+            ]
+        )
+        return factory
+
+    def test_array(self, factory):
+        array = factory.array
+        assert array.dtype == get_patients_number_dtype()
+        assert len(array) == 3
+        assert array["age_10s"].tolist() == [19, 8, 9]
+        # 患者数のNoneは0とする
+        assert array["investigating"][1] == 0
+
+    def test_items(self, factory):
+        items = factory.items
+        assert len(items) == 3
+        assert isinstance(items[0], PatientsNumber)
+        assert items[2].publication_date == date(2022, 1, 30)
+        assert items[2].age_20s == 12
+        assert [item.publication_date for item in items[1:]] == [date(2022, 1, 29), date(2022, 1, 30)]
+
+    def test_validate(self, factory):
+        factory.validate(totals=[97, 51, 51])
+        with pytest.raises(DataModelError, match="2022-01-29"):
+            factory.validate(totals=[97, 50, 51])
+
+        factory.create_many([(date(2022, 1, 30), 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)])
+        with pytest.raises(DataModelError, match="重複"):
+            factory.validate()
+
+    def test_validate_negative(self):
+        factory = PatientsNumberArrayFactory()
+        factory.create_many([(date(2022, 1, 28), 1, -1, 0, 0, 0, 0, 0, 0, 0, 0, 0)])
+        with pytest.raises(DataModelError, match="負の値"):
+            factory.validate()
+
+    def test_create_many_with_invalid_args(self):
+        factory = PatientsNumberArrayFactory()
+        with pytest.raises(DataModelError):
+            factory.create_many([("2022-01-28", 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)])
+
+    def test_to_dataframe(self, factory):
+        df = factory.to_dataframe()
+        assert df.columns.tolist()[0] == "10歳未満"
+        assert df.index.tolist()[0] == date(2022, 1, 28)
+        assert df.at[date(2022, 1, 30), "90歳以上"] == 1
+        # 年代別の患者数は構造化配列のint32ではなくint64で返す
+        assert df.dtypes.tolist() == [np.dtype("int64")] * len(df.columns)
+
+    def test_to_data_lists(self, factory):
+        updated_at = datetime(2022, 1, 31, 18, 0)
+        data_lists = factory.to_data_lists(updated_at)
+        assert data_lists[0] == [date(2022, 1, 28), 12, 19, 12, 14, 13, 15, 3, 2, 2, 0, 5, updated_at]
+        assert all(isinstance(value, int) for value in data_lists[0][1:12])
+
+
+class TestPatientsNumberRangeIndex:
+    @pytest.fixture()
+    def range_index(self):
+        factory = PatientsNumberArrayFactory()
+        factory.create_many(
+            [
+                (date(2022, 1, 28), 12, 19, 12, 14, 13, 15, 3, 2, 2, 0, 5),
+                (date(2022, 1, 30), 7, 9, 12, 8, 7, 3, 1, 2, 1, 1, 0),
+                (date(2022, 1, 31), 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1),
+            ]
+        )
+        return PatientsNumberRangeIndex(factory)
+
+    def test_dates(self, range_index):
+        assert range_index.start_date == date(2022, 1, 28)
+        assert range_index.end_date == date(2022, 1, 31)
+
+    def test_get_total(self, range_index):
+        assert range_index.get_total(date(2022, 1, 28), date(2022, 1, 31)) == 97 + 51 + 11
+        assert range_index.get_total(date(2022, 1, 29), date(2022, 1, 30)) == 51
+        assert range_index.get_total(date(2022, 1, 1), date(2022, 12, 31), ["age_over_90"]) == 2
+        assert range_index.get_total(date(2022, 2, 1), date(2022, 2, 28)) == 0
+        assert range_index.get_total(date(2022, 1, 31), date(2022, 1, 28)) == 0
+
+    def test_get_totals_by_age(self, range_index):
+        result = range_index.get_totals_by_age(date(2022, 1, 30), date(2022, 1, 31), ["age_10s", "investigating"])
+        assert result == [("age_10s", 10), ("investigating", 1)]
+        with pytest.raises(DataModelError):
+            range_index.get_totals_by_age(date(2022, 1, 30), date(2022, 1, 31), ["age_100s"])
+        with pytest.raises(DataModelError):
+            range_index.get_total("2022-01-30", date(2022, 1, 31))
+
+    def test_empty(self):
+        range_index = PatientsNumberRangeIndex(PatientsNumberArrayFactory())
+        assert range_index.start_date is None
+        assert range_index.get_total(date(2022, 1, 1), date(2022, 12, 31)) == 0
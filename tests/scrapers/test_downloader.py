@@ -5,12 +5,14 @@ import requests
 from requests import HTTPError, Timeout
 
 from ash_unofficial_covid19.errors import HTTPDownloadError
+from ash_unofficial_covid19.metrics import PipelineMetrics
 from ash_unofficial_covid19.scrapers.downloader import (
     DownloadedCSV,
     DownloadedExcel,
     DownloadedHTML,
     DownloadedJSON,
     DownloadedPDF,
+    StreamedCSV,
 )
 
 
@@ -133,6 +135,21 @@ class TestDownloadedHTML:
         html_file = DownloadedHTML("http://dummy.local")
         assert html_file.content == html_content
 
+    def test_metrics(self, html_content, tmp_path, mocker):
+        responce_mock = mocker.Mock()
+        responce_mock.status_code = 200
+        responce_mock.content = html_content.encode("utf-8")
+        mocker.patch.object(requests, "get", return_value=responce_mock)
+        metrics = PipelineMetrics("import_test", metrics_dir=str(tmp_path))
+        with metrics.run():
+            with PipelineMetrics.stage("parse"):
+                DownloadedHTML("http://dummy.local")
+
+        # ダウンロードしたバイト数は呼び出し元のparseではなくdownloadの段階に計上する
+        stages = {stats.name: stats for stats in metrics.stages}
+        assert stages["download"].bytes_downloaded == len(html_content.encode("utf-8"))
+        assert stages["parse"].bytes_downloaded == 0
+
     def test_not_found_error(self, mocker):
         responce_mock = mocker.Mock()
         responce_mock.status_code = 404
@@ -195,6 +212,54 @@ No,全国地方公共団体コード,都道府県名,市区町村名,公表_年
             DownloadedCSV("http://dummy.local")
 
 
+class TestStreamedCSV:
+    @pytest.fixture()
+    def csv_content(self):
+        csv_content = """No,患者_居住地,備考
+1,中国武漢市,海外渡航先：中国武漢
+2,石狩振興局管内,
+3,石狩振興局管内,"""
+        return csv_content.encode("cp932")
+
+    def test_content(self, csv_content, mocker):
+        responce_mock = mocker.Mock()
+        responce_mock.status_code = 200
+        # マルチバイト文字の途中で区切られたチャンクも正しく変換できること
+        responce_mock.iter_content.return_value = (csv_content[i : i + 5] for i in range(0, len(csv_content), 5))
+        mocker.patch.object(requests, "get", return_value=responce_mock)
+        csv_file = StreamedCSV(url="http://dummy.local", encoding="cp932")
+        assert list(csv_file.content) == [
+            "No,患者_居住地,備考\n",
+            "1,中国武漢市,海外渡航先：中国武漢\n",
+            "2,石狩振興局管内,\n",
+            "3,石狩振興局管内,",
+        ]
+        responce_mock.close.assert_called_once()
+
+    def test_metrics(self, csv_content, tmp_path, mocker):
+        responce_mock = mocker.Mock()
+        responce_mock.status_code = 200
+        responce_mock.iter_content.return_value = (csv_content[i : i + 5] for i in range(0, len(csv_content), 5))
+        mocker.patch.object(requests, "get", return_value=responce_mock)
+        metrics = PipelineMetrics("import_test", metrics_dir=str(tmp_path))
+        with metrics.run():
+            csv_file = StreamedCSV(url="http://dummy.local", encoding="cp932")
+            # 解析しながらダウンロードしても、チャンクの受信はdownloadの段階に計上する
+            with PipelineMetrics.stage("parse"):
+                list(csv_file.content)
+
+        stages = {stats.name: stats for stats in metrics.stages}
+        assert stages["download"].bytes_downloaded == len(csv_content)
+        assert stages["parse"].bytes_downloaded == 0
+
+    def test_not_found_error(self, mocker):
+        responce_mock = mocker.Mock()
+        responce_mock.status_code = 404
+        mocker.patch.object(requests, "get", return_value=responce_mock)
+        with pytest.raises(HTTPDownloadError, match="cannot get CSV contents."):
+            StreamedCSV("http://dummy.local")
+
+
 class TestDownloadedPDF:
     def test_not_found_error(self, mocker):
         responce_mock = mocker.Mock()
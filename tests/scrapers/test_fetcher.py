@@ -0,0 +1,107 @@
+import threading
+import time
+
+import pytest
+
+from ash_unofficial_covid19.errors import HTTPDownloadError
+from ash_unofficial_covid19.scrapers.fetcher import ConcurrentFetcher
+
+
+class TestConcurrentFetcher:
+    def test_fetch(self):
+        lock = threading.Lock()
+        running = {"a.local": 0, "b.local": 0}
+        max_running = {"a.local": 0, "b.local": 0}
+
+        def download(url, host):
+            with lock:
+                running[host] += 1
+                max_running[host] = max(max_running[host], running[host])
+            time.sleep(0.05)
+            with lock:
+                running[host] -= 1
+            if url.endswith("/error"):
+                raise HTTPDownloadError("error")
+            return url
+
+        tasks = list()
+        for i in range(6):
+            url = "http://a.local/" + str(i)
+            tasks.append((url, download, {"url": url, "host": "a.local"}, i))
+        for i in range(2):
+            url = "http://b.local/" + str(i)
+            tasks.append((url, download, {"url": url, "host": "b.local"}, i))
+        tasks.append(("http://b.local/error", download, {"url": "http://b.local/error", "host": "b.local"}, 9))
+
+        fetcher = ConcurrentFetcher(max_workers=8, max_per_host=2)
+        results = list()
+        errors = list()
+        for task, future in fetcher.fetch(tasks):
+            try:
+                results.append(future.result())
+            except HTTPDownloadError as e:
+                errors.append(e.message)
+                assert task[3] == 9
+
+        assert sorted(results) == sorted([task[0] for task in tasks if task[3] != 9])
+        assert errors == ["error"]
+        assert max_running["a.local"] == 2
+        assert max_running["b.local"] <= 2
+
+    def test_fetch_added_tasks(self):
+        def download(url):
+            return url
+
+        # 結果の処理中に追加したタスクも実行する
+        tasks = [("http://a.local/page", download, {"url": "http://a.local/page"}, "page")]
+        fetcher = ConcurrentFetcher(max_workers=2, max_per_host=1)
+        results = list()
+        for task, future in fetcher.fetch(tasks):
+            results.append(future.result())
+            if task[3] == "page":
+                for i in range(3):
+                    url = "http://b.local/" + str(i) + ".pdf"
+                    tasks.append((url, download, {"url": url}, "pdf"))
+
+        assert sorted(results) == ["http://a.local/page"] + ["http://b.local/" + str(i) + ".pdf" for i in range(3)]
+
+    def test_fetch_generator(self):
+        def download_chunks(url, size):
+            for i in range(size):
+                yield url + "#" + str(i)
+            if url.endswith("/error"):
+                raise HTTPDownloadError("error")
+
+        tasks = [
+            ("http://a.local/stream", download_chunks, {"url": "http://a.local/stream", "size": 5}),
+            ("http://a.local/error", download_chunks, {"url": "http://a.local/error", "size": 1}),
+            ("http://b.local/empty", download_chunks, {"url": "http://b.local/empty", "size": 0}),
+        ]
+        fetcher = ConcurrentFetcher(max_workers=1, max_per_host=1)
+        results = list()
+        errors = list()
+        for task, future in fetcher.fetch(tasks):
+            try:
+                results.append(future.result())
+            except HTTPDownloadError as e:
+                errors.append((task[0], e.message))
+
+        # ジェネレータの要素ごとに結果を返し、ジェネレータの終了自体は結果として返さない
+        assert results == ["http://a.local/stream#" + str(i) for i in range(5)] + ["http://a.local/error#0"]
+        assert errors == [("http://a.local/error", "error")]
+
+    def test_fetch_stop(self):
+        def download_chunks(url):
+            for i in range(100):
+                yield i
+
+        # 途中で結果の取得をやめてもワーカースレッドが終了する
+        tasks = [("http://a.local/stream", download_chunks, {"url": "http://a.local/stream"})]
+        fetcher = ConcurrentFetcher(max_workers=1, max_per_host=1)
+        for task, future in fetcher.fetch(tasks):
+            assert future.result() == 0
+            break
+
+    def test_value_error(self):
+        with pytest.raises(ValueError):
+            ConcurrentFetcher(max_workers=0)
@@ -0,0 +1,112 @@
+import time
+
+import pytest
+
+from ash_unofficial_covid19.errors import HTTPDownloadError
+from ash_unofficial_covid19.scrapers.geocoder import FacilityIndex, Geocoder, TokenBucket
+
+
+class TestTokenBucket:
+    def test_acquire(self):
+        bucket = TokenBucket(rate=20, capacity=1)
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        # 1回目はすぐに、残りの4回は0.05秒ずつ待つ
+        assert 0.18 <= time.monotonic() - start
+
+    def test_value_error(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+@pytest.fixture()
+def facilities():
+    return [
+        {
+            "medical_institution_name": "市立旭川病院",
+            "address": "旭川市金星町1丁目1番65号",
+            "longitude": 142.365952,
+            "latitude": 43.778144,
+        },
+        {
+            "medical_institution_name": "旭川赤十字病院",
+            "address": "旭川市曙1条1丁目1番1号",
+            "longitude": 142.348394,
+            "latitude": 43.769637,
+        },
+        {
+            "medical_institution_name": "JA北海道厚生連旭川厚生病院",
+            "address": "旭川市1条通24丁目111番地3",
+            "longitude": 142.384931,
+            "latitude": 43.758732,
+        },
+    ]
+
+
+class TestFacilityIndex:
+    def test_search(self, facilities):
+        index = FacilityIndex(facilities, threshold=0.8)
+        result = index.search("ＪＡ北海道厚生連 旭川厚生病院")
+        assert result["medical_institution_name"] == "JA北海道厚生連旭川厚生病院"
+        assert result["score"] == 1.0
+
+    def test_search_with_address(self, facilities):
+        index = FacilityIndex(facilities, threshold=0.6)
+        # 表記揺れがあっても所在地が一致すれば照合できる
+        assert index.search("旭川厚生病院") is None
+        result = index.search("旭川厚生病院", "旭川市1条通24丁目111-3")
+        assert result["medical_institution_name"] == "JA北海道厚生連旭川厚生病院"
+
+    def test_search_below_threshold(self, facilities):
+        index = FacilityIndex(facilities, threshold=0.8)
+        assert index.search("旭川医科大学病院") is None
+        assert index.search("") is None
+
+
+class TestGeocoder:
+    @pytest.fixture()
+    def search(self):
+        def search(facility_name):
+            if facility_name == "市立旭川病院":
+                return (142.365976388889, 43.778422777778)
+            if facility_name == "通信エラー病院":
+                raise HTTPDownloadError("cannot connect to web server.")
+            return None
+
+        return search
+
+    def test_geocode(self, search):
+        cache = {
+            "旭川赤十字病院": (142.348303888889, 43.769628888889),
+            "存在しない病院": None,
+        }
+        geocoder = Geocoder(cache, rate=100, max_workers=2, search=search)
+        results = geocoder.geocode(["旭川赤十字病院", "存在しない病院", "市立旭川病院", "新しい病院", "通信エラー病院"])
+        assert results == {
+            "旭川赤十字病院": (142.348303888889, 43.769628888889),
+            "存在しない病院": None,
+            "市立旭川病院": (142.365976388889, 43.778422777778),
+            "新しい病院": None,
+        }
+        # キャッシュにある施設名は検索しない
+        assert geocoder.call_count == 3
+        assert geocoder.lists == [
+            {"query": "市立旭川病院", "longitude": 142.365976388889, "latitude": 43.778422777778},
+            {"query": "新しい病院", "longitude": None, "latitude": None},
+        ]
+
+    def test_geocode_all_cached(self, search):
+        cache = {"旭川赤十字病院": (142.348303888889, 43.769628888889), "存在しない病院": None}
+        geocoder = Geocoder(cache, rate=100, search=search)
+        geocoder.geocode(["旭川赤十字病院", "存在しない病院"])
+        assert geocoder.call_count == 0
+        assert geocoder.lists == []
+
+    def test_geocode_locally(self, search, facilities):
+        geocoder = Geocoder(dict(), rate=100, search=search, facility_index=FacilityIndex(facilities, threshold=0.8))
+        results = geocoder.geocode(["旭川赤十字病院", "新しい病院"], {"旭川赤十字病院": "旭川市曙1条1丁目1-1"})
+        assert results == {"旭川赤十字病院": (142.348394, 43.769637), "新しい病院": None}
+        # 索引で照合できなかった施設名だけをWeb APIで検索する
+        assert geocoder.local_match_count == 1
+        assert geocoder.call_count == 1
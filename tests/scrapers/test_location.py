@@ -84,3 +84,19 @@ class TestScrapeOpendataLocation:
             },
         ]
         assert expect == result
+
+    def test_facilities(self, csv_content, mocker):
+        responce_mock = mocker.Mock()
+        responce_mock.status_code = 200
+        responce_mock.content = csv_content
+        responce_mock.headers = {"content-type": "text/csv"}
+        mocker.patch.object(requests, "get", return_value=responce_mock)
+        location_data = ScrapeOpendataLocation("http://dummy.local")
+        result = location_data.facilities[2]
+        expect = {
+            "medical_institution_name": "JA北海道厚生連旭川厚生病院",
+            "address": "旭川市1条通24丁目111番地3",
+            "longitude": 142.384931,
+            "latitude": 43.758732,
+        }
+        assert expect == result
@@ -1,5 +1,9 @@
+from datetime import time
+from io import BytesIO
+
 import pytest
 import requests
+from openpyxl import Workbook
 
 from ash_unofficial_covid19.scrapers.outpatient import ScrapeOutpatient
 
@@ -278,3 +282,41 @@ class TestScrapeOutpatient:
         expect = ["市立旭川病院", "JA北海道厚生連旭川厚生病院", "旭川赤十字病院"]
         name_lists = scraper.get_medical_institution_list()
         assert name_lists == expect
+
+    def test_get_excel_lists(self, excel_lists, mocker):
+        # 時刻のセルは時刻型、〇以外の数値のセルは数値型で保存し、旭川市以外の行と空行を加える
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.title = "Sheet1"
+        for _ in range(3):
+            sheet.append(["見出し"])
+        for excel_row in excel_lists:
+            cells = list()
+            for value in excel_row:
+                if len(value) == 8 and value[2] == ":":
+                    cells.append(time(int(value[0:2]), int(value[3:5])))
+                elif value == "0":
+                    cells.append(0)
+                else:
+                    cells.append(value)
+            sheet.append(cells)
+            other_city_row = list(cells)
+            other_city_row[2] = "上川"
+            other_city_row[4] = "鷹栖町"
+            sheet.append(other_city_row)
+            sheet.append([])
+        excel_file = BytesIO()
+        workbook.save(excel_file)
+
+        mocker.patch.object(ScrapeOutpatient, "_get_excel_lists", return_value=excel_lists)
+        expect = ScrapeOutpatient(excel_url="http://dummy.local").lists
+        mocker.stopall()
+
+        responce_mock = mocker.Mock()
+        responce_mock.status_code = 200
+        responce_mock.content = excel_file.getvalue()
+        responce_mock.headers = {"content-type": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"}
+        mocker.patch.object(requests, "get", return_value=responce_mock)
+        scraper = ScrapeOutpatient(excel_url="http://dummy.local")
+        assert len(scraper.lists) == 3
+        assert scraper.lists == expect
@@ -1,15 +1,22 @@
+import json
+import os
+import subprocess
 from datetime import date
+from io import BytesIO
 
 import pandas as pd
 import pytest
 import requests
+import tabula
 from numpy import nan
 
 from ash_unofficial_covid19.errors import ScrapeError
 from ash_unofficial_covid19.scrapers.patient import (
     ScrapeAsahikawaPatients,
     ScrapeAsahikawaPatientsPDF,
+    ScrapeAsahikawaPatientsPDFs,
     ScrapeHokkaidoPatients,
+    ScrapeHokkaidoPatientsStream,
 )
 
 
@@ -354,6 +361,29 @@ class TestScrapeHokkaidoPatients:
         assert csv_data.lists == expect
 
 
+class TestScrapeHokkaidoPatientsStream:
+    @pytest.fixture()
+    def csv_content(self):
+        csv_content = """
+    No,全国地方公共団体コード,都道府県名,市区町村名,公表_年月日,発症_年月日,患者_居住地,患者_年代,患者_性別,患者_職業,患者_状態,患者_症状,患者_渡航歴の有無フラグ,患者_再陽性フラグ,患者_退院済フラグ,備考
+    1,10006,北海道,,2020-01-28,2020-01-21,中国武漢市,40代,女性,−,−,発熱,1,0,,海外渡航先：中国武漢
+    2,10006,北海道,,2020-02-14,2020-01-31,石狩振興局管内,50代,男性,自営業,−,発熱;咳;倦怠感,0,0,,
+    3,10006,北海道,,2020-02-19,2020-02-08,石狩振興局管内,40代,男性,会社員,−,倦怠感;筋肉痛;関節痛;発熱;咳,0,0,,
+    """
+        return csv_content.encode("cp932")
+
+    def test_lists(self, csv_content, mocker):
+        responce_mock = mocker.Mock()
+        responce_mock.status_code = 200
+        responce_mock.content = csv_content
+        responce_mock.iter_content.return_value = (csv_content[i : i + 16] for i in range(0, len(csv_content), 16))
+        responce_mock.headers = {"content-type": "text/csv"}
+        mocker.patch.object(requests, "get", return_value=responce_mock)
+        expect = ScrapeHokkaidoPatients("http://dummy.local").lists
+        csv_data = ScrapeHokkaidoPatientsStream("http://dummy.local")
+        assert list(csv_data.lists) == expect
+
+
 class TestScrapeAsahikawaPatientsPDF:
     @pytest.fixture()
     def pdf_dataframe(self):
@@ -408,3 +438,129 @@ class TestScrapeAsahikawaPatientsPDF:
             },
         ]
         assert scraper.lists == expect
+
+
+class TestScrapeAsahikawaPatientsPDFs:
+    @pytest.fixture()
+    def tabula_json(self):
+        header = ["", "市内番号", "道内番号", "国籍", "居住地", "年代", "性別", "職業等", "リンク", "濃厚接触者"]
+        row = ["1", "6", "66", "日本", "旭川市", "40代", "男性", "非公表", "有り", "3人"]
+        return [
+            {"data": []},
+            {"data": [[{"text": text} for text in header], [{"text": text} for text in row]]},
+        ]
+
+    def test_lists(self, tabula_json, mocker):
+        responce_mock = mocker.Mock()
+        responce_mock.status_code = 200
+        responce_mock.content = "".encode("utf-8")
+        responce_mock.headers = {"content-type": "application/pdf"}
+        mocker.patch.object(requests, "get", return_value=responce_mock)
+
+        def convert_into_by_batch(input_dir, **kwargs):
+            # 1件目のPDFファイルだけ変換に成功したものとする
+            pdf_files = sorted(os.listdir(input_dir))
+            assert pdf_files == ["00000.pdf", "00001.pdf"]
+            with open(os.path.join(input_dir, "00000.json"), "w", encoding="utf-8") as f:
+                json.dump(tabula_json, f)
+
+        batch_mock = mocker.patch.object(tabula, "convert_into_by_batch", side_effect=convert_into_by_batch)
+        read_pdf_mock = mocker.patch.object(tabula, "read_pdf")
+        scraper = ScrapeAsahikawaPatientsPDFs(
+            [("http://dummy.local/1.pdf", date(2021, 8, 19)), ("http://dummy.local/2.pdf", date(2021, 8, 20))]
+        )
+        batch_mock.assert_called_once()
+        read_pdf_mock.assert_not_called()
+        expect = [
+            {
+                "patient_number": 6,
+                "city_code": "012041",
+                "prefecture": "北海道",
+                "city_name": "旭川市",
+                "publication_date": date(2021, 8, 19),
+                "onset_date": None,
+                "residence": "旭川市",
+                "age": "40代",
+                "sex": "男性",
+                "occupation": "非公表",
+                "status": None,
+                "symptom": None,
+                "overseas_travel_history": None,
+                "be_discharged": None,
+                "note": "北海道発表No.;66;周囲の患者の発生;有り;濃厚接触者の状況;3人;",
+                "hokkaido_patient_number": 66,
+                "surrounding_status": "有り",
+                "close_contact": "3人",
+            },
+        ]
+        assert scraper.lists == expect
+
+    def test_lists_skip_broken_pdf(self, tabula_json, mocker):
+        responce_mock = mocker.Mock()
+        responce_mock.status_code = 200
+        responce_mock.content = "".encode("utf-8")
+        responce_mock.headers = {"content-type": "application/pdf"}
+        mocker.patch.object(requests, "get", return_value=responce_mock)
+
+        def convert_into_by_batch(input_dir, **kwargs):
+            # 1件目のPDFファイルは変換結果が壊れており、2件目だけ正常に変換できたものとする
+            with open(os.path.join(input_dir, "00000.json"), "w", encoding="utf-8") as f:
+                f.write("[{")
+            with open(os.path.join(input_dir, "00001.json"), "w", encoding="utf-8") as f:
+                json.dump(tabula_json, f)
+
+        mocker.patch.object(tabula, "convert_into_by_batch", side_effect=convert_into_by_batch)
+        scraper = ScrapeAsahikawaPatientsPDFs(
+            [("http://dummy.local/1.pdf", date(2021, 8, 19)), ("http://dummy.local/2.pdf", date(2021, 8, 20))]
+        )
+        assert len(scraper.errors) == 1
+        assert scraper.errors[0].message.startswith("http://dummy.local/1.pdf: ")
+        assert [pdf_url for pdf_url, _ in scraper.pdf_lists] == ["http://dummy.local/2.pdf"]
+        assert [row["patient_number"] for row in scraper.lists] == [6]
+        assert scraper.lists[0]["publication_date"] == date(2021, 8, 20)
+
+    def test_lists_batch_error(self, mocker):
+        responce_mock = mocker.Mock()
+        responce_mock.status_code = 200
+        responce_mock.content = "".encode("utf-8")
+        responce_mock.headers = {"content-type": "application/pdf"}
+        mocker.patch.object(requests, "get", return_value=responce_mock)
+        mocker.patch.object(
+            tabula, "convert_into_by_batch", side_effect=subprocess.CalledProcessError(1, ["java", "-jar"])
+        )
+        scraper = ScrapeAsahikawaPatientsPDFs(
+            [("http://dummy.local/1.pdf", date(2021, 8, 19)), ("http://dummy.local/2.pdf", date(2021, 8, 20))]
+        )
+        assert [e.message.split(": ")[0] for e in scraper.errors] == [
+            "http://dummy.local/1.pdf",
+            "http://dummy.local/2.pdf",
+        ]
+        assert scraper.pdf_lists == []
+        assert scraper.lists == []
+
+    def test_lists_downloaded_pdfs(self, tabula_json, mocker):
+        get_mock = mocker.patch.object(requests, "get")
+
+        def convert_into_by_batch(input_dir, **kwargs):
+            with open(os.path.join(input_dir, "00000.pdf"), "rb") as f:
+                assert f.read() == b"%PDF-1.4"
+            with open(os.path.join(input_dir, "00000.json"), "w", encoding="utf-8") as f:
+                json.dump(tabula_json, f)
+
+        mocker.patch.object(tabula, "convert_into_by_batch", side_effect=convert_into_by_batch)
+        downloaded_pdf = mocker.Mock()
+        downloaded_pdf.content = BytesIO(b"%PDF-1.4")
+        scraper = ScrapeAsahikawaPatientsPDFs(
+            [("http://dummy.local/1.pdf", date(2021, 8, 19))], downloaded_pdfs=[downloaded_pdf]
+        )
+        get_mock.assert_not_called()
+        assert [row["patient_number"] for row in scraper.lists] == [6]
+        assert scraper.lists[0]["publication_date"] == date(2021, 8, 19)
+
+    def test_downloaded_pdfs_error(self):
+        with pytest.raises(TypeError):
+            ScrapeAsahikawaPatientsPDFs([("http://dummy.local/1.pdf", date(2021, 8, 19))], downloaded_pdfs=[])
+
+    def test_publication_date_error(self):
+        with pytest.raises(TypeError):
+            ScrapeAsahikawaPatientsPDFs([("http://dummy.local/1.pdf", "2021-08-19")])
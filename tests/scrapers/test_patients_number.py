@@ -7,6 +7,53 @@ import requests
 from ash_unofficial_covid19.scrapers.patients_number import ScrapePatientsNumber
 
 
+def make_text_pdf(texts: list) -> bytes:
+    """座標を指定してテキストを配置しただけのPDFファイルのデータを作成する
+
+    フォントのToUnicodeで文字コードのAとBを「全」と「体」に対応付けているため、
+    「AB」と書くと「全体」として抽出される。
+
+    Args:
+        texts (list of tuple): x座標、y座標、テキストのタプルのリスト
+
+    Returns:
+        pdf (bytes): PDFファイルのデータ
+
+    """
+    stream = "".join("BT /F1 10 Tf {0} {1} Td ({2}) Tj ET\n".format(x, y, text) for x, y, text in texts).encode()
+    cmap = (
+        b"/CIDInit /ProcSet findresource begin 12 dict begin begincmap\n"
+        + b"/CMapName /Adobe-Identity-UCS def /CMapType 2 def\n"
+        + b"1 begincodespacerange <00> <FF> endcodespacerange\n"
+        + b"2 beginbfchar <41> <5168> <42> <4F53> endbfchar\n"
+        + b"endcmap CMapName currentdict /CMap defineresource pop end end\n"
+    )
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+        + b"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /TestFont /FirstChar 32 /LastChar 126 "
+        + b"/Widths ["
+        + b" 600" * 95
+        + b"] /FontDescriptor 7 0 R /ToUnicode 6 0 R >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"endstream",
+        b"<< /Length %d >>\nstream\n" % len(cmap) + cmap + b"endstream",
+        b"<< /Type /FontDescriptor /FontName /TestFont /Flags 32 /FontBBox [0 -200 600 800] "
+        + b"/ItalicAngle 0 /Ascent 800 /Descent -200 /CapHeight 700 /StemV 80 >>",
+    ]
+    pdf = b"%PDF-1.4\n"
+    offsets = list()
+    for i, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return pdf
+
+
 class TestScrapePatientsNumber:
     @pytest.fixture()
     def pdf_dataframes(self):
@@ -75,3 +122,150 @@ class TestScrapePatientsNumber:
             },
         ]
         assert scraper.lists == expect
+
+    @pytest.fixture()
+    def pdf_dataframes_after_20220927(self):
+        df = pd.DataFrame(
+            [
+                ["", "0～4歳", "5～9歳", "10歳未満", "10代", "20代", "30代", "40代", "50代", "60～64歳", "65歳以上", ""],
+                ["全体", "11", "8", "2", "25", "31", "29", "35", "22", "9", "7\n12\n6\n3", "200"],
+            ]
+        )
+        return [df]
+
+    @pytest.fixture()
+    def pdf_text_rows_after_20220927(self):
+        return [
+            ["年代別陽性者数"],
+            ["0～4歳", "5～9歳", "10歳未満", "10代", "20代", "30代", "40代", "50代", "60～64歳", "65～69歳"],
+            ["全体", "11 8 2 25 31 29 35 22 9 7 12 6 3", "200"],
+        ]
+
+    @pytest.fixture()
+    def pdf_text_rows_invalid_total(self):
+        return [
+            ["全体", "11 8 2 25 31 29 35 22 9 7 12 6 3", "201"],
+        ]
+
+    def _mock_responce(self, mocker):
+        responce_mock = mocker.Mock()
+        responce_mock.status_code = 200
+        responce_mock.content = "".encode("utf-8")
+        responce_mock.headers = {"content-type": "application/pdf"}
+        mocker.patch.object(requests, "get", return_value=responce_mock)
+
+    def test_lists_text_layer_agrees_with_camelot(
+        self, pdf_dataframes_after_20220927, pdf_text_rows_after_20220927, mocker
+    ):
+        self._mock_responce(mocker)
+        mocker.patch.object(ScrapePatientsNumber, "_get_text_rows", return_value=pdf_text_rows_after_20220927)
+        get_dataframes = mocker.patch.object(
+            ScrapePatientsNumber, "_get_dataframes", return_value=pdf_dataframes_after_20220927
+        )
+        text_layer_scraper = ScrapePatientsNumber(pdf_url="http://dummy.local", publication_date=date(2022, 10, 3))
+        get_dataframes.assert_not_called()
+
+        mocker.patch.object(ScrapePatientsNumber, "_get_text_rows", return_value=[])
+        camelot_scraper = ScrapePatientsNumber(pdf_url="http://dummy.local", publication_date=date(2022, 10, 3))
+        get_dataframes.assert_called_once()
+
+        expect = [
+            {
+                "publication_date": date(2022, 10, 3),
+                "age_under_10": 21,
+                "age_10s": 25,
+                "age_20s": 31,
+                "age_30s": 29,
+                "age_40s": 35,
+                "age_50s": 22,
+                "age_60s": 16,
+                "age_70s": 12,
+                "age_80s": 6,
+                "age_over_90": 3,
+                "investigating": 0,
+            },
+        ]
+        assert text_layer_scraper.lists == expect
+        assert camelot_scraper.lists == expect
+
+    def test_lists_fallback_when_total_mismatch(
+        self, pdf_dataframes_after_20220927, pdf_text_rows_invalid_total, mocker
+    ):
+        self._mock_responce(mocker)
+        get_text_rows = mocker.patch.object(
+            ScrapePatientsNumber, "_get_text_rows", return_value=pdf_text_rows_invalid_total
+        )
+        get_dataframes = mocker.patch.object(
+            ScrapePatientsNumber, "_get_dataframes", return_value=pdf_dataframes_after_20220927
+        )
+        scraper = ScrapePatientsNumber(pdf_url="http://dummy.local", publication_date=date(2022, 10, 3))
+        # テキストレイヤーからの抽出を試した後、camelotで解析している
+        get_text_rows.assert_called_once()
+        get_dataframes.assert_called_once()
+        assert scraper.lists[0]["age_under_10"] == 21
+        assert scraper.lists[0]["age_over_90"] == 3
+
+    def test_lists_fallback_when_pdf_syntax_error(self, pdf_dataframes_after_20220927, mocker):
+        self._mock_pdf_responce(mocker, b"%PDF-1.4 broken")
+        get_dataframes = mocker.patch.object(
+            ScrapePatientsNumber, "_get_dataframes", return_value=pdf_dataframes_after_20220927
+        )
+        scraper = ScrapePatientsNumber(pdf_url="http://dummy.local", publication_date=date(2022, 10, 3))
+        get_dataframes.assert_called_once()
+        assert scraper.lists[0]["age_under_10"] == 21
+
+    def test_text_layer_error_is_not_swallowed(self, mocker):
+        # pdfminerの解析エラー以外の例外はcamelotでの解析に回さずにそのまま送出する
+        self._mock_responce(mocker)
+        mocker.patch.object(ScrapePatientsNumber, "_get_text_rows", side_effect=AttributeError("bug"))
+        get_dataframes = mocker.patch.object(ScrapePatientsNumber, "_get_dataframes")
+        with pytest.raises(AttributeError):
+            ScrapePatientsNumber(pdf_url="http://dummy.local", publication_date=date(2022, 10, 3))
+        get_dataframes.assert_not_called()
+
+    def _mock_pdf_responce(self, mocker, pdf: bytes):
+        responce_mock = mocker.Mock()
+        responce_mock.status_code = 200
+        responce_mock.content = pdf
+        responce_mock.headers = {"content-type": "application/pdf"}
+        return mocker.patch.object(requests, "get", return_value=responce_mock)
+
+    def test_lists_from_text_layer_pdf(self, mocker):
+        # 「全体」と数値と合計が別々のテキストとして同じ高さに並ぶPDF
+        pdf = make_text_pdf(
+            [
+                (50, 720, "0-4 5-9"),
+                (50, 700, "AB"),
+                (100, 700, "11 8 2 25 31 29 35 22 9 7 12 6 3"),
+                (420, 701, "200"),
+                (50, 600, "AB 1"),
+            ]
+        )
+        self._mock_pdf_responce(mocker, pdf)
+        get_dataframes = mocker.patch.object(ScrapePatientsNumber, "_get_dataframes")
+        scraper = ScrapePatientsNumber(pdf_url="http://dummy.local", publication_date=date(2022, 10, 3))
+        get_dataframes.assert_not_called()
+        assert scraper.lists[0]["age_under_10"] == 21
+        assert scraper.lists[0]["age_60s"] == 16
+        assert scraper.lists[0]["age_over_90"] == 3
+
+    def test_lists_fallback_without_total_reuses_pdf(self, pdf_dataframes_after_20220927, mocker):
+        # 合計の列がない場合は検証できないためcamelotで解析する
+        pdf = make_text_pdf([(50, 700, "AB"), (100, 700, "11 8 2 25 31 29 35 22 9 7 12 6 3")])
+        get = self._mock_pdf_responce(mocker, pdf)
+        read_pdf = mocker.patch("camelot.read_pdf")
+        read_pdf.return_value = [mocker.Mock(df=df) for df in pdf_dataframes_after_20220927]
+
+        def assert_downloaded_pdf(pdf_path):
+            with open(pdf_path, "rb") as f:
+                assert f.read() == pdf
+            return read_pdf.return_value
+
+        read_pdf.side_effect = assert_downloaded_pdf
+        get_text_rows = mocker.spy(ScrapePatientsNumber, "_get_text_rows")
+        scraper = ScrapePatientsNumber(pdf_url="http://dummy.local", publication_date=date(2022, 10, 3))
+        # テキストレイヤーからの抽出を試した後、camelotで解析している
+        assert get_text_rows.call_count == 1
+        read_pdf.assert_called_once()
+        assert get.call_count == 1
+        assert scraper.lists[0]["age_under_10"] == 21
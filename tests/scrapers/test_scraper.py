@@ -2,6 +2,7 @@ from datetime import date
 
 import pytest
 import requests
+from bs4 import SoupStrainer
 
 from ash_unofficial_covid19.scrapers.downloader import (
     DownloadedCSV,
@@ -107,3 +108,17 @@ def test_format_age(value, expected):
 )
 def test_format_sex(value, expected):
     assert Scraper.format_sex(value) == expected
+
+
+def test_get_soup():
+    html_content = """
+<div><a href="a.html">リンク1</a></div>
+<table id="target"><tr><td>1</td></tr></table>
+<table id="other"><tr><td>2</td></tr></table>
+"""
+    html_content = html_content.encode("utf-8")
+    soup = Scraper.get_soup(html_content, parse_only=SoupStrainer("table", id="target"))
+    assert soup.find("a") is None
+    assert [td.text for td in soup.find_all("td")] == ["1"]
+    soup = Scraper.get_soup(html_content)
+    assert [a.text for a in soup.find_all("a")] == ["リンク1"]
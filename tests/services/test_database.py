@@ -0,0 +1,42 @@
+from ash_unofficial_covid19.logs import AppLog
+from ash_unofficial_covid19.services.database import QueryCollector
+
+
+class TestQueryCollector:
+    def test_normalize(self):
+        assert (
+            QueryCollector.normalize("SELECT  *\n FROM patients WHERE age = %s AND\tnote = 'it''s' LIMIT 10;")
+            == "SELECT * FROM patients WHERE age = ? AND note = ? LIMIT ?;"
+        )
+        assert (
+            QueryCollector.normalize(
+                b"INSERT INTO geocodes (query,longitude) VALUES ('a', 1.5),('b', 2.5) ON CONFLICT"
+            )
+            == "INSERT INTO geocodes (query,longitude) VALUES (?, ?), ... ON CONFLICT"
+        )
+
+    def test_get_fingerprint(self):
+        fingerprint = QueryCollector.get_fingerprint(QueryCollector.normalize("SELECT * FROM t WHERE a = 1;"))
+        assert fingerprint == QueryCollector.get_fingerprint(QueryCollector.normalize("SELECT * FROM t WHERE a = 2;"))
+        assert fingerprint != QueryCollector.get_fingerprint(QueryCollector.normalize("SELECT * FROM t WHERE b = 1;"))
+        assert len(fingerprint) == 16
+
+    def test_add(self, mocker):
+        warning_mock = mocker.patch.object(AppLog, "warning")
+        collector = QueryCollector(slow_query_threshold=100)
+        collector.add("SELECT * FROM t WHERE a = %s;", 12.5, 3)
+        collector.add("SELECT * FROM t WHERE b = %s;", 150.0, 1)
+        assert collector.count == 2
+        assert collector.total_duration == 162.5
+        assert collector.records[0].statement == "SELECT * FROM t WHERE a = ?;"
+        assert collector.records[0].row_count == 3
+        warning_mock.assert_called_once()
+        assert collector.records[1].fingerprint in warning_mock.call_args.args[0]
+
+    def test_activate(self):
+        assert QueryCollector.get_current() is None
+        collector = QueryCollector()
+        token = collector.activate()
+        assert QueryCollector.get_current() is collector
+        QueryCollector.deactivate(token)
+        assert QueryCollector.get_current() is None
@@ -0,0 +1,44 @@
+import pytest
+
+from ash_unofficial_covid19.models.geocode import GeocodeFactory
+from ash_unofficial_covid19.services.database import ConnectionPool
+from ash_unofficial_covid19.services.geocode import GeocodeService
+
+
+@pytest.fixture()
+def service():
+    test_data = [
+        {
+            "query": "市立旭川病院",
+            "longitude": 142.365976388889,
+            "latitude": 43.778422777778,
+        },
+        {
+            "query": "存在しない病院",
+        },
+        {
+            "query": "あさひかわ駅前内科",
+            "longitude": 142.3600949,
+            "latitude": 43.7628769,
+            "is_pinned": True,
+        },
+    ]
+    factory = GeocodeFactory()
+    for row in test_data:
+        factory.create(**row)
+
+    conn = ConnectionPool()
+    service = GeocodeService(conn)
+    service.create(factory)
+
+    yield service
+
+    conn.close_connection()
+
+
+def test_find_all(service):
+    results = {geocode.query: geocode for geocode in service.find_all().items}
+    assert results["市立旭川病院"].longitude == 142.365976388889
+    assert results["市立旭川病院"].latitude == 43.778422777778
+    assert not results["存在しない病院"].is_found
+    assert results["あさひかわ駅前内科"].is_pinned
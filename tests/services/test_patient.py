@@ -1,4 +1,4 @@
-from datetime import date
+from datetime import date, timedelta
 
 import pandas as pd
 import pytest
@@ -418,6 +418,28 @@ class TestAsahikawaPatientService:
         expect = 4.0
         assert result == expect
 
+    def test_get_reproduction_number_series(self, service):
+        from_date = date(2021, 2, 22)
+        to_date = date(2021, 2, 28)
+        result = service.get_reproduction_number_series(from_date=from_date, to_date=to_date)
+        assert len(result) == 7
+        assert result[0][0] == from_date
+        assert result[-1] == (to_date, 4.0)
+
+    def test_get_moving_average_series(self, service):
+        from_date = date(2021, 1, 25)
+        to_date = date(2021, 2, 28)
+        result = service.get_moving_average_series(from_date=from_date, to_date=to_date)
+        weekly = dict(service.get_seven_days_moving_average(from_date=from_date, to_date=to_date))
+        assert len(result) == 35
+        # 週の最終日の7日間移動平均はその週の1日あたり平均と一致する
+        for d, moving_average in result:
+            week_start = d - timedelta(days=6)
+            if week_start in weekly:
+                assert moving_average == weekly[week_start]
+        with pytest.raises(ServiceError):
+            service.get_moving_average_series(from_date=from_date, to_date=to_date, window=0)
+
     def test_get_total_by_months(self, service):
         from_date = date(2021, 1, 1)
         to_date = date(2021, 2, 28)
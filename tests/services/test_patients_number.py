@@ -307,24 +307,6 @@ class TestPatientsNumberService:
         )
         assert_frame_equal(result, expect)
 
-    def test_get_patients_number_by_age(self, service):
-        from_date = date(2022, 1, 20)
-        to_date = date(2022, 1, 29)
-        result = service.get_patients_number_by_age(from_date=from_date, to_date=to_date)
-        expect = [
-            ("10歳未満", 30),
-            ("10代", 38),
-            ("20代", 26),
-            ("30代", 28),
-            ("40代", 29),
-            ("50代", 23),
-            ("60代", 8),
-            ("70代", 4),
-            ("80代", 3),
-            ("90歳以上", 0),
-        ]
-        assert result == expect
-
     def test_get_total_by_months(self, service):
         from_date = date(2021, 12, 1)
         to_date = date(2022, 1, 31)
@@ -0,0 +1,71 @@
+from datetime import date, timedelta
+
+import pytest
+
+from ash_unofficial_covid19.errors import ServiceError
+from ash_unofficial_covid19.metrics import PipelineMetrics
+from ash_unofficial_covid19.services import service
+from ash_unofficial_covid19.services.service import DailyAggregateService, Service
+
+
+class TestService:
+    def test_upsert_metrics(self, tmp_path, mocker):
+        mocker.patch.object(Service, "get_connection", return_value=mocker.MagicMock())
+        execute_values_mock = mocker.patch.object(service, "execute_values")
+        data_lists = [["a", 1], ["b", 2], ["c", 3]]
+        metrics = PipelineMetrics("import_test", metrics_dir=str(tmp_path))
+        with metrics.run():
+            with PipelineMetrics.stage("parse"):
+                Service("dummy", None).upsert(("name", "number"), "name", data_lists)
+
+        execute_values_mock.assert_called_once()
+        # 登録した行数は呼び出し元のparseではなくupsertの段階に計上する
+        stages = {stats.name: stats for stats in metrics.stages}
+        assert stages["upsert"].rows_written == 3
+        assert stages["parse"].rows_written == 0
+        assert metrics.totals.rows_written == 3
+
+
+class TestDailyAggregateService:
+    class DummyService(DailyAggregateService):
+        def __init__(self, daily_numbers):
+            Service.__init__(self, "dummy", None)
+            self.daily_numbers = daily_numbers
+            self.requested_ranges = list()
+
+        def get_aggregate_by_days(self, from_date, to_date):
+            self.requested_ranges.append((from_date, to_date))
+            return [(day, number) for day, number in self.daily_numbers if from_date <= day <= to_date]
+
+    @pytest.fixture()
+    def dummy_service(self):
+        numbers = [0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 1]
+        return self.DummyService([(date(2022, 5, 1) + timedelta(days=i), number) for i, number in enumerate(numbers)])
+
+    def test_get_moving_average_series(self, dummy_service):
+        assert dummy_service.get_moving_average_series(date(2022, 5, 13), date(2022, 5, 14), window=2) == [
+            (date(2022, 5, 13), 1.0),
+            (date(2022, 5, 14), 1.5),
+        ]
+        # 始期の平均に必要な前日分も1回でまとめて取得する
+        assert dummy_service.requested_ranges == [(date(2022, 5, 12), date(2022, 5, 14))]
+        with pytest.raises(ServiceError):
+            dummy_service.get_moving_average_series(date(2022, 5, 13), date(2022, 5, 14), window=0)
+
+    def test_get_reproduction_number_series(self, dummy_service):
+        assert dummy_service.get_reproduction_number_series(date(2022, 5, 12), date(2022, 5, 16)) == [
+            (date(2022, 5, 12), 0.0),
+            (date(2022, 5, 13), 2.0),
+            (date(2022, 5, 14), 0.0),
+            (date(2022, 5, 15), 0.0),
+            (date(2022, 5, 16), 0.0),
+        ]
+
+    def test_get_growth_rate_series(self, dummy_service):
+        assert dummy_service.get_growth_rate_series(date(2022, 5, 14), date(2022, 5, 16)) == [
+            (date(2022, 5, 14), 2.0),
+            (date(2022, 5, 15), 2.0),
+            (date(2022, 5, 16), None),
+        ]
+        with pytest.raises(ServiceError):
+            dummy_service.get_growth_rate_series("2022-05-14", date(2022, 5, 16))
@@ -0,0 +1,40 @@
+import json
+import logging
+from logging.handlers import QueueHandler
+
+from ash_unofficial_covid19.logs import (
+    LOGGER_NAME,
+    AppLog,
+    JsonFormatter,
+    RequestIdFilter,
+    get_logger,
+    reset_request_id,
+    set_request_id,
+)
+
+
+class TestAppLog:
+    def test_configured_once(self):
+        AppLog()
+        AppLog()
+        handlers = logging.getLogger(LOGGER_NAME).handlers
+        assert len([handler for handler in handlers if isinstance(handler, QueueHandler)]) == 1
+        assert get_logger() is logging.getLogger(LOGGER_NAME)
+
+    def test_json_formatter(self):
+        record = logging.LogRecord(LOGGER_NAME, logging.WARNING, __file__, 1, "遅いクエリ %s", ("abc",), None)
+        token = set_request_id("0123abcd")
+        try:
+            RequestIdFilter().filter(record)
+        finally:
+            reset_request_id(token)
+
+        log = json.loads(JsonFormatter().format(record))
+        assert log["level"] == "WARNING"
+        assert log["message"] == "遅いクエリ abc"
+        assert log["request_id"] == "0123abcd"
+
+    def test_json_formatter_without_request_id(self):
+        record = logging.LogRecord(LOGGER_NAME, logging.INFO, __file__, 1, "message", None, None)
+        RequestIdFilter().filter(record)
+        assert "request_id" not in json.loads(JsonFormatter().format(record))
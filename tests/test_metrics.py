@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from ash_unofficial_covid19.metrics import PipelineMetrics
+
+
+class TestPipelineMetrics:
+    def test_stage_without_run(self):
+        assert PipelineMetrics.get_current() is None
+        with PipelineMetrics.stage("parse"):
+            PipelineMetrics.count("rows_parsed", 10)
+
+    def test_run(self, tmp_path):
+        metrics = PipelineMetrics("import_test", metrics_dir=str(tmp_path))
+        with metrics.run():
+            assert PipelineMetrics.get_current() is metrics
+            with PipelineMetrics.stage("parse"):
+                with PipelineMetrics.stage("download"):
+                    PipelineMetrics.count("bytes_downloaded", 1024)
+                PipelineMetrics.count("rows_parsed", 10)
+            with PipelineMetrics.stage("parse"):
+                PipelineMetrics.count("rows_parsed", 5)
+            with PipelineMetrics.stage("upsert"):
+                PipelineMetrics.count("rows_written", 15)
+
+        assert PipelineMetrics.get_current() is None
+        stages = {stats.name: stats for stats in metrics.stages}
+        assert stages["parse"].calls == 2
+        assert stages["parse"].rows_parsed == 15
+        assert stages["parse"].bytes_downloaded == 0
+        assert stages["download"].bytes_downloaded == 1024
+        assert stages["upsert"].rows_written == 15
+        assert metrics.totals.bytes_downloaded == 1024
+        assert metrics.totals.rows_parsed == 15
+        assert 0 < metrics.totals.peak_rss_bytes
+
+        report = json.loads((tmp_path / "import_test.json").read_text(encoding="utf-8"))
+        assert report["job"] == "import_test"
+        assert report["success"] is True
+        assert [stage["name"] for stage in report["stages"]] == ["parse", "download", "upsert"]
+
+        textfile = (tmp_path / "import_test.prom").read_text(encoding="utf-8")
+        assert 'ash_import_stage_rows_parsed{job="import_test",stage="parse"} 15' in textfile
+        assert 'ash_import_run_bytes_downloaded{job="import_test"} 1024' in textfile
+        assert 'ash_import_run_success{job="import_test"} 1' in textfile
+        assert list(tmp_path.glob("*.tmp")) == []
+
+    def test_nested_stage_time(self, tmp_path, mocker):
+        # parseの開始、downloadの開始と終了、parseの終了の順に時刻を返す
+        mocker.patch("ash_unofficial_covid19.metrics.time.perf_counter", side_effect=[10.0, 11.0, 13.5, 14.0])
+        mocker.patch("ash_unofficial_covid19.metrics._get_cpu_seconds", side_effect=[1.0, 1.5, 2.5, 2.75])
+        metrics = PipelineMetrics("import_test", metrics_dir=str(tmp_path))
+        with metrics.measure("parse"):
+            with metrics.measure("download"):
+                pass
+
+        stages = {stats.name: stats for stats in metrics.stages}
+        assert stages["download"].wall_seconds == 2.5
+        assert stages["download"].cpu_seconds == 1.0
+        # 入れ子のdownloadの時間はparseの時間に含めない
+        assert stages["parse"].wall_seconds == 1.5
+        assert stages["parse"].cpu_seconds == 0.75
+
+    def test_run_failure(self, tmp_path):
+        metrics = PipelineMetrics("import_test", metrics_dir=str(tmp_path))
+        with pytest.raises(RuntimeError):
+            with metrics.run():
+                raise RuntimeError("failure")
+
+        textfile = (tmp_path / "import_test.prom").read_text(encoding="utf-8")
+        assert 'ash_import_run_success{job="import_test"} 0' in textfile
+
+    def test_invalid_counter(self, tmp_path):
+        metrics = PipelineMetrics("import_test", metrics_dir=str(tmp_path))
+        with pytest.raises(ValueError):
+            metrics.add("rows_deleted", 1)
@@ -0,0 +1,93 @@
+import math
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+import pytest
+
+from ash_unofficial_covid19.numerics import (
+    get_growth_rates,
+    get_moving_averages,
+    get_per_hundred_thousand_population,
+    get_reproduction_numbers,
+    get_rolling_sums,
+    round_half_up,
+)
+
+
+def decimal_round_half_up(value: float, digits: int) -> float:
+    return float(Decimal(str(value)).quantize(Decimal(1).scaleb(-digits), rounding=ROUND_HALF_UP))
+
+
+def assert_same_as_decimal(values: np.ndarray, digits: int):
+    results = round_half_up(values, digits)
+    for value, result in zip(values.tolist(), results.tolist()):
+        expected = decimal_round_half_up(value, digits)
+        if math.isnan(expected):
+            assert math.isnan(result)
+        else:
+            assert result == expected, (value, digits)
+            assert math.copysign(1, result) == math.copysign(1, expected), (value, digits)
+
+
+@pytest.mark.parametrize("digits", range(0, 7))
+def test_round_half_up_matches_decimal(digits):
+    rng = np.random.default_rng(digits)
+    scale = 10**digits
+    halves = (rng.integers(-(10**6), 10**6, 2000) + 0.5) / scale
+    values = np.concatenate(
+        [
+            rng.uniform(-10000, 10000, 2000),
+            halves,
+            # 0.5ちょうどの前後の浮動小数点数
+            np.nextafter(halves, np.inf),
+            np.nextafter(halves, -np.inf),
+            rng.integers(0, 10**6, 2000) / 7,
+            rng.integers(0, 10**6, 2000) / 329306 * 100000,
+            [0.0, -0.0, -0.001, 2.675, 1.005, -2.5, 0.125, 1e20, -1e17, float("nan")],
+        ]
+    )
+    assert_same_as_decimal(values, digits)
+
+
+def test_round_half_up_scalar():
+    assert round_half_up(2.675, 2) == 2.68
+    assert round_half_up(-2.5) == -3.0
+    assert isinstance(round_half_up(1.0049, 2), float)
+
+
+def test_round_half_up_with_invalid_digits():
+    with pytest.raises(ValueError):
+        round_half_up([1.0], 16)
+
+
+def test_get_per_hundred_thousand_population():
+    assert get_per_hundred_thousand_population([0, 100, 329], 329306) == [0.0, 30.37, 99.91]
+    assert get_per_hundred_thousand_population([], 329306) == []
+
+
+def test_get_rolling_sums():
+    daily_numbers = np.random.default_rng(0).integers(0, 100, 400)
+    result = get_rolling_sums(daily_numbers, 7)
+    expect = [sum(daily_numbers[i - 6 : i + 1]) for i in range(6, len(daily_numbers))]
+    assert result.tolist() == expect
+    assert get_rolling_sums([1, 2], 7).tolist() == []
+    with pytest.raises(ValueError):
+        get_rolling_sums([1, 2], 0)
+
+
+def test_get_moving_averages():
+    assert get_moving_averages([1, 0, 0, 0, 0, 0, 0, 2, 1]) == [0.14, 0.29, 0.43]
+    assert get_moving_averages([1, 2, 4], window=2) == [1.5, 3.0]
+
+
+def test_get_reproduction_numbers():
+    daily_numbers = [0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 1]
+    # 世代時間前の7日間が0人の場合は0とする
+    assert get_reproduction_numbers(daily_numbers) == [0.0, 2.0, 0.0, 0.0, 0.0]
+    assert get_reproduction_numbers([1] * 11) == []
+
+
+def test_get_growth_rates():
+    daily_numbers = [0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 0]
+    assert get_growth_rates(daily_numbers) == [2.0, 2.0, None]
+    assert get_growth_rates([4, 3, 6], window=1) == [-0.25, 1.0]
@@ -1,7 +1,13 @@
-from datetime import date
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
 from io import BytesIO
 
+import pandas as pd
 import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
 
 from ash_unofficial_covid19.models.patients_number import PatientsNumberFactory
 from ash_unofficial_covid19.services.database import ConnectionPool
@@ -9,6 +15,8 @@ from ash_unofficial_covid19.services.patients_number import PatientsNumberServic
 from ash_unofficial_covid19.views.graph import (
     ByAgeGraphView,
     DailyTotalGraphView,
+    GraphManifest,
+    GraphView,
     MonthTotalGraphView,
     PerHundredThousandPopulationGraphView,
     WeeklyPerAgeGraphView,
@@ -93,6 +101,11 @@ class TestDailyTotalGraphView:
         graph_image = view.get_graph_image()
         assert type(graph_image) is BytesIO
 
+    def test_pickle(self, view):
+        # データベース接続を除いたデータだけを別プロセスへ渡せる
+        copied_view = pickle.loads(pickle.dumps(view))
+        assert type(copied_view.get_graph_image()) is BytesIO
+
 
 class TestMonthTotalGraphView:
     @pytest.fixture()
@@ -152,3 +165,152 @@ class TestWeeklyPerAgeGraphView:
     def test_get_graph_image(self, view):
         graph_image = view.get_graph_image()
         assert type(graph_image) is BytesIO
+
+
+class TestGraphView:
+    class DummyGraphView(GraphView):
+        def __init__(self, values):
+            self.values = values
+
+        def _setup_axes(self, ax):
+            ax.grid(axis="y", color="lightgray")
+            return {"color": "#4979F5"}
+
+        def _get_graph_data(self):
+            return (self.values,)
+
+        def _draw_data(self, ax, resources):
+            positions = list(range(len(self.values)))
+            bars = ax.bar(positions, self.values, color=resources["color"])
+            ax.set_xticks(positions, [str(value) for value in self.values])
+            return [bars]
+
+    def test_get_graph_image(self):
+        view = self.DummyGraphView([1, 2, 3])
+        first_image = view.get_graph_image(figsize=(6.0, 3.15)).getvalue()
+        # 別のデータを描画した後でも、テンプレートに前回のデータが残らない
+        self.DummyGraphView([30, 20, 10, 5]).get_graph_image(figsize=(6.0, 3.15))
+        assert view.get_graph_image(figsize=(6.0, 3.15)).getvalue() == first_image
+        template = view._get_template((6.0, 3.15))
+        assert len(template.ax.containers) == 0
+        assert template is self.DummyGraphView([4])._get_template((6.0, 3.15))
+        assert template is not view._get_template((9.6, 4.8))
+
+    def test_get_graph_image_in_threads(self):
+        views = [self.DummyGraphView([i, i + 1, i * 2]) for i in range(4)]
+        expect = [view.get_graph_image().getvalue() for view in views]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda view: view.get_graph_image().getvalue(), views * 3))
+        assert results == expect * 3
+
+    def test_get_fingerprint(self):
+        fingerprint = self.DummyGraphView([1, 2, 3]).get_fingerprint((9.6, 4.8))
+        assert fingerprint == self.DummyGraphView([1, 2, 3]).get_fingerprint((9.6, 4.8))
+        assert fingerprint != self.DummyGraphView([1, 2, 4]).get_fingerprint((9.6, 4.8))
+        assert fingerprint != self.DummyGraphView([1, 2, 3]).get_fingerprint((6.0, 3.15))
+
+    def test_get_fingerprint_dataframe(self):
+        df = pd.DataFrame([[1, 2], [3, 4]], index=[date(2023, 5, 1), date(2023, 5, 8)], columns=["10代", "20代"])
+        fingerprint = self.DummyGraphView(df).get_fingerprint()
+        assert fingerprint == self.DummyGraphView(df.copy()).get_fingerprint()
+        changed_df = df.copy()
+        changed_df.iloc[1, 1] = 5
+        assert fingerprint != self.DummyGraphView(changed_df).get_fingerprint()
+
+    def test_get_fingerprint_object_dataframe(self):
+        def get_df(patients):
+            # サービスと同じく空のDataFrameに1件ずつ代入するとobject型の列になる
+            df = pd.DataFrame(columns=["10代", "20代"])
+            for week, age, number in patients:
+                df.at[week, age] = number
+            return df
+
+        patients = [
+            (date(2023, 5, 1), "10代", 1001),
+            (date(2023, 5, 1), "20代", 2002),
+            (date(2023, 5, 8), "10代", 3003),
+            (date(2023, 5, 8), "20代", 0),
+        ]
+        df = get_df(patients)
+        assert (df.dtypes == object).all()
+        fingerprint = self.DummyGraphView(df).get_fingerprint()
+        # 値が同じであれば、要素が別のオブジェクトのDataFrameでも同じ値になる
+        assert fingerprint == self.DummyGraphView(get_df(patients)).get_fingerprint()
+        assert fingerprint == self.DummyGraphView(pickle.loads(pickle.dumps(df))).get_fingerprint()
+        changed_patients = patients[:2] + [(date(2023, 5, 8), "10代", 3004), (date(2023, 5, 8), "20代", 0)]
+        assert fingerprint != self.DummyGraphView(get_df(changed_patients)).get_fingerprint()
+
+    def test_save_graph_image(self, tmp_path, mocker):
+        mocker.patch.object(self.DummyGraphView, "get_graph_image", return_value=BytesIO(b"dummy"))
+        save_path = tmp_path / "dummy.webp"
+        save_path.write_bytes(b"old")
+        assert self.DummyGraphView([1]).save_graph_image(save_path, (6.0, 3.15)) == save_path
+        assert save_path.read_bytes() == b"dummy"
+        # 一時ファイルは残らない
+        assert [path.name for path in tmp_path.iterdir()] == ["dummy.webp"]
+
+
+class TestFigureToWebp:
+    @pytest.fixture()
+    def fig(self):
+        fig = Figure(figsize=(9.6, 4.8))
+        ax = fig.add_subplot()
+        day_x = [date(2022, 1, 1) + timedelta(days=i) for i in range(365)]
+        day_y = [(i * 37) % 500 for i in range(365)]
+        ax.bar(day_x, day_y, color="#4979F5")
+        ax.grid(axis="y", color="lightgray")
+        fig.tight_layout()
+        return fig
+
+    @staticmethod
+    def _png_to_webp(fig, **kwargs):
+        # 従来のPNG形式を経由する変換
+        png_data = BytesIO()
+        FigureCanvasAgg(fig).print_png(png_data)
+        webp_data = BytesIO()
+        Image.open(png_data).save(webp_data, format="Webp", **kwargs)
+        return webp_data
+
+    def test_figure_to_webp(self, fig):
+        webp_data = GraphView._figure_to_webp(fig)
+        image = Image.open(webp_data)
+        assert image.format == "WEBP"
+        assert image.size == (960, 480)
+        assert image.size == Image.open(self._png_to_webp(fig)).size
+
+    def test_quality(self, fig):
+        small_data = GraphView._figure_to_webp(fig, quality=10, method=0)
+        large_data = GraphView._figure_to_webp(fig, quality=100, method=0)
+        assert len(small_data.getvalue()) < len(large_data.getvalue())
+
+    def test_same_as_png(self, fig):
+        # 同じ品質と圧縮方法であれば、PNG形式を経由する変換と同じ画像になる
+        png_data = self._png_to_webp(fig, quality=80, method=4)
+        direct_data = GraphView._figure_to_webp(fig, quality=80, method=4)
+        png_image = Image.open(png_data)
+        direct_image = Image.open(direct_data)
+        assert direct_image.mode == png_image.mode
+        assert direct_image.tobytes() == png_image.tobytes()
+
+
+class TestGraphManifest:
+    def test_is_fresh(self, tmp_path):
+        manifest_path = tmp_path / "manifest.json"
+        manifest = GraphManifest(manifest_path)
+        assert not manifest.is_fresh("daily_total.webp", "abc")
+        (tmp_path / "daily_total.webp").write_bytes(b"dummy")
+        manifest.update("daily_total.webp", "abc")
+        manifest.save()
+
+        saved_manifest = GraphManifest(manifest_path)
+        assert saved_manifest.fingerprints == {"daily_total.webp": "abc"}
+        assert saved_manifest.is_fresh("daily_total.webp", "abc")
+        assert not saved_manifest.is_fresh("daily_total.webp", "def")
+        # 画像ファイルが削除されていれば作り直す
+        (tmp_path / "daily_total.webp").unlink()
+        assert not saved_manifest.is_fresh("daily_total.webp", "abc")
+
+    def test_broken_manifest(self, tmp_path):
+        manifest_path = tmp_path / "manifest.json"
+        manifest_path.write_text("{broken", encoding="utf-8")
+        assert GraphManifest(manifest_path).fingerprints == dict()
@@ -0,0 +1,82 @@
+from datetime import date, datetime
+from io import BytesIO
+
+import pytest
+
+from ash_unofficial_covid19.services.patients_number import PatientsNumberService
+from ash_unofficial_covid19.services.sapporo_patients_number import SapporoPatientsNumberService
+from ash_unofficial_covid19.services.tokyo_patients_number import TokyoPatientsNumberService
+from ash_unofficial_covid19.views.graph import GRAPH_VIEWS
+from ash_unofficial_covid19.views.graph_cache import GraphImageCache
+
+
+class DummyGraphView:
+    render_count = 0
+
+    def __init__(self, today, pool):
+        self.today = today
+
+    def get_graph_image(self, figsize=None, dpi=None):
+        DummyGraphView.render_count += 1
+        return BytesIO("{0},{1},{2}".format(self.today, figsize, dpi).encode())
+
+
+class TestGraphImageCache:
+    @pytest.fixture()
+    def cache(self, tmp_path, mocker):
+        DummyGraphView.render_count = 0
+        mocker.patch.dict(GRAPH_VIEWS, {"dummy": DummyGraphView}, clear=True)
+        return GraphImageCache(cache_dir=str(tmp_path), max_files=2)
+
+    def test_get_data_version(self, mocker):
+        mocker.patch.object(GraphImageCache, "_GraphImageCache__data_version", None)
+        last_updated_mock = mocker.patch.object(
+            PatientsNumberService, "get_last_updated", return_value=datetime(2023, 5, 8, 9, 0)
+        )
+        mocker.patch.object(SapporoPatientsNumberService, "get_last_updated", return_value=datetime(2023, 5, 7))
+        mocker.patch.object(TokyoPatientsNumberService, "get_last_updated", return_value=datetime(2023, 5, 6))
+        monotonic_mock = mocker.patch("ash_unofficial_covid19.views.graph_cache.time.monotonic", return_value=100.0)
+        data_version = GraphImageCache.get_data_version(date(2023, 5, 8), None)
+        assert data_version == "2023-05-08,2023-05-08T09:00:00,2023-05-07T00:00:00,2023-05-06T00:00:00"
+        # 一定時間内の同じ基準日のバージョンはデータベースへ問い合わせずに再利用する
+        monotonic_mock.return_value = 159.0
+        assert GraphImageCache.get_data_version(date(2023, 5, 8), None) == data_version
+        assert last_updated_mock.call_count == 1
+        # 基準日が変わった場合と一定時間が過ぎた場合は求め直す
+        assert GraphImageCache.get_data_version(date(2023, 5, 9), None).startswith("2023-05-09,")
+        assert last_updated_mock.call_count == 2
+        monotonic_mock.return_value = 220.0
+        last_updated_mock.return_value = datetime(2023, 5, 9, 9, 0)
+        data_version = GraphImageCache.get_data_version(date(2023, 5, 9), None)
+        assert data_version == "2023-05-09,2023-05-09T09:00:00,2023-05-07T00:00:00,2023-05-06T00:00:00"
+        assert last_updated_mock.call_count == 3
+
+    def test_get_etag(self):
+        etag = GraphImageCache.get_etag("daily_total", 960, 480, 100, "v1")
+        assert etag == GraphImageCache.get_etag("daily_total", 960, 480, 100, "v1")
+        assert etag != GraphImageCache.get_etag("daily_total", 960, 480, 100, "v2")
+        assert etag != GraphImageCache.get_etag("daily_total", 600, 315, 100, "v1")
+
+    def test_render(self, cache):
+        etag = cache.get_etag("dummy", 600, 315, 100, "v1")
+        assert cache.get(etag) is None
+        graph_image = cache.render("dummy", 600, 315, 100, date(2023, 5, 8), None, "v1")
+        assert graph_image == b"2023-05-08,(6.0, 3.15),100"
+        assert cache.get(etag) == graph_image
+
+    def test_max_files(self, cache):
+        for data_version in ("v1", "v2", "v3"):
+            cache.render("dummy", 960, 480, 100, date(2023, 5, 8), None, data_version)
+        assert len(list(cache.cache_dir.glob("*.webp"))) == 2
+        assert cache.get(cache.get_etag("dummy", 960, 480, 100, "v1")) is None
+        assert list(cache.cache_dir.glob("*.tmp")) == []
+
+    def test_prewarm(self, cache, mocker):
+        mocker.patch.object(GraphImageCache, "_get_data_version", return_value="v1")
+        sizes = [(960, 480, 100), (600, 315, 100)]
+        cache.prewarm(date(2023, 5, 8), None, sizes)
+        assert DummyGraphView.render_count == 2
+        assert cache.get(cache.get_etag("dummy", 600, 315, 100, "v1")) == b"2023-05-08,(6.0, 3.15),100"
+        # キャッシュ済みのサイズは作成し直さない
+        cache.prewarm(date(2023, 5, 8), None, sizes)
+        assert DummyGraphView.render_count == 2
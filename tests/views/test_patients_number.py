@@ -1,7 +1,9 @@
-from datetime import date
+from datetime import date, datetime
 
+import pandas as pd
 import pytest
 
+from ash_unofficial_covid19.errors import ViewError
 from ash_unofficial_covid19.models.patients_number import PatientsNumberFactory
 from ash_unofficial_covid19.services.database import ConnectionPool
 from ash_unofficial_covid19.services.patients_number import PatientsNumberService
@@ -125,6 +127,34 @@ class TestPatientsNumberView:
         )
         assert result == expect
 
+    def test_get_range_total_json(self, view):
+        result = view.get_range_total_json(
+            from_date=date(2020, 2, 24), to_date=date(2020, 2, 25), ages=["age_10s", "investigating"]
+        )
+        expect = (
+            '{"from": "2020-02-24", "to": "2020-02-25", "total": 24, "by_age": {"age_10s": 19, "investigating": 5}}'
+        )
+        assert result == expect
+        assert '"total": 199' in view.get_range_total_json()
+        with pytest.raises(ViewError):
+            view.get_range_total_json(ages=["age_100s"])
+
+    def test_to_day_offset(self):
+        assert PatientsNumberView.to_day_offset(date(2020, 1, 1)) == 0
+        assert PatientsNumberView.to_day_offset(date(2020, 2, 23)) == 53
+        assert PatientsNumberView.to_day_offset(datetime(2020, 2, 23, 0, 0)) == 53
+
+    def test_graph_dict_to_json(self):
+        df = pd.DataFrame(
+            [[1, 2], [3, 4]], index=[datetime(2020, 2, 23), datetime(2020, 3, 1)], columns=["10代", "20代"]
+        )
+        graph_dict = PatientsNumberView.dataframe_to_graph_dict(df)
+        assert graph_dict == {"x": [53, 60], "labels": ["10代", "20代"], "values": [[1, 3], [2, 4]]}
+        assert (
+            PatientsNumberView.graph_dict_to_json(graph_dict)
+            == '{"epoch":"2020-01-01","x":[53,60],"labels":["10代","20代"],"values":[[1,3],[2,4]]}'
+        )
+
 
 class TestDailyTotalView:
     @pytest.fixture()
@@ -212,6 +242,12 @@ class TestDailyTotalView:
             + "2020年02月24日 102人"
         )
 
+    def test_get_graph_json(self, view):
+        assert (
+            view.get_graph_json()
+            == '{"epoch":"2020-01-01","x":[46,47,48,49,50,51,52,53,54],"y":[0,0,0,0,0,0,0,97,102]}'
+        )
+
 
 class TestMonthTotalView:
     @pytest.fixture()
@@ -230,6 +266,9 @@ class TestMonthTotalView:
         assert view.increase_from_last_month == "+199"
         assert view.graph_alt == "2020年01月 0人, 2020年02月 199人"
 
+    def test_get_graph_json(self, view):
+        assert view.get_graph_json() == '{"epoch":"2020-01-01","x":[0,31],"y":[0,199]}'
+
 
 class TestByAgeView:
     @pytest.fixture()